@@ -1,10 +1,23 @@
-"""Command-line interface for font installer."""
+"""
+Command-line interface for font installer.
+
+Only the configuration is imported at module level: each command imports
+the modules it uses, so commands such as ``list`` or ``--help`` do not
+pay for the TUI (Textual, Rich) or the download stack.
+"""
 
+import argparse
+import json
+import sqlite3
 import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .config.settings import Settings
 
-from .core.installer import FontInstaller
-from .ui.app import FontInstallerApp
-from .utils.system import SystemChecker
+if TYPE_CHECKING:
+    from .core.fontindex import FontFace
+    from .core.installer import InstallResult
 
 
 def print_help() -> None:
@@ -18,8 +31,26 @@ Uso: font-installer [comando]
 Comandos:
   (sem argumentos)  Abre interface interativa (TUI)
   --cli             Modo linha de comando (instala ClearType)
-  --install-deps    Instala dependencias do sistema (cabextract, fontconfig)
+  --install-deps    Instala dependencias do sistema (fontconfig; cabextract,
+                    opcional, acelera a extracao do ClearType)
   list              Lista fontes instaladas
+  install CHAVE...  Instala fontes sem interface (ClearType, dev e "core")
+    [--all]         Todas as fontes ClearType e de desenvolvedor
+    [--jobs N]      Instalacoes simultaneas
+    [--format F]    Formato das fontes: auto, ttf, otf ou variable
+    [--json]        Uma linha JSON por fonte (saida 0 ok, 1 falha,
+                    2 uso incorreto, 3 falha parcial)
+    [--locked]      Instala exatamente o que esta no lockfile, sem
+                    consultar o GitHub (todas as fontes dele sem CHAVE)
+    [--lockfile A]  Lockfile a usar com --locked (padrao: ./fonts.lock.json)
+  lock CHAVE...     Grava URL, tamanho, sha256 e arquivos no lockfile
+    [--all]         Todas as fontes ClearType e de desenvolvedor
+    [--format F]    Formato travado: auto, ttf, otf ou variable
+  update [--check]  Atualiza fontes de desenvolvedor com nova release
+    [--format F]    Formato instalado: auto, ttf, otf ou variable
+  cache stats       Mostra uso do cache de downloads
+  cache prune [TAM] Remove downloads antigos ate o limite (ex: 200M, 1G)
+  cache clear       Esvazia o cache de downloads
   help, --help, -h  Mostra esta ajuda
 
 Interface Interativa:
@@ -45,6 +76,8 @@ def check_and_install_deps() -> bool:
     Returns:
         True if dependencies are available, False otherwise
     """
+    from .core.installer import FontInstaller
+
     ok, missing = FontInstaller.check_dependencies()
 
     if ok:
@@ -67,22 +100,17 @@ def check_and_install_deps() -> bool:
         return success
     else:
         print("\nInstale manualmente com:")
-        print("  sudo apt update && sudo apt install cabextract fontconfig")
+        print("  sudo apt update && sudo apt install fontconfig")
         return False
 
 
 def install_deps_command() -> int:
     """Install system dependencies."""
+    from .core.installer import FontInstaller
+
     print("Font Installer - Instalando Dependencias")
     print("-" * 40)
 
-    ok, missing = FontInstaller.check_dependencies()
-
-    if ok:
-        print("Todas as dependencias ja estao instaladas!")
-        return 0
-
-    print(f"Instalando: {', '.join(missing)}")
     success, message = FontInstaller.install_dependencies()
     print(message)
 
@@ -91,6 +119,8 @@ def install_deps_command() -> int:
 
 def run_cli_mode() -> int:
     """Run in CLI mode (non-interactive)."""
+    from .core.installer import FontInstaller
+
     print("Font Installer para Ubuntu - Modo CLI")
     print("-" * 40)
 
@@ -104,41 +134,412 @@ def run_cli_mode() -> int:
 
     print("\nInstalando fontes ClearType...")
     result = installer.install_cleartype_fonts()
+    installer.progress.flush()
 
     if result.success:
-        print(f"\nSucesso: {result.files_installed} fontes instaladas")
-        installer.update_font_cache()
-        print("Cache de fontes atualizado")
+        print(
+            f"\nSucesso: {result.files_installed} fontes instaladas"
+            f" (metodo: {result.strategy})"
+        )
+        _report_font_cache(installer.refresh_font_cache())
         return 0
     else:
         print(f"\nErro: {result.message}")
         return 1
 
 
+def _report_font_cache(scheduled: bool) -> None:
+    """Tell whether the font cache refresh could be started."""
+    if scheduled:
+        print("Cache de fontes sendo atualizado em segundo plano")
+    else:
+        print(
+            "Aviso: nao foi possivel atualizar o cache de fontes"
+            " (execute 'fc-cache -f' manualmente)",
+            file=sys.stderr,
+        )
+
+
 def list_fonts() -> int:
-    """List installed fonts."""
+    """List installed fonts grouped by family, with versions."""
+    from .core.fontindex import FontIndex, group_by_family
+    from .core.manifest import InstallManifest
+
     print("Fontes Instaladas")
     print("=" * 40)
 
-    fonts = SystemChecker.list_installed_fonts()
+    try:
+        records = InstallManifest().installs()
+    except (sqlite3.Error, OSError):
+        records = []
+    # Release of the install that placed each file
+    releases = {f.path: r.version for r in records if r.version for f in r.files}
+
+    faces = FontIndex().scan()
+    sections = {
+        "Microsoft ClearType": Settings.MICROSOFT_FONTS_DIR,
+        "Developer Fonts": Settings.DEV_FONTS_DIR,
+    }
+    for title, directory in sections.items():
+        print(f"\n[{title}]")
+        families = group_by_family(f for f in faces if f.path.is_relative_to(directory))
+        if not families:
+            print("  (nenhuma)")
+            continue
+        for family, members in families.items():
+            print(f"  {_describe_family(family, members, releases)}")
+            styles = dict.fromkeys(face.style for face in members)
+            print(f"    {', '.join(styles)}")
+        files = {face.path for members in families.values() for face in members}
+        print(f"  Total: {len(families)} familias, {len(files)} arquivos")
 
-    print("\n[Microsoft ClearType]")
-    if fonts["microsoft"]:
-        for font in fonts["microsoft"]:
-            print(f"  {font}")
-        print(f"  Total: {len(fonts['microsoft'])}")
-    else:
-        print("  (nenhuma)")
+    return 0
+
+
+def _describe_family(
+    family: str, faces: "list[FontFace]", releases: dict[Path, str]
+) -> str:
+    """One-line summary of a font family: versions, formats and release."""
+    versions = sorted({face.version for face in faces if face.version})
+    formats = sorted({face.font_format for face in faces})
+    tags = sorted({releases[face.path] for face in faces if face.path in releases})
+    line = family
+    if versions:
+        line += f" {', '.join(versions)}"
+    line += f" [{'/'.join(formats)}]"
+    if tags:
+        line += f" (release {', '.join(tags)})"
+    return line
+
+
+# Exit codes of the install command
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_PARTIAL = 3
+
+
+def _install_keys(names: list[str], install_all: bool) -> list[str]:
+    """
+    Resolve install arguments to installer keys.
+
+    ClearType font names (calibri, consolas, ...) all map to the ClearType
+    bundle, which is downloaded and installed as a whole.
+
+    Raises:
+        ValueError: For an unknown font
+    """
+    from .config.fonts import CLEARTYPE_FONTS, DEV_FONTS
+    from .core.installer import CLEARTYPE_KEY, CORE_KEY
+
+    keys = [CLEARTYPE_KEY, *DEV_FONTS] if install_all else []
+    for name in names:
+        key = name.lower()
+        if key in CLEARTYPE_FONTS:
+            key = CLEARTYPE_KEY
+        elif key not in DEV_FONTS and key not in (CLEARTYPE_KEY, CORE_KEY):
+            raise ValueError(name)
+        keys.append(key)
+    return list(dict.fromkeys(keys))
+
+
+def _jobs(text: str) -> int:
+    """argparse type for --jobs: a positive integer."""
+    try:
+        jobs = int(text)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f"numero de tarefas invalido: {text!r}")
+    return jobs
+
+
+def _parse(parser: argparse.ArgumentParser, args: list[str]) -> argparse.Namespace:
+    """
+    Parse command arguments.
+
+    Raises:
+        SystemExit: With EXIT_USAGE on bad arguments, EXIT_OK after --help
+    """
+    try:
+        return parser.parse_args(args)
+    except SystemExit as e:
+        raise SystemExit(EXIT_OK if e.code == 0 else EXIT_USAGE) from e
+
+
+def install_command(args: list[str]) -> int:
+    """Install fonts non-interactively, concurrently."""
+    from .core.installer import FontInstaller
+    from .core.lockfile import Lockfile
+
+    parser = argparse.ArgumentParser(
+        prog="font-installer install",
+        description="Instala fontes sem interface interativa.",
+    )
+    parser.add_argument("fonts", nargs="*", metavar="CHAVE")
+    parser.add_argument("--all", action="store_true", dest="install_all")
+    parser.add_argument("--jobs", type=_jobs, default=Settings.INSTALL_JOBS)
+    parser.add_argument("--format", choices=Settings.FONT_FORMATS, dest="font_format")
+    parser.add_argument("--json", action="store_true", dest="as_json")
+    parser.add_argument("--locked", action="store_true")
+    parser.add_argument("--lockfile", type=Path, metavar="ARQUIVO")
+    try:
+        options = _parse(parser, args)
+        if options.lockfile and not options.locked:
+            parser.error("--lockfile so vale junto com --locked")
+        if options.font_format and options.locked:
+            parser.error("--format nao vale com --locked (o lockfile define o formato)")
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else EXIT_USAGE
+
+    lockfile = None
+    if options.locked:
+        path = options.lockfile or Lockfile.default_path()
+        try:
+            lockfile = Lockfile.load(path)
+        except (OSError, ValueError) as e:
+            print(f"Lockfile ilegivel: {e}", file=sys.stderr)
+            return EXIT_USAGE
+    try:
+        keys = _install_keys(options.fonts, options.install_all)
+    except ValueError as e:
+        print(f"Fonte desconhecida: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    if lockfile is not None and (options.install_all or not keys):
+        keys = list(lockfile.fonts)
+    if not keys:
+        print("Nenhuma fonte informada (use CHAVE... ou --all)", file=sys.stderr)
+        return EXIT_USAGE
+
+    installer = FontInstaller(font_format=options.font_format, lockfile=lockfile)
+    if not options.as_json:
+        installer.progress.subscribe(lambda p: print(f"  {p.name}: {p.status}"))
+
+    failures = 0
+    for result in installer.install_many(keys, jobs=options.jobs):
+        failures += not result.success
+        if options.as_json:
+            print(json.dumps(_result_fields(result)), flush=True)
+        elif result.success:
+            print(f"  {result.font_name}: {result.message} ({result.elapsed:.1f}s)")
+        else:
+            print(f"  {result.font_name}: erro - {result.message}")
+
+    # One refresh for every directory the batch changed
+    scheduled = installer.refresh_font_cache()
+    if not options.as_json or not scheduled:
+        _report_font_cache(scheduled)
+
+    if not failures:
+        return EXIT_OK
+    return EXIT_FAILED if failures == len(keys) else EXIT_PARTIAL
+
+
+def lock_command(args: list[str]) -> int:
+    """Resolve fonts once and write their exact downloads to a lockfile."""
+    from .core.installer import CORE_KEY, FontInstaller
+    from .core.lockfile import Lockfile
+
+    parser = argparse.ArgumentParser(
+        prog="font-installer lock",
+        description="Grava URL, tamanho, sha256 e arquivos de cada fonte.",
+    )
+    parser.add_argument("fonts", nargs="*", metavar="CHAVE")
+    parser.add_argument("--all", action="store_true", dest="lock_all")
+    parser.add_argument("--jobs", type=_jobs, default=Settings.INSTALL_JOBS)
+    parser.add_argument("--format", choices=Settings.FONT_FORMATS, dest="font_format")
+    parser.add_argument("--lockfile", type=Path, metavar="ARQUIVO")
+    try:
+        options = _parse(parser, args)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else EXIT_USAGE
+
+    try:
+        keys = _install_keys(options.fonts, options.lock_all)
+    except ValueError as e:
+        print(f"Fonte desconhecida: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    if CORE_KEY in keys:
+        print("Core Fonts (apt) nao entram no lockfile", file=sys.stderr)
+        return EXIT_USAGE
+    if not keys:
+        print("Nenhuma fonte informada (use CHAVE... ou --all)", file=sys.stderr)
+        return EXIT_USAGE
+
+    path = options.lockfile or Lockfile.default_path()
+    # Entries for other fonts are kept
+    try:
+        lockfile = Lockfile.load(path)
+    except FileNotFoundError:
+        lockfile = Lockfile()
+    except (OSError, ValueError) as e:
+        print(f"Lockfile ilegivel: {e}", file=sys.stderr)
+        return EXIT_FAILED
+
+    installer = FontInstaller(font_format=options.font_format)
+    print("Resolvendo fontes...")
+    failed = False
+    for result in installer.lock_many(keys, jobs=options.jobs):
+        locked = result.locked
+        if locked is None:
+            failed = True
+            print(f"  {result.key}: erro - {result.error}")
+            continue
+        lockfile.fonts[locked.key] = locked
+        print(
+            f"  {locked.name}: {locked.version or '-'} {locked.sha256[:12]}"
+            f" ({len(locked.members)} arquivos, {_format_size(locked.size)})"
+        )
+
+    if failed:
+        print("\nLockfile nao gravado")
+        return EXIT_FAILED
+    try:
+        lockfile.save(path)
+    except OSError as e:
+        print(f"Erro ao gravar {path}: {e}")
+        return EXIT_FAILED
+    print(f"\nLockfile gravado em {path}")
+    return EXIT_OK
+
+
+def _result_fields(result: "InstallResult") -> dict:
+    """Machine-readable fields of an install result."""
+    selection = result.asset_selection
+    return {
+        "key": result.key,
+        "name": result.font_name,
+        "success": result.success,
+        "files": result.files_installed,
+        "new": result.files_new,
+        "updated": result.files_updated,
+        "unchanged": result.files_unchanged,
+        "bytes_downloaded": result.bytes_downloaded,
+        "bytes_saved": selection.bytes_saved if selection else 0,
+        "seconds": round(result.elapsed, 3),
+        "strategy": result.strategy,
+        "message": result.message,
+    }
+
+
+def update_command(args: list[str]) -> int:
+    """Update installed developer fonts whose release changed."""
+    from .core.installer import FontInstaller
+
+    parser = argparse.ArgumentParser(
+        prog="font-installer update",
+        description="Atualiza as fontes de desenvolvedor instaladas.",
+    )
+    parser.add_argument("--check", action="store_true", dest="check_only")
+    parser.add_argument("--format", choices=Settings.FONT_FORMATS, dest="font_format")
+    try:
+        options = _parse(parser, args)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else EXIT_USAGE
+    check_only = options.check_only
+    installer = FontInstaller(font_format=options.font_format)
+
+    print("Verificando atualizacoes...")
+    checks = installer.check_updates()
+    if not checks:
+        print("Nenhuma fonte de desenvolvedor instalada")
+        return 0
+
+    failed = False
+    for check in checks:
+        if check.error:
+            failed = True
+            print(f"  {check.font_name}: erro - {check.error}")
+        elif check.outdated:
+            print(
+                f"  {check.font_name}: {check.installed_version} -> "
+                f"{check.latest_version}"
+            )
+        else:
+            print(f"  {check.font_name}: {check.installed_version} (atualizada)")
+
+    outdated = [check.key for check in checks if check.outdated]
+    if not outdated:
+        print("\nTodas as fontes estao atualizadas")
+        return 1 if failed else 0
+    if check_only:
+        print(f"\n{len(outdated)} fonte(s) com atualizacao disponivel")
+        return 1 if failed else 0
 
-    print("\n[Developer Fonts]")
-    if fonts["dev"]:
-        for font in fonts["dev"]:
-            print(f"  {font}")
-        print(f"  Total: {len(fonts['dev'])}")
+    print()
+    installer.progress.subscribe(lambda p: print(f"  {p.name}: {p.status}"))
+    for result in installer.install_many(outdated):
+        if result.success:
+            saved = result.asset_selection.bytes_saved if result.asset_selection else 0
+            note = f" ({_format_size(saved)} a menos no download)" if saved else ""
+            print(f"  {result.font_name}: {result.message}{note}")
+        else:
+            failed = True
+            print(f"  {result.font_name}: erro - {result.message}")
+
+    _report_font_cache(installer.refresh_font_cache())
+    return 1 if failed else 0
+
+
+def _format_size(size: int) -> str:
+    """Format a byte count for display."""
+    if size < 1024:
+        return f"{size} B"
+    value = size / 1024
+    for unit in ("KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def _parse_size(text: str) -> int:
+    """Parse a size such as '500M' or '1G' into bytes."""
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3}
+    text = text.strip().upper().removesuffix("B")
+    if text and text[-1] in units:
+        size = int(float(text[:-1]) * units[text[-1]])
     else:
-        print("  (nenhuma)")
+        size = int(text)
+    if size < 0:
+        raise ValueError(f"negative size: {text}")
+    return size
+
+
+def cache_command(args: list[str]) -> int:
+    """Manage the download cache."""
+    from .core.cache import DownloadCache
+
+    cache = DownloadCache()
+    action = args[0].lower() if args else "stats"
+
+    if action == "stats":
+        stats = cache.stats()
+        print("Cache de Downloads")
+        print("=" * 40)
+        print(f"  Diretorio: {stats.path}")
+        print(f"  Arquivos:  {stats.entries} ({stats.urls} URLs)")
+        print(f"  Tamanho:   {_format_size(stats.total_bytes)}")
+        print(f"  Limite:    {_format_size(stats.max_bytes)}")
+        return 0
 
-    return 0
+    if action in ("prune", "clear"):
+        limit: int | None = None
+        if action == "clear":
+            limit = 0
+        elif len(args) > 1:
+            try:
+                limit = _parse_size(args[1])
+            except ValueError:
+                print(f"Tamanho invalido: {args[1]}")
+                return 1
+        freed = cache.prune(limit)
+        print(f"Cache: {_format_size(freed)} liberados")
+        return 0
+
+    print(f"Subcomando de cache desconhecido: {action}")
+    print("Use: font-installer cache [stats|prune [TAMANHO]|clear]")
+    return 1
 
 
 def main() -> int:
@@ -146,6 +547,9 @@ def main() -> int:
     args = sys.argv[1:]
 
     if not args:
+        from .core.installer import FontInstaller
+        from .ui.app import FontInstallerApp
+
         # Check dependencies before running TUI
         ok, missing = FontInstaller.check_dependencies()
         if not ok:
@@ -175,6 +579,18 @@ def main() -> int:
     if command == "list":
         return list_fonts()
 
+    if command == "install":
+        return install_command(args[1:])
+
+    if command == "lock":
+        return lock_command(args[1:])
+
+    if command == "update":
+        return update_command(args[1:])
+
+    if command == "cache":
+        return cache_command(args[1:])
+
     print(f"Comando desconhecido: {command}")
     print("Use 'font-installer --help' para ajuda")
     return 1
@@ -21,6 +21,9 @@ class FontInfo:
     category: FontCategory
     repo: str | None = None  # GitHub repo for dev fonts
     asset_pattern: str | None = None  # Pattern to match release assets
+    # Format policy for this font ("ttf", "otf", "variable"), None for the
+    # run's setting
+    font_format: str | None = None
 
 
 # Microsoft ClearType Fonts (included in PowerPoint Viewer)
@@ -1,5 +1,6 @@
 """Application settings and configuration."""
 
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import ClassVar
@@ -13,6 +14,21 @@ class Settings:
     FONTS_BASE_DIR: ClassVar[Path] = Path.home() / ".local" / "share" / "fonts"
     MICROSOFT_FONTS_DIR: ClassVar[Path] = FONTS_BASE_DIR / "microsoft"
     DEV_FONTS_DIR: ClassVar[Path] = FONTS_BASE_DIR / "dev"
+    # Application data, kept next to the fonts so staging shares their filesystem
+    DATA_DIR: ClassVar[Path] = FONTS_BASE_DIR.parent / "font-installer"
+    STAGING_DIR: ClassVar[Path] = DATA_DIR / "staging"
+    MANIFEST_PATH: ClassVar[Path] = DATA_DIR / "manifest.sqlite3"
+    # Directories fontconfig scans; their mtimes invalidate cached fc-list data
+    FONTCONFIG_DIRS: ClassVar[tuple[Path, ...]] = (
+        FONTS_BASE_DIR,
+        Path.home() / ".fonts",
+        Path("/usr/share/fonts"),
+        Path("/usr/local/share/fonts"),
+    )
+    CACHE_DIR: ClassVar[Path] = (
+        Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+        / "font-installer"
+    )
 
     # URLs
     POWERPOINT_VIEWER_URL: ClassVar[str] = (
@@ -29,8 +45,52 @@ class Settings:
     DOWNLOAD_TIMEOUT: ClassVar[int] = 300
     API_TIMEOUT: ClassVar[int] = 30
 
+    # Keep-alive connections allowed per host in the HTTP client pool
+    HTTP_MAX_CONNECTIONS_PER_HOST: ClassVar[int] = 6
+
+    # Retries for interrupted downloads (each one resumes the partial file)
+    DOWNLOAD_RETRIES: ClassVar[int] = 3
+    DOWNLOAD_RETRY_DELAY: ClassVar[float] = 1.0
+
+    # Segmented downloads: concurrent byte ranges for large artifacts
+    DOWNLOAD_SEGMENTS: ClassVar[int] = 4
+    SEGMENT_MIN_BYTES: ClassVar[int] = 4 * 1024 * 1024
+
+    # Font formats release assets must provide ("ttf", "otf", "variable");
+    # the smallest asset with any of them is downloaded
+    ASSET_FORMATS: ClassVar[tuple[str, ...]] = ("ttf", "otf")
+
+    # Which representation of each font face to install: "auto" (static
+    # TTF, then OTF, then variable), "ttf", "otf" or "variable"
+    FONT_FORMAT: ClassVar[str] = "auto"
+    FONT_FORMATS: ClassVar[tuple[str, ...]] = ("auto", "ttf", "otf", "variable")
+
+    # Extract ZIP assets while downloading instead of caching the archive
+    STREAM_ZIP_DOWNLOADS: ClassVar[bool] = False
+
+    # Download cache size limit (bytes), enforced with LRU eviction
+    CACHE_MAX_BYTES: ClassVar[int] = 512 * 1024 * 1024
+
+    # Seconds to trust cached GitHub release metadata without revalidating
+    RELEASE_CACHE_TTL: ClassVar[int] = 600
+
+    # Maximum progress deliveries per second to UI/CLI subscribers
+    PROGRESS_RATE_HZ: ClassVar[float] = 10.0
+
+    # Lockfile written by 'lock' and read by 'install --locked' (current dir)
+    LOCKFILE_NAME: ClassVar[str] = "fonts.lock.json"
+
+    # Concurrency
+    INSTALL_JOBS: ClassVar[int] = 4
+
     # Required system tools
-    REQUIRED_TOOLS: ClassVar[tuple[str, ...]] = ("cabextract", "fc-cache")
+    REQUIRED_TOOLS: ClassVar[tuple[str, ...]] = ("fc-cache",)
+    # Optional tools: cabextract only speeds up large cabinets, which the
+    # built-in reader also extracts
+    OPTIONAL_TOOLS: ClassVar[tuple[str, ...]] = ("cabextract",)
+    # Cabinets at least this large go to cabextract first, when installed
+    # (the built-in LZX decoder runs at a few MB/s)
+    CABEXTRACT_MIN_BYTES: ClassVar[int] = 16 * 1024 * 1024
 
     # Font file extensions
     FONT_EXTENSIONS: ClassVar[tuple[str, ...]] = (".ttf", ".ttc", ".otf")
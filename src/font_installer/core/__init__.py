@@ -1,15 +1,44 @@
-"""Core module - business logic for font installation."""
-
-from .exceptions import (
-    FontInstallerError,
-    DownloadError,
-    ExtractionError,
-    InstallationError,
-    DependencyError,
-)
-from .downloader import Downloader, DownloadProgress
-from .extractor import FontExtractor
-from .installer import FontInstaller
+"""
+Core module - business logic for font installation.
+
+Names are imported on first access (PEP 562), so importing one core
+module does not load the download, extraction and async machinery along
+with it.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .async_downloader import AsyncDownloader
+    from .async_installer import AsyncFontInstaller
+    from .downloader import Downloader
+    from .exceptions import (
+        DependencyError,
+        DownloadError,
+        ExtractionError,
+        FontInstallerError,
+        InstallationError,
+    )
+    from .extractor import FontExtractor
+    from .installer import FontInstaller
+    from .progress import DownloadProgress, ProgressBus
+
+# Public name -> defining submodule
+_EXPORTS = {
+    "FontInstallerError": "exceptions",
+    "DownloadError": "exceptions",
+    "ExtractionError": "exceptions",
+    "InstallationError": "exceptions",
+    "DependencyError": "exceptions",
+    "Downloader": "downloader",
+    "DownloadProgress": "progress",
+    "ProgressBus": "progress",
+    "FontExtractor": "extractor",
+    "FontInstaller": "installer",
+    "AsyncDownloader": "async_downloader",
+    "AsyncFontInstaller": "async_installer",
+}
 
 __all__ = [
     "FontInstallerError",
@@ -19,6 +48,21 @@ __all__ = [
     "DependencyError",
     "Downloader",
     "DownloadProgress",
+    "ProgressBus",
     "FontExtractor",
     "FontInstaller",
+    "AsyncDownloader",
+    "AsyncFontInstaller",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
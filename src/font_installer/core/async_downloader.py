@@ -0,0 +1,582 @@
+"""Asyncio-native downloader sharing the threaded downloader's formats."""
+
+import asyncio
+import http.client
+import io
+import json
+import ssl
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from pathlib import Path
+
+from ..config.settings import Settings
+from .cache import ReleaseCache
+from .downloader import Downloader, ReleaseInfo
+from .exceptions import DownloadError
+from .progress import DownloadProgress, ProgressCallback
+
+_Key = tuple[str, str, int]
+_Connection = tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class AsyncHttpResponse:
+    """
+    Response from AsyncHttpClient.
+
+    Reading the body to the end (or closing the response after that)
+    hands the connection back to the pool for reuse.
+    """
+
+    def __init__(
+        self,
+        client: "AsyncHttpClient",
+        key: _Key,
+        conn: _Connection,
+        status: int,
+        reason: str,
+        headers: http.client.HTTPMessage,
+        url: str,
+        method: str,
+    ):
+        self._client = client
+        self._key = key
+        self._conn: _Connection | None = conn
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.url = url
+
+        encoding = headers.get("Transfer-Encoding", "").lower()
+        self._chunked = "chunked" in encoding
+        self._chunk_left = 0
+        length = headers.get("Content-Length")
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            self._remaining: int | None = 0
+        elif self._chunked:
+            self._remaining = None
+        else:
+            self._remaining = int(length) if length and length.isdigit() else None
+        self._eof = self._remaining == 0
+        self._keep_alive = (
+            headers.get("Connection", "").lower() != "close"
+            and (self._chunked or self._remaining is not None)
+        )
+        self._decoder = (
+            zlib.decompressobj(16 + zlib.MAX_WBITS)
+            if headers.get("Content-Encoding", "").lower() == "gzip"
+            else None
+        )
+
+    async def read(self, amt: int = -1) -> bytes:
+        """Read (and transparently gunzip) up to amt bytes; -1 reads all."""
+        if amt < 0:
+            parts = []
+            while chunk := await self.read(Downloader.CHUNK_SIZE):
+                parts.append(chunk)
+            return b"".join(parts)
+
+        data = await self._read_raw(amt)
+        if self._decoder is not None:
+            data = self._decoder.decompress(data)
+            if self._eof:
+                data += self._decoder.flush()
+        return data
+
+    async def _read_raw(self, amt: int) -> bytes:
+        if self._eof or self._conn is None:
+            return b""
+        reader = self._conn[0]
+
+        if self._chunked:
+            if self._chunk_left == 0:
+                size_line = await reader.readline()
+                self._chunk_left = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if self._chunk_left == 0:
+                    # Skip trailers up to the terminating blank line
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    self._eof = True
+                    return b""
+            data = await reader.read(min(amt, self._chunk_left))
+            if not data:
+                raise http.client.IncompleteRead(b"")
+            self._chunk_left -= len(data)
+            if self._chunk_left == 0:
+                await reader.readexactly(2)
+            return data
+
+        if self._remaining is None:
+            data = await reader.read(amt)
+            self._eof = not data
+            return data
+
+        data = await reader.read(min(amt, self._remaining))
+        if not data:
+            raise http.client.IncompleteRead(b"", self._remaining)
+        self._remaining -= len(data)
+        self._eof = self._remaining == 0
+        return data
+
+    def close(self) -> None:
+        """Release the connection: back to the pool if fully read."""
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        self._client._release(self._key, conn, self._eof and self._keep_alive)
+
+    async def __aenter__(self) -> "AsyncHttpResponse":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class AsyncHttpClient:
+    """
+    Minimal asyncio HTTP/1.1 client with per-host keep-alive pools.
+
+    Mirrors HttpClient: at most ``max_per_host`` connections per host,
+    redirects followed internally, environment proxies honored (HTTPS
+    through CONNECT) and error statuses raised as urllib.error.HTTPError.
+    """
+
+    REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+    def __init__(self, max_per_host: int | None = None, max_redirects: int = 10):
+        self.max_per_host = max_per_host or Settings.HTTP_MAX_CONNECTIONS_PER_HOST
+        self.max_redirects = max_redirects
+        self._idle: dict[_Key, list[_Connection]] = {}
+        self._slots: dict[_Key, asyncio.Semaphore] = {}
+        self._ssl_context = ssl.create_default_context()
+        self._proxies = urllib.request.getproxies()
+
+    async def open(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        method: str = "GET",
+        timeout: float | None = None,
+        compressed: bool = False,
+    ) -> AsyncHttpResponse:
+        """
+        Send a request and return the response once headers arrive.
+
+        Args:
+            url: Absolute http(s) URL
+            headers: Extra request headers
+            method: HTTP method
+            timeout: Timeout in seconds for connecting and receiving headers
+            compressed: Ask for a gzip-encoded body (decoded on read)
+
+        Returns:
+            AsyncHttpResponse with a 2xx status
+
+        Raises:
+            urllib.error.HTTPError: For 304 and 4xx/5xx responses
+            OSError, http.client.HTTPException: On connection failures
+        """
+        request_headers = {"User-Agent": Settings.USER_AGENT, **(headers or {})}
+        if compressed:
+            request_headers["Accept-Encoding"] = "gzip"
+
+        for _ in range(self.max_redirects + 1):
+            response = await asyncio.wait_for(
+                self._request(method, url, request_headers), timeout
+            )
+            location = response.headers.get("Location")
+            if response.status not in self.REDIRECT_CODES or not location:
+                break
+            await response.read()
+            response.close()
+            url = urllib.parse.urljoin(url, location)
+            if response.status == 303:
+                method = "GET"
+        else:
+            raise http.client.HTTPException(f"too many redirects: {url}")
+
+        if response.status >= 300:
+            response.close()
+            raise urllib.error.HTTPError(
+                url, response.status, response.reason, response.headers, None
+            )
+        return response
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for _, writer in conns:
+                writer.close()
+
+    async def _request(
+        self, method: str, url: str, headers: dict[str, str]
+    ) -> AsyncHttpResponse:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise http.client.InvalidURL(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        proxy = self._proxy_for(parts.scheme, parts.hostname)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        if proxy and parts.scheme == "http":
+            target = url
+
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{port}"
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host_header}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        slot = self._slot(key)
+        await slot.acquire()
+        conn: _Connection | None = None
+        try:
+            while True:
+                conn, reused = await self._checkout(key, proxy)
+                try:
+                    conn[1].write(request)
+                    await conn[1].drain()
+                    status, reason, response_headers = await self._read_head(conn[0])
+                    break
+                except (OSError, http.client.HTTPException, asyncio.IncompleteReadError):
+                    conn[1].close()
+                    conn = None
+                    if not reused:
+                        raise
+        except BaseException:
+            if conn is not None:
+                conn[1].close()  # cancelled mid-request
+            slot.release()
+            raise
+        return AsyncHttpResponse(
+            self, key, conn, status, reason, response_headers, url, method
+        )
+
+    @staticmethod
+    async def _read_head(
+        reader: asyncio.StreamReader,
+    ) -> tuple[int, str, http.client.HTTPMessage]:
+        """Read a status line and headers."""
+        status_line = await reader.readline()
+        if not status_line:
+            raise http.client.RemoteDisconnected("connection closed by server")
+        try:
+            _, code, *reason = status_line.decode("latin-1").split(None, 2)
+            status = int(code)
+        except ValueError:
+            raise http.client.BadStatusLine(
+                status_line.decode("latin-1", "replace")
+            ) from None
+
+        raw = bytearray()
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            raw += line
+        headers = http.client.parse_headers(io.BytesIO(bytes(raw) + b"\r\n"))
+        return status, " ".join(reason).strip(), headers
+
+    def _slot(self, key: _Key) -> asyncio.Semaphore:
+        if key not in self._slots:
+            self._slots[key] = asyncio.Semaphore(self.max_per_host)
+        return self._slots[key]
+
+    async def _checkout(
+        self, key: _Key, proxy: tuple[str, int] | None
+    ) -> tuple[_Connection, bool]:
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if not conn[0].at_eof() and not conn[1].is_closing():
+                return conn, True
+            conn[1].close()
+
+        scheme, host, port = key
+        use_tls = scheme == "https"
+        if proxy is None:
+            conn = await asyncio.open_connection(
+                host,
+                port,
+                ssl=self._ssl_context if use_tls else None,
+                server_hostname=host if use_tls else None,
+            )
+            return conn, False
+
+        reader, writer = await asyncio.open_connection(*proxy)
+        if use_tls:
+            writer.write(
+                f"CONNECT {host}:{port} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode()
+            )
+            await writer.drain()
+            status, reason, _ = await self._read_head(reader)
+            if status != 200:
+                writer.close()
+                raise OSError(f"proxy CONNECT failed: {status} {reason}")
+            await writer.start_tls(self._ssl_context, server_hostname=host)
+        return (reader, writer), False
+
+    def _release(self, key: _Key, conn: _Connection, reusable: bool) -> None:
+        if reusable:
+            self._idle.setdefault(key, []).append(conn)
+        else:
+            conn[1].close()
+        self._slot(key).release()
+
+    def _proxy_for(self, scheme: str, host: str) -> tuple[str, int] | None:
+        proxy = self._proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+        if not parts.hostname:
+            return None
+        return parts.hostname, parts.port or 80
+
+
+class AsyncDownloader:
+    """
+    Asyncio counterpart of Downloader.
+
+    Uses the same partial-file/state format (so a download interrupted in
+    one engine resumes in the other), the same release metadata cache and
+    the same DownloadProgress reports. Progress callbacks run on the event
+    loop thread.
+    """
+
+    def __init__(
+        self,
+        progress_callback: ProgressCallback | None = None,
+        release_cache: ReleaseCache | None = None,
+        http_client: AsyncHttpClient | None = None,
+    ):
+        self._callback = progress_callback
+        self._release_cache = release_cache or ReleaseCache()
+        self._http = http_client or AsyncHttpClient()
+
+    def _report(
+        self,
+        name: str,
+        percent: int,
+        status: str,
+        downloaded: int = 0,
+        total: int = 0,
+    ) -> None:
+        """Report progress to callback if set."""
+        if self._callback:
+            self._callback(
+                DownloadProgress(
+                    name=name,
+                    percent=percent,
+                    status=status,
+                    bytes_downloaded=downloaded,
+                    total_bytes=total,
+                )
+            )
+
+    async def download_file(self, url: str, dest: Path, name: str) -> Path:
+        """
+        Download a file from URL to destination path.
+
+        Interrupted transfers are resumed with Range/If-Range and retried
+        up to Settings.DOWNLOAD_RETRIES times, as in Downloader.
+
+        Args:
+            url: Source URL
+            dest: Destination path
+            name: Display name for progress
+
+        Returns:
+            Path to downloaded file
+
+        Raises:
+            DownloadError: If download fails
+        """
+        part = dest.with_name(dest.name + ".part")
+        state_path = dest.with_name(dest.name + ".part.json")
+        self._report(name, 0, "Iniciando download...")
+
+        attempt = 0
+        while True:
+            try:
+                await self._download_attempt(url, part, state_path, name)
+                break
+            except urllib.error.HTTPError as e:
+                if e.code < 500 or attempt >= Settings.DOWNLOAD_RETRIES:
+                    raise DownloadError(url, f"HTTP {e.code}: {e.reason}") from e
+            except (
+                TimeoutError,
+                OSError,
+                http.client.HTTPException,
+                asyncio.IncompleteReadError,
+            ) as e:
+                if attempt >= Settings.DOWNLOAD_RETRIES:
+                    raise DownloadError(url, str(e) or type(e).__name__) from e
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                raise DownloadError(url, str(e)) from e
+
+            attempt += 1
+            self._report(name, 0, "Conexao interrompida, retomando...")
+            await asyncio.sleep(Settings.DOWNLOAD_RETRY_DELAY * attempt)
+
+        try:
+            part.replace(dest)
+        except OSError as e:
+            raise DownloadError(url, str(e)) from e
+        state_path.unlink(missing_ok=True)
+        self._report(name, 100, "Download concluido!")
+        return dest
+
+    async def _download_attempt(
+        self, url: str, part: Path, state_path: Path, name: str
+    ) -> None:
+        """Fetch url into part, resuming from its current size if possible."""
+        state = Downloader._load_part_state(state_path)
+        offset = part.stat().st_size if part.exists() else 0
+
+        headers: dict[str, str] = {}
+        resuming = bool(
+            offset
+            and state.get("url") == url
+            and state.get("validator")
+            and "segments" not in state
+        )
+        if resuming:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = state["validator"]
+
+        try:
+            response = await self._http.open(
+                url, headers, timeout=Settings.DOWNLOAD_TIMEOUT
+            )
+        except urllib.error.HTTPError as e:
+            if e.code != 416 or not resuming:
+                raise
+            if offset == state.get("total"):
+                return
+            part.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            return await self._download_attempt(url, part, state_path, name)
+
+        async with response:
+            if resuming and response.status == 206:
+                start, total = Downloader._parse_content_range(
+                    response.headers.get("Content-Range", "")
+                )
+                if start != offset:
+                    part.unlink(missing_ok=True)
+                    raise ConnectionError("Content-Range inconsistente")
+                mode = "ab"
+            else:
+                offset = 0
+                total = int(response.headers.get("Content-Length") or 0)
+                mode = "wb"
+
+            Downloader._save_part_state(
+                state_path,
+                {
+                    "url": url,
+                    "validator": Downloader._validator(response),
+                    "total": total,
+                },
+            )
+
+            downloaded = offset
+            with open(part, mode) as f:
+                while chunk := await asyncio.wait_for(
+                    response.read(Downloader.CHUNK_SIZE), Settings.DOWNLOAD_TIMEOUT
+                ):
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    if total > 0:
+                        percent = min(100, downloaded * 100 // total)
+                        self._report(
+                            name, percent, f"Baixando... {percent}%", downloaded, total
+                        )
+
+        if total and downloaded != total:
+            raise ConnectionError(f"download incompleto ({downloaded}/{total} bytes)")
+
+    async def get_github_release(self, repo: str) -> ReleaseInfo:
+        """
+        Get metadata for the latest GitHub release of a repository.
+
+        Same caching and conditional-request rules as
+        Downloader.get_github_release.
+
+        Raises:
+            DownloadError: If the release cannot be fetched and nothing is
+                cached
+        """
+        api_url = f"{Settings.GITHUB_API_BASE}/{repo}/releases/latest"
+        cached = self._release_cache.load(repo)
+
+        if cached and self._release_cache.is_fresh(cached):
+            return ReleaseInfo.from_api(repo, cached["release"])
+
+        headers = {"Accept": "application/vnd.github+json"}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            response = await self._http.open(
+                api_url, headers, timeout=Settings.API_TIMEOUT, compressed=True
+            )
+            async with response:
+                body = await asyncio.wait_for(response.read(), Settings.API_TIMEOUT)
+            data = json.loads(body.decode())
+        except urllib.error.HTTPError as e:
+            if not cached:
+                raise DownloadError(api_url, Downloader._describe_api_error(e)) from e
+            if e.code == 304:
+                self._release_cache.touch(repo, cached)
+            return ReleaseInfo.from_api(repo, cached["release"])
+        except (
+            TimeoutError,
+            OSError,
+            http.client.HTTPException,
+            asyncio.IncompleteReadError,
+            ValueError,
+        ) as e:
+            if cached:
+                return ReleaseInfo.from_api(repo, cached["release"])
+            raise DownloadError(api_url, str(e) or type(e).__name__) from e
+
+        release = ReleaseInfo.from_api(repo, data)
+        self._release_cache.save(
+            repo,
+            release.to_cache(),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+        return release
+
+    async def get_github_release_url(
+        self, repo: str, asset_pattern: str, formats: tuple[str, ...] | None = None
+    ) -> str | None:
+        """
+        Get download URL for latest GitHub release asset.
+
+        See Downloader.get_github_release_url.
+
+        Args:
+            repo: GitHub repo in format "owner/repo"
+            asset_pattern: Pattern to match asset filename
+            formats: Acceptable font formats (default Settings.ASSET_FORMATS)
+
+        Returns:
+            Download URL or None if the release has no matching asset
+
+        Raises:
+            DownloadError: If the release metadata cannot be fetched
+        """
+        release = await self.get_github_release(repo)
+        asset = release.find_asset(asset_pattern, formats)
+        return asset.url if asset else None
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._http.close()
@@ -0,0 +1,532 @@
+"""Asyncio-native font installation orchestrator."""
+
+import asyncio
+import contextvars
+import time
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import replace
+from pathlib import Path
+
+from ..config.fonts import DEV_FONTS
+from ..config.settings import Settings
+from .async_downloader import AsyncDownloader
+from .cache import DownloadCache, file_sha256
+from .exceptions import DownloadError, ExtractionError
+from .extractor import FontExtractor
+from .fontcache import FontCacheRefresher
+from .installer import FontInstaller, InstallResult
+from .lockfile import Lockfile, verify_download
+from .manifest import InstallManifest, InstallRecord
+from .progress import DownloadProgress, ProgressCallback
+from .steps import (
+    CLEARTYPE_KEY,
+    CORE_KEY,
+    FontPlacer,
+    archive_name,
+    asset_formats_for,
+    cleartype_record,
+    dev_font_record,
+    format_for,
+    github_source,
+    locked_members,
+    locked_record,
+    staging_dir,
+)
+
+# Bytes downloaded by the install_font() running in the current task
+_downloaded: contextvars.ContextVar[list[int]] = contextvars.ContextVar("downloaded")
+
+
+class AsyncFontInstaller:
+    """
+    Asyncio counterpart of FontInstaller.
+
+    Network transfers run on the event loop through AsyncDownloader and
+    cabextract through asyncio subprocesses, so many fonts can be
+    installed concurrently without a thread each. ZIP extraction, file
+    copies and font cache refreshes are offloaded to worker threads and
+    use the same steps as FontInstaller (see steps.py).
+    Progress callbacks run on the event loop thread.
+    """
+
+    def __init__(
+        self,
+        progress_callback: ProgressCallback | None = None,
+        cache: DownloadCache | None = None,
+        manifest: InstallManifest | None = None,
+        font_format: str | None = None,
+        font_cache: FontCacheRefresher | None = None,
+        lockfile: Lockfile | None = None,
+    ):
+        self._callback = progress_callback
+        self._downloader = AsyncDownloader(progress_callback)
+        self._extractor = FontExtractor()
+        self._cache = cache or DownloadCache()
+        self._placer = FontPlacer(manifest, font_cache)
+        # Format policy for this run; overrides FontInfo.font_format
+        self._font_format = font_format
+        # With a lockfile, install_font() installs its exact downloads
+        self._lockfile = lockfile
+
+    def _report(self, name: str, percent: int, status: str) -> None:
+        """Report progress."""
+        if self._callback:
+            self._callback(DownloadProgress(name=name, percent=percent, status=status))
+
+    async def _fetch(self, url: str, dest: Path, name: str) -> Path:
+        """
+        Get an artifact from the download cache, downloading it on a miss.
+
+        Same cache and partial-download layout as FontInstaller._fetch.
+        """
+        cached = await asyncio.to_thread(self._cache.lookup, url)
+        if cached:
+            self._report(name, 100, "Usando arquivo em cache")
+            return cached
+
+        claim = self._cache.claim(url)
+        partial = await asyncio.to_thread(claim.__enter__)
+        try:
+            if partial is None:
+                path = await self._downloader.download_file(url, dest, name)
+                self._count_download(path.stat().st_size)
+                return path
+
+            cached = await asyncio.to_thread(self._cache.lookup, url)
+            if cached:
+                self._report(name, 100, "Usando arquivo em cache")
+                return cached
+
+            await self._downloader.download_file(url, partial, name)
+            self._count_download(partial.stat().st_size)
+            try:
+                return await asyncio.to_thread(self._cache.store, url, partial)
+            except OSError:
+                return partial
+        finally:
+            claim.__exit__(None, None, None)
+
+    @staticmethod
+    def _count_download(size: int) -> None:
+        """Add to the bytes downloaded by the current task's install."""
+        counter = _downloaded.get(None)
+        if counter is not None:
+            counter[0] += size
+
+    async def _cabextract(
+        self, archive: Path, output_dir: Path, check: bool = False
+    ) -> bool:
+        """
+        Run cabextract without blocking the event loop.
+
+        Returns:
+            True if extraction succeeded
+
+        Raises:
+            ExtractionError: If check is set and extraction fails
+        """
+        process = await asyncio.create_subprocess_exec(
+            *FontExtractor._cabextract_command(archive, output_dir),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0 and check:
+            raise ExtractionError(str(archive), stderr.decode(errors="replace"))
+        return process.returncode == 0
+
+    async def _extract_from_cab(self, archive: Path, output_dir: Path) -> list[Path]:
+        """
+        Extract fonts from a cabinet/executable, including nested archives.
+
+        Same order as FontExtractor.extract_from_cab: the in-process
+        cabinet reader in a worker thread, with cabextract (when installed)
+        tried first for large archives and used as the fallback. cabextract
+        runs as a subprocess with the same filter and per-archive
+        directories as FontExtractor, and nested archives at each level are
+        unpacked concurrently.
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        cabextract = FontExtractor.has_cabextract()
+        if cabextract and FontExtractor.is_large_cabinet(archive):
+            try:
+                fonts = await self._cabextract_fonts(archive, output_dir)
+                if fonts:
+                    return fonts
+            except (ExtractionError, OSError):
+                pass  # fall back to the in-process reader
+            cabextract = False  # already tried
+
+        try:
+            fonts = await asyncio.to_thread(
+                self._extractor.extract_cab_fonts, archive, output_dir
+            )
+        except ExtractionError:
+            if not cabextract:
+                raise
+            fonts = []
+        except OSError as e:
+            if not cabextract:
+                raise ExtractionError(str(archive), str(e)) from e
+            fonts = []
+        if fonts or not cabextract:
+            return fonts
+        return await self._cabextract_fonts(archive, output_dir)
+
+    async def _cabextract_fonts(self, archive: Path, output_dir: Path) -> list[Path]:
+        """Extract fonts with cabextract, unpacking nested archives if needed."""
+        await self._cabextract(archive, output_dir, check=True)
+
+        fonts = await asyncio.to_thread(
+            FontExtractor._find_fonts_in_directory, output_dir
+        )
+        seen: set[Path] = set()
+
+        for _ in range(FontExtractor.MAX_NESTING):
+            if fonts:
+                break
+            nested = [
+                p
+                for p in await asyncio.to_thread(
+                    FontExtractor._nested_archives, output_dir
+                )
+                if p not in seen
+            ]
+            if not nested:
+                break
+            seen.update(nested)
+
+            results = await asyncio.gather(
+                *(self._cabextract(p, p.with_name(p.name + ".d")) for p in nested)
+            )
+            for path, ok in zip(nested, results, strict=True):
+                if ok:
+                    path.unlink(missing_ok=True)
+
+            fonts = await asyncio.to_thread(
+                FontExtractor._find_fonts_in_directory, output_dir
+            )
+
+        return fonts
+
+    async def _finish_install(
+        self,
+        font_name: str,
+        fonts: list[Path],
+        target_dir: Path,
+        label: str,
+        record: InstallRecord,
+    ) -> InstallResult:
+        """Install extracted font files, record them and build the result."""
+        if not fonts:
+            return InstallResult(
+                success=False,
+                font_name=font_name,
+                files_installed=0,
+                message="Nenhuma fonte encontrada no arquivo",
+            )
+
+        self._report(font_name, 100, "Instalando fontes...")
+        summary = await asyncio.to_thread(
+            self._placer.install_fonts_to_dir, fonts, target_dir
+        )
+        await asyncio.to_thread(self._placer.record, record, summary)
+
+        result = FontInstaller._install_result(font_name, label, summary)
+        self._report(font_name, 100, f"{result.files_installed} {label}!")
+        return result
+
+    async def install_cleartype_fonts(self) -> InstallResult:
+        """
+        Install Microsoft ClearType fonts from PowerPoint Viewer.
+
+        Returns:
+            InstallResult with installation status
+        """
+        self._report("ClearType", 0, "Iniciando instalacao...")
+
+        with staging_dir() as tmpdir:
+            tmppath = Path(tmpdir)
+            try:
+                ppviewer = await self._fetch(
+                    Settings.POWERPOINT_VIEWER_URL,
+                    tmppath / "PowerPointViewer.exe",
+                    "ClearType",
+                )
+
+                self._report("ClearType", 100, "Extraindo fontes...")
+                fonts = await self._extract_from_cab(ppviewer, tmppath / "extracted")
+
+                return await self._finish_install(
+                    "ClearType",
+                    fonts,
+                    Settings.MICROSOFT_FONTS_DIR,
+                    "fontes instaladas",
+                    cleartype_record(),
+                )
+
+            except Exception as e:
+                return InstallResult(
+                    success=False,
+                    font_name="ClearType",
+                    files_installed=0,
+                    message=str(e),
+                )
+
+    async def install_dev_font(self, font_key: str) -> InstallResult:
+        """
+        Install a developer font from GitHub.
+
+        Args:
+            font_key: Key from DEV_FONTS dictionary
+
+        Returns:
+            InstallResult with installation status
+        """
+        if font_key not in DEV_FONTS:
+            return InstallResult(
+                success=False,
+                font_name=font_key,
+                files_installed=0,
+                message=f"Fonte desconhecida: {font_key}",
+            )
+
+        font_info = DEV_FONTS[font_key]
+        font_name = font_info.name
+
+        self._report(font_name, 0, "Buscando release...")
+
+        try:
+            repo, asset_pattern = github_source(font_info)
+            release = await self._downloader.get_github_release(repo)
+        except DownloadError as e:
+            return InstallResult(
+                success=False,
+                font_name=font_name,
+                files_installed=0,
+                message=str(e),
+            )
+
+        font_format = format_for(font_info, self._font_format)
+        selection = release.select_asset(asset_pattern, asset_formats_for(font_format))
+        asset = selection.asset
+        if not asset:
+            return InstallResult(
+                success=False,
+                font_name=font_name,
+                files_installed=0,
+                message="Release nao encontrada no GitHub",
+            )
+        url = asset.url
+
+        with staging_dir() as tmpdir:
+            tmppath = Path(tmpdir)
+            try:
+                zip_path = await self._fetch(url, tmppath / f"{font_key}.zip", font_name)
+
+                self._report(font_name, 100, "Extraindo fontes...")
+                fonts = await asyncio.to_thread(
+                    self._extractor.extract_from_zip,
+                    zip_path,
+                    tmppath / font_key,
+                    font_format,
+                )
+
+                result = await self._finish_install(
+                    font_name,
+                    fonts,
+                    Settings.DEV_FONTS_DIR,
+                    "arquivos instalados",
+                    dev_font_record(font_key, font_info, release, asset),
+                )
+                return replace(result, asset_selection=selection)
+
+            except Exception as e:
+                return InstallResult(
+                    success=False,
+                    font_name=font_name,
+                    files_installed=0,
+                    message=str(e),
+                )
+
+    async def install_locked(self, key: str) -> InstallResult:
+        """
+        Install a font from its lockfile entry.
+
+        Same checks as FontInstaller.install_locked: no release lookups,
+        and the download must match the locked size and sha256 before it
+        is extracted.
+
+        Args:
+            key: Key present in the installer's lockfile
+
+        Returns:
+            InstallResult with installation status
+        """
+        locked = self._lockfile.fonts.get(key) if self._lockfile else None
+        if locked is None:
+            return InstallResult(
+                success=False,
+                font_name=key,
+                files_installed=0,
+                message=f"Fonte ausente no lockfile: {key}",
+            )
+
+        name = locked.name
+        cleartype = key == CLEARTYPE_KEY
+        self._report(name, 0, "Usando lockfile...")
+
+        with staging_dir() as tmpdir:
+            tmppath = Path(tmpdir)
+            try:
+                archive = await self._fetch(
+                    locked.url, tmppath / archive_name(key), name
+                )
+                self._report(name, 100, "Verificando sha256...")
+                sha256 = await asyncio.to_thread(file_sha256, archive)
+                verify_download(locked, archive.stat().st_size, sha256, locked.url)
+
+                self._report(name, 100, "Extraindo fontes...")
+                if cleartype:
+                    fonts = await self._extract_from_cab(archive, tmppath / key)
+                else:
+                    fonts = await asyncio.to_thread(
+                        self._extractor.extract_from_zip,
+                        archive,
+                        tmppath / key,
+                        locked.font_format,
+                    )
+
+                record = locked_record(locked, cleartype)
+                return await self._finish_install(
+                    name,
+                    locked_members(locked, fonts),
+                    record.target_dir,
+                    "fontes instaladas" if cleartype else "arquivos instalados",
+                    record,
+                )
+
+            except Exception as e:
+                return InstallResult(
+                    success=False,
+                    font_name=name,
+                    files_installed=0,
+                    message=str(e),
+                )
+
+    async def install_font(self, key: str) -> InstallResult:
+        """
+        Install a single font by key.
+
+        Like FontInstaller.install_font, the result carries the key, the
+        elapsed time and the bytes downloaded, and a lockfile makes fonts
+        install from their locked entries.
+
+        Args:
+            key: CLEARTYPE_KEY, CORE_KEY or a key from DEV_FONTS
+
+        Returns:
+            InstallResult with installation status
+        """
+        start = time.monotonic()
+        counter = [0]
+        token = _downloaded.set(counter)
+        try:
+            if key == CORE_KEY:
+                result = await asyncio.to_thread(FontInstaller.install_core_fonts)
+            elif self._lockfile is not None:
+                result = await self.install_locked(key)
+            elif key == CLEARTYPE_KEY:
+                result = await self.install_cleartype_fonts()
+            else:
+                result = await self.install_dev_font(key)
+        finally:
+            _downloaded.reset(token)
+        return replace(
+            result,
+            key=key,
+            elapsed=time.monotonic() - start,
+            bytes_downloaded=counter[0],
+        )
+
+    async def install_many(
+        self, keys: Iterable[str], jobs: int | None = None
+    ) -> AsyncIterator[InstallResult]:
+        """
+        Install several fonts concurrently on the event loop.
+
+        Args:
+            keys: CLEARTYPE_KEY, CORE_KEY and/or keys from DEV_FONTS
+            jobs: Maximum number of concurrent installs
+                (defaults to Settings.INSTALL_JOBS)
+
+        Yields:
+            InstallResult for each key, in completion order
+        """
+        keys = list(dict.fromkeys(keys))
+        semaphore = asyncio.Semaphore(max(1, jobs or Settings.INSTALL_JOBS))
+
+        async def run(key: str) -> InstallResult:
+            async with semaphore:
+                try:
+                    return await self.install_font(key)
+                except Exception as e:
+                    return InstallResult(
+                        success=False,
+                        font_name=key,
+                        files_installed=0,
+                        message=str(e),
+                        key=key,
+                    )
+
+        tasks = [asyncio.create_task(run(key)) for key in keys]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Let cancelled installs unwind before the generator closes
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def refresh_font_cache(self) -> bool:
+        """
+        Schedule a background font cache refresh for changed directories.
+
+        See FontInstaller.refresh_font_cache; this does not wait for
+        fc-cache to finish.
+
+        Returns:
+            True if the refresh was scheduled
+        """
+        return await asyncio.to_thread(self._placer.refresh_font_cache)
+
+    @staticmethod
+    async def update_font_cache(directories: Iterable[Path] | None = None) -> bool:
+        """
+        Update system font cache (incrementally) without blocking the event loop.
+
+        Same directories as FontInstaller.update_font_cache; fc-cache runs
+        as an asyncio subprocess, like cabextract.
+
+        Returns:
+            True if successful
+        """
+        if directories is None:
+            directories = [Settings.FONTS_BASE_DIR]
+        paths = FontCacheRefresher._collapse([str(Path(d)) for d in directories])
+        if not paths:
+            return True
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *FontCacheRefresher._fc_cache_command(paths),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError:
+            return False
+        return await process.wait() == 0
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._downloader.close()
@@ -0,0 +1,355 @@
+"""Persistent on-disk caches for downloaded artifacts and release metadata."""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ..config.settings import Settings
+
+
+@dataclass
+class CacheStats:
+    """Summary of the download cache contents."""
+
+    path: Path
+    entries: int
+    urls: int
+    total_bytes: int
+    max_bytes: int
+
+
+def file_sha256(path: Path) -> str:
+    """Compute the sha256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadCache:
+    """
+    On-disk cache of downloaded archives, keyed by URL and content hash.
+
+    Files are stored once per sha256 under ``blobs/``; ``index.json`` maps
+    each URL to a blob and records sizes and last-use times for LRU
+    eviction. Index updates are guarded by a thread lock and an ``flock``
+    so several threads and processes can share the same cache.
+    """
+
+    INDEX_NAME = "index.json"
+    LOCK_NAME = ".lock"
+
+    def __init__(self, root: Path | None = None, max_bytes: int | None = None):
+        self.root = root or Settings.CACHE_DIR
+        self.max_bytes = Settings.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def blobs_dir(self) -> Path:
+        """Directory holding the cached files."""
+        return self.root / "blobs"
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.blobs_dir / sha256[:2] / sha256
+
+    @contextmanager
+    def claim(self, url: str) -> Iterator[Path | None]:
+        """
+        Reserve the persistent download path for a URL.
+
+        The path lives under ``partial/`` so an interrupted download can be
+        resumed by a later run. An exclusive ``flock`` is held while the
+        caller downloads, so concurrent installers fetching the same URL
+        wait for each other instead of writing the same file.
+
+        Yields:
+            Download path, or None if the cache directory is not writable
+        """
+        path = self._partial_path(url)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = open(path.with_suffix(".lock"), "a")
+        except OSError:
+            yield None
+            return
+
+        with lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield path
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _partial_path(self, url: str) -> Path:
+        return self.root / "partial" / hashlib.sha256(url.encode()).hexdigest()
+
+    @contextmanager
+    def _unclaimed(self, urls: list[str]) -> Iterator[bool]:
+        """
+        Hold the claims of urls, if no one else holds them.
+
+        Yields:
+            False if some URL is claimed by a running download
+        """
+        with ExitStack() as stack:
+            for url in urls:
+                try:
+                    lock_file = stack.enter_context(
+                        open(self._partial_path(url).with_suffix(".lock"))
+                    )
+                except FileNotFoundError:
+                    continue  # never claimed
+                except OSError:
+                    yield False
+                    return
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    yield False
+                    return
+                stack.callback(fcntl.flock, lock_file, fcntl.LOCK_UN)
+            yield True
+
+    @contextmanager
+    def _locked(self) -> Iterator[dict[str, Any]]:
+        """Load the index under lock and save it back on exit."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.root / self.LOCK_NAME, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                index = self._load_index()
+                yield index
+                self._save_index(index)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_index(self) -> dict[str, Any]:
+        data: dict[str, Any]
+        try:
+            data = json.loads((self.root / self.INDEX_NAME).read_text())
+        except (OSError, ValueError):
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        data.setdefault("urls", {})
+        data.setdefault("blobs", {})
+        return data
+
+    def _save_index(self, index: dict[str, Any]) -> None:
+        tmp = self.root / f"{self.INDEX_NAME}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(index, indent=1, sort_keys=True))
+        os.replace(tmp, self.root / self.INDEX_NAME)
+
+    def lookup(self, url: str) -> Path | None:
+        """
+        Return the cached file for a URL, if present.
+
+        Args:
+            url: Source URL of the artifact
+
+        Returns:
+            Path to the cached file or None on a cache miss
+        """
+        if not (self.root / self.INDEX_NAME).exists():
+            return None
+
+        with self._locked() as index:
+            sha256 = index["urls"].get(url)
+            blob = index["blobs"].get(sha256) if sha256 else None
+            if blob is None:
+                return None
+
+            path = self._blob_path(sha256)
+            try:
+                if path.stat().st_size != blob["size"]:
+                    raise FileNotFoundError(path)
+            except OSError:
+                self._drop_blob(index, sha256)
+                return None
+
+            blob["last_used"] = time.time()
+            return path
+
+    def store(self, url: str, file: Path) -> Path:
+        """
+        Move a downloaded file into the cache.
+
+        Args:
+            url: Source URL of the artifact
+            file: Downloaded file (moved, not copied)
+
+        Returns:
+            Path to the cached file
+        """
+        sha256 = file_sha256(file)
+        size = file.stat().st_size
+        path = self._blob_path(sha256)
+
+        with self._locked() as index:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists():
+                file.unlink()
+            else:
+                shutil.move(file, path)
+
+            index["urls"][url] = sha256
+            index["blobs"][sha256] = {"size": size, "last_used": time.time()}
+            self._evict(index, self.max_bytes, keep=sha256)
+
+        return path
+
+    def prune(self, max_bytes: int | None = None) -> int:
+        """
+        Evict least recently used files until the cache fits the limit.
+
+        Args:
+            max_bytes: Size limit (defaults to the cache's max_bytes)
+
+        Returns:
+            Number of bytes freed
+
+        Raises:
+            ValueError: If max_bytes is negative
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        if limit < 0:
+            raise ValueError(f"negative cache limit: {limit}")
+        with self._locked() as index:
+            # Forget entries whose files were removed behind our back
+            for sha256 in list(index["blobs"]):
+                if not self._blob_path(sha256).exists():
+                    self._drop_blob(index, sha256)
+            return self._evict(index, limit)
+
+    def clear(self) -> int:
+        """
+        Remove every cached file.
+
+        Returns:
+            Number of bytes freed
+        """
+        return self.prune(0)
+
+    def stats(self) -> CacheStats:
+        """Return a summary of the cache contents."""
+        index = self._load_index()
+        return CacheStats(
+            path=self.root,
+            entries=len(index["blobs"]),
+            urls=len(index["urls"]),
+            total_bytes=sum(b["size"] for b in index["blobs"].values()),
+            max_bytes=self.max_bytes,
+        )
+
+    def _evict(
+        self, index: dict[str, Any], max_bytes: int, keep: str | None = None
+    ) -> int:
+        """
+        Drop LRU blobs from an index until it fits max_bytes.
+
+        Blobs whose URLs are claimed by a running download are skipped; the
+        claims of a blob are held while its file is removed.
+        """
+        blobs = index["blobs"]
+        total = sum(b["size"] for b in blobs.values())
+        freed = 0
+
+        for sha256 in sorted(blobs, key=lambda s: blobs[s]["last_used"]):
+            if total <= max_bytes:
+                break
+            if sha256 == keep:
+                continue
+            urls = [u for u, s in index["urls"].items() if s == sha256]
+            with self._unclaimed(urls) as free:
+                if not free:
+                    continue
+                size = blobs[sha256]["size"]
+                self._drop_blob(index, sha256)
+            total -= size
+            freed += size
+
+        return freed
+
+    def _drop_blob(self, index: dict[str, Any], sha256: str) -> None:
+        """Remove a blob file and every index entry pointing at it."""
+        index["blobs"].pop(sha256, None)
+        for url in [u for u, s in index["urls"].items() if s == sha256]:
+            del index["urls"][url]
+        self._blob_path(sha256).unlink(missing_ok=True)
+
+
+class ReleaseCache:
+    """
+    On-disk cache of GitHub release metadata.
+
+    Stores the compact release data together with the response's ETag and
+    Last-Modified headers, one JSON file per repository, so lookups can be
+    revalidated with a conditional request or skipped within a TTL.
+    """
+
+    def __init__(self, root: Path | None = None, ttl: int | None = None):
+        self.root = root or Settings.CACHE_DIR / "releases"
+        self.ttl = Settings.RELEASE_CACHE_TTL if ttl is None else ttl
+
+    def _path(self, repo: str) -> Path:
+        return self.root / (repo.replace("/", "__") + ".json")
+
+    def load(self, repo: str) -> dict[str, Any] | None:
+        """
+        Load the cached entry for a repository.
+
+        Returns:
+            Dict with 'release', 'etag', 'last_modified' and 'fetched_at'
+            keys, or None if nothing is cached
+        """
+        try:
+            entry = json.loads(self._path(repo).read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get("release"), dict):
+            return None
+        return entry
+
+    def is_fresh(self, entry: dict[str, Any]) -> bool:
+        """Check whether an entry is recent enough to skip the network."""
+        fetched_at = entry.get("fetched_at")
+        if not isinstance(fetched_at, int | float):
+            return False
+        return time.time() - fetched_at < self.ttl
+
+    def save(
+        self,
+        repo: str,
+        release: dict[str, Any],
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Store release data and validators for a repository."""
+        entry = {
+            "release": release,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self._path(repo)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(entry))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def touch(self, repo: str, entry: dict[str, Any]) -> None:
+        """Mark a cached entry as revalidated now."""
+        self.save(repo, entry["release"], entry.get("etag"), entry.get("last_modified"))
@@ -1,37 +1,542 @@
 """File downloader with progress reporting."""
 
+import http.client
 import json
+import os
+import re
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
 import urllib.request
-from dataclasses import dataclass
+import zlib
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Callable, Protocol
+from typing import Any, ClassVar
 
 from ..config.settings import Settings
+from .cache import ReleaseCache
 from .exceptions import DownloadError
+from .progress import DownloadProgress, ProgressBus, ProgressCallback  # noqa: F401
 
 
-@dataclass
-class DownloadProgress:
-    """Progress information for a download."""
+@dataclass(frozen=True)
+class ReleaseAsset:
+    """A downloadable asset of a GitHub release."""
 
     name: str
-    percent: int
-    status: str
-    bytes_downloaded: int = 0
-    total_bytes: int = 0
+    url: str
+    size: int = 0
+    id: int | None = None
 
 
-class ProgressCallback(Protocol):
-    """Protocol for progress callback functions."""
+@dataclass(frozen=True)
+class ReleaseInfo:
+    """Compact view of a GitHub release."""
 
-    def __call__(self, progress: DownloadProgress) -> None: ...
+    repo: str
+    tag: str
+    assets: tuple[ReleaseAsset, ...] = field(default_factory=tuple)
+
+    @classmethod
+    def from_api(cls, repo: str, data: dict[str, Any]) -> "ReleaseInfo":
+        """Build from a GitHub API (or cached) release document."""
+        return cls(
+            repo=repo,
+            tag=data.get("tag_name") or "",
+            assets=tuple(
+                ReleaseAsset(
+                    name=asset.get("name", ""),
+                    url=asset.get("browser_download_url", ""),
+                    size=asset.get("size") or 0,
+                    id=asset.get("id"),
+                )
+                for asset in data.get("assets", [])
+                if asset.get("browser_download_url")
+            ),
+        )
+
+    def to_cache(self) -> dict[str, Any]:
+        """Serialize to the subset of the API document we keep on disk."""
+        return {
+            "tag_name": self.tag,
+            "assets": [
+                {
+                    "name": a.name,
+                    "browser_download_url": a.url,
+                    "size": a.size,
+                    "id": a.id,
+                }
+                for a in self.assets
+            ],
+        }
+
+    def find_asset(
+        self, asset_pattern: str, formats: tuple[str, ...] | None = None
+    ) -> ReleaseAsset | None:
+        """Pick the zip asset to download (see select_asset)."""
+        return self.select_asset(asset_pattern, formats).asset
+
+    def select_asset(
+        self, asset_pattern: str, formats: tuple[str, ...] | None = None
+    ) -> "AssetSelection":
+        """
+        Choose the smallest zip asset that provides the wanted font formats.
+
+        Candidates are the zips whose name contains asset_pattern (or every
+        zip if none does). Each candidate's contents are guessed from its
+        name tokens (ttf, otf, static, variable, webfont, ...); a name
+        without format tokens is taken to be an all-in-one archive. Among
+        the candidates that provide any of the wanted formats, the smallest
+        one wins; if none does, the first candidate is used as before.
+
+        Args:
+            asset_pattern: Substring identifying the font's assets
+            formats: Acceptable formats ("ttf", "otf", "variable");
+                defaults to Settings.ASSET_FORMATS
+
+        Returns:
+            AssetSelection with the chosen asset and the bytes it saves
+            compared with the first matching zip
+        """
+        wanted = set(formats or Settings.ASSET_FORMATS)
+        zips = [a for a in self.assets if a.name.lower().endswith(".zip")]
+        matching = [a for a in zips if asset_pattern.lower() in a.name.lower()]
+        candidates = matching or zips
+        if not candidates:
+            return AssetSelection(asset=None, baseline=None, reason=AssetSelection.NONE)
+
+        baseline = candidates[0]
+        scored = [(asset, asset_formats(asset.name)) for asset in candidates]
+        eligible = [(a, f) for a, f in scored if f & wanted]
+        if not eligible:
+            return AssetSelection(
+                asset=baseline,
+                baseline=baseline,
+                reason=AssetSelection.FIRST_MATCH,
+                formats=asset_formats(baseline.name),
+            )
+
+        # Smallest known size first; then the most specific archive
+        asset, provided = min(
+            eligible,
+            key=lambda item: (item[0].size <= 0, item[0].size, len(item[1])),
+        )
+        return AssetSelection(
+            asset=asset,
+            baseline=baseline,
+            reason=AssetSelection.SMALLEST,
+            formats=provided,
+        )
+
+
+# Name tokens that tell what kind of fonts an asset carries
+_WEB_TOKENS = frozenset({"web", "webfont", "webfonts", "woff", "woff2", "eot"})
+_VARIABLE_TOKENS = frozenset({"variable", "vf", "var"})
+_ALL_FORMATS = frozenset({"ttf", "otf", "variable"})
+
+
+def asset_formats(name: str) -> frozenset[str]:
+    """
+    Guess which font formats an asset provides from its file name.
+
+    Returns:
+        Subset of {"ttf", "otf", "variable", "web"}; names without any
+        format token are assumed to hold every desktop format
+    """
+    tokens = set(re.split(r"[^a-z0-9]+", name.lower().removesuffix(".zip")))
+    formats = set()
+    if tokens & _WEB_TOKENS:
+        formats.add("web")
+    if tokens & _VARIABLE_TOKENS:
+        formats.add("variable")
+    if "static" in tokens:
+        formats.update(("ttf", "otf"))
+    formats.update(tokens & {"ttf", "otf"})
+    return frozenset(formats) if formats else _ALL_FORMATS
+
+
+@dataclass(frozen=True)
+class AssetSelection:
+    """Which release asset was chosen, and why."""
+
+    # Reasons
+    SMALLEST: ClassVar[str] = "smallest"  # smallest asset with the formats
+    FIRST_MATCH: ClassVar[str] = "first-match"  # no asset declares the formats
+    NONE: ClassVar[str] = "none"  # the release has no zip assets
+
+    asset: ReleaseAsset | None
+    baseline: ReleaseAsset | None  # what first-match selection would pick
+    reason: str
+    formats: frozenset[str] = frozenset()  # formats the chosen asset provides
+
+    @property
+    def bytes_saved(self) -> int:
+        """Download bytes saved compared with the first matching asset."""
+        if not self.asset or not self.baseline:
+            return 0
+        if self.asset.size <= 0 or self.baseline.size <= 0:
+            return 0
+        return max(self.baseline.size - self.asset.size, 0)
+
+
+class _RangeNotHonored(Exception):
+    """The server answered a range request with the full body."""
+
+
+class HttpResponse:
+    """
+    Response from HttpClient.
+
+    Reading the body to the end (or closing the response after that)
+    hands the connection back to the pool for reuse.
+    """
+
+    def __init__(
+        self,
+        client: "HttpClient",
+        key: tuple[str, str, int],
+        conn: http.client.HTTPConnection,
+        raw: http.client.HTTPResponse,
+        url: str,
+    ):
+        self._client = client
+        self._key = key
+        self._conn: http.client.HTTPConnection | None = conn
+        self._raw = raw
+        self.url = url
+        self.status = raw.status
+        self.reason = raw.reason
+        self.headers = raw.headers
+        self._decoder = (
+            zlib.decompressobj(16 + zlib.MAX_WBITS)
+            if raw.headers.get("Content-Encoding", "").lower() == "gzip"
+            else None
+        )
+
+    def read(self, amt: int | None = None) -> bytes:
+        """Read (and transparently gunzip) up to amt bytes of the body."""
+        data = self._raw.read(amt)
+        if self._decoder is not None:
+            data = self._decoder.decompress(data)
+            if self._raw.isclosed():
+                data += self._decoder.flush()
+        return data
+
+    def close(self) -> None:
+        """Release the connection: back to the pool if fully read."""
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        reusable = self._raw.isclosed() and not self._raw.will_close
+        if not reusable:
+            self._raw.close()
+        self._client._release(self._key, conn, reusable)
+
+    def __enter__(self) -> "HttpResponse":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class HttpClient:
+    """
+    Small thread-safe HTTP/1.1 client with per-host keep-alive pools.
+
+    Idle connections are reused across requests, so resolving and
+    downloading several fonts pays one TCP/TLS handshake per host instead
+    of one per request. At most ``max_per_host`` connections are open to
+    a host at a time. Redirects are followed internally and proxies from
+    the environment (``https_proxy`` etc.) are honored.
+    """
+
+    REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+    def __init__(self, max_per_host: int | None = None, max_redirects: int = 10):
+        self.max_per_host = max_per_host or Settings.HTTP_MAX_CONNECTIONS_PER_HOST
+        self.max_redirects = max_redirects
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._slots: dict[tuple[str, str, int], threading.BoundedSemaphore] = {}
+        self._ssl_context = ssl.create_default_context()
+        self._proxies = urllib.request.getproxies()
+
+    def open(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        method: str = "GET",
+        timeout: float | None = None,
+        compressed: bool = False,
+    ) -> HttpResponse:
+        """
+        Send a request and return the response once headers arrive.
+
+        Args:
+            url: Absolute http(s) URL
+            headers: Extra request headers
+            method: HTTP method
+            timeout: Socket timeout in seconds
+            compressed: Ask for a gzip-encoded body (decoded on read)
+
+        Returns:
+            HttpResponse with a 2xx status
+
+        Raises:
+            urllib.error.HTTPError: For 304 and 4xx/5xx responses
+            OSError, http.client.HTTPException: On connection failures
+        """
+        request_headers = {"User-Agent": Settings.USER_AGENT, **(headers or {})}
+        if compressed:
+            request_headers["Accept-Encoding"] = "gzip"
+
+        for _ in range(self.max_redirects + 1):
+            response = self._request(method, url, request_headers, timeout)
+            location = response.headers.get("Location")
+            if response.status not in self.REDIRECT_CODES or not location:
+                break
+            response.read()
+            response.close()
+            url = urllib.parse.urljoin(url, location)
+            if response.status == 303:
+                method = "GET"
+        else:
+            raise http.client.HTTPException(f"too many redirects: {url}")
+
+        if response.status >= 300:
+            headers_copy = response.headers
+            if response.status == 304:
+                # Read the empty body so the connection returns to the pool
+                response.read()
+            response.close()
+            raise urllib.error.HTTPError(
+                url, response.status, response.reason, headers_copy, None
+            )
+        return response
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        timeout: float | None,
+    ) -> HttpResponse:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise http.client.InvalidURL(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        proxy = self._proxy_for(parts.scheme, parts.hostname)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        if proxy and parts.scheme == "http":
+            target = url  # plain HTTP proxies take the absolute URL
+
+        slot = self._slot(key)
+        slot.acquire()
+        try:
+            while True:
+                conn, reused = self._checkout(key, proxy, timeout)
+                try:
+                    conn.request(method, target, headers=headers)
+                    raw = conn.getresponse()
+                    break
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    # An idle keep-alive connection may have been closed by
+                    # the server; retry on a fresh one, fail otherwise.
+                    if not reused:
+                        raise
+        except BaseException:
+            slot.release()
+            raise
+        return HttpResponse(self, key, conn, raw, url)
+
+    def _slot(self, key: tuple[str, str, int]) -> threading.BoundedSemaphore:
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = threading.BoundedSemaphore(self.max_per_host)
+            return self._slots[key]
+
+    def _checkout(
+        self,
+        key: tuple[str, str, int],
+        proxy: tuple[str, int] | None,
+        timeout: float | None,
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+
+        scheme, host, port = key
+        connect_host, connect_port = proxy or (host, port)
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(
+                connect_host, connect_port, timeout=timeout, context=self._ssl_context
+            )
+            if proxy:
+                conn.set_tunnel(host, port)
+        else:
+            conn = http.client.HTTPConnection(connect_host, connect_port, timeout=timeout)
+        return conn, False
+
+    def _release(
+        self,
+        key: tuple[str, str, int],
+        conn: http.client.HTTPConnection,
+        reusable: bool,
+    ) -> None:
+        if reusable:
+            with self._lock:
+                self._idle.setdefault(key, []).append(conn)
+        else:
+            conn.close()
+        self._slot(key).release()
+
+    def _proxy_for(self, scheme: str, host: str) -> tuple[str, int] | None:
+        proxy = self._proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+        if not parts.hostname:
+            return None
+        return parts.hostname, parts.port or 80
+
+
+class DownloadStream:
+    """
+    Read-only, sequential view of a download.
+
+    Returned by Downloader.open_stream for consumers that process the body
+    as it arrives instead of saving it first. A dropped connection is
+    reopened with a Range/If-Range request at the current position, so
+    the consumer only sees a continuous stream of bytes.
+    """
+
+    def __init__(self, downloader: "Downloader", url: str, name: str):
+        self._downloader = downloader
+        self.url = url
+        self.name = name
+        self.position = 0
+        self.total = 0
+        self._validator: str | None = None
+        self._response: HttpResponse | None = None
+
+    def _connect(self) -> HttpResponse:
+        headers: dict[str, str] = {}
+        if self.position:
+            if not self._validator:
+                raise DownloadError(self.url, "servidor nao permite retomar o download")
+            headers["Range"] = f"bytes={self.position}-"
+            headers["If-Range"] = self._validator
+
+        response = self._downloader._http.open(
+            self.url, headers, timeout=Settings.DOWNLOAD_TIMEOUT
+        )
+        if not self.position:
+            self.total = int(response.headers.get("Content-Length") or 0)
+            self._validator = Downloader._validator(response)
+        elif response.status != 206 or Downloader._parse_content_range(
+            response.headers.get("Content-Range", "")
+        )[0] != self.position:
+            response.close()
+            raise DownloadError(self.url, "arquivo alterado no servidor")
+        return response
+
+    def read(self, amt: int = -1) -> bytes:
+        """
+        Read up to amt bytes (everything left if amt is negative).
+
+        Raises:
+            DownloadError: If the transfer fails and cannot be resumed
+        """
+        data = b""
+
+        def attempt() -> None:
+            nonlocal data
+            if self._response is None:
+                self._response = self._connect()
+            try:
+                data = self._response.read(amt if amt >= 0 else None)
+                if not data and amt != 0 and self.total and self.position < self.total:
+                    raise ConnectionError(
+                        f"download incompleto ({self.position}/{self.total} bytes)"
+                    )
+            except BaseException:
+                self._response.close()
+                self._response = None
+                raise
+
+        self._downloader._with_retries(self.url, self.name, attempt)
+        self.position += len(data)
+        if self.total > 0 and data:
+            percent = min(100, self.position * 100 // self.total)
+            self._downloader._report(
+                self.name, percent, f"Baixando... {percent}%", self.position, self.total
+            )
+        return data
+
+    def close(self) -> None:
+        """Release the underlying connection."""
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+    def __enter__(self) -> "DownloadStream":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
 
 class Downloader:
-    """Handles file downloads with progress reporting."""
+    """
+    Handles file downloads with progress reporting.
 
-    def __init__(self, progress_callback: ProgressCallback | None = None):
-        self._callback = progress_callback
+    A single instance may be shared between worker threads: downloads keep
+    no per-call state on the instance. Progress goes through a ProgressBus,
+    which coalesces per-block updates and delivers them to the callback
+    from its own thread at Settings.PROGRESS_RATE_HZ.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        progress_callback: ProgressCallback | None = None,
+        release_cache: ReleaseCache | None = None,
+        http_client: HttpClient | None = None,
+        progress_bus: ProgressBus | None = None,
+    ):
+        self._bus = progress_bus or ProgressBus()
+        if progress_callback:
+            self._bus.subscribe(progress_callback)
+        self._release_cache = release_cache or ReleaseCache()
+        self._http = http_client or HttpClient()
+
+    @property
+    def progress(self) -> ProgressBus:
+        """Progress bus that download updates are published to."""
+        return self._bus
 
     def _report(
         self,
@@ -41,26 +546,31 @@ class Downloader:
         downloaded: int = 0,
         total: int = 0,
     ) -> None:
-        """Report progress to callback if set."""
-        if self._callback:
-            self._callback(
-                DownloadProgress(
-                    name=name,
-                    percent=percent,
-                    status=status,
-                    bytes_downloaded=downloaded,
-                    total_bytes=total,
-                )
-            )
+        """Publish progress to the bus."""
+        self._bus.publish(name, percent, status, downloaded, total)
 
-    def download_file(self, url: str, dest: Path, name: str) -> Path:
+    def download_file(
+        self, url: str, dest: Path, name: str, segments: int = 1
+    ) -> Path:
         """
         Download a file from URL to destination path.
 
+        Data is written to ``<dest>.part`` next to a ``<dest>.part.json``
+        state file. If those are left over from an interrupted download of
+        the same URL, the transfer resumes with a Range/If-Range request;
+        servers that ignore the range (or whose file changed) send the full
+        body and the download starts over. Dropped connections are retried
+        up to Settings.DOWNLOAD_RETRIES times, resuming each time.
+
+        With ``segments > 1`` and a server that advertises
+        ``Accept-Ranges: bytes``, the file is split into byte ranges that
+        are fetched concurrently into a preallocated part file.
+
         Args:
             url: Source URL
             dest: Destination path
             name: Display name for progress
+            segments: Number of concurrent byte ranges for large files
 
         Returns:
             Path to downloaded file
@@ -68,58 +578,377 @@ class Downloader:
         Raises:
             DownloadError: If download fails
         """
+        part = dest.with_name(dest.name + ".part")
+        state_path = dest.with_name(dest.name + ".part.json")
+        self._report(name, 0, "Iniciando download...")
+
+        if segments <= 1 or not self._download_segmented(
+            url, part, state_path, name, segments
+        ):
+            self._with_retries(
+                url, name, lambda: self._download_attempt(url, part, state_path, name)
+            )
+
+        try:
+            part.replace(dest)
+        except OSError as e:
+            raise DownloadError(url, str(e)) from e
+        state_path.unlink(missing_ok=True)
+        self._report(name, 100, "Download concluido!")
+        return dest
+
+    def open_stream(self, url: str, name: str) -> DownloadStream:
+        """
+        Open a download for sequential reading without saving it.
+
+        Args:
+            url: Source URL
+            name: Display name for progress
+
+        Returns:
+            DownloadStream to read the body from (a context manager)
+        """
+        self._report(name, 0, "Iniciando download...")
+        return DownloadStream(self, url, name)
+
+    def _with_retries(self, url: str, name: str, attempt_fn: Callable[[], None]) -> None:
+        """
+        Run a download attempt, retrying transient failures.
+
+        Raises:
+            DownloadError: On HTTP 4xx, or once retries are exhausted
+        """
+        attempt = 0
+        while True:
+            try:
+                attempt_fn()
+                return
+            except (_RangeNotHonored, DownloadError):
+                raise
+            except urllib.error.HTTPError as e:
+                if e.code < 500 or attempt >= Settings.DOWNLOAD_RETRIES:
+                    raise DownloadError(url, f"HTTP {e.code}: {e.reason}") from e
+            except (OSError, http.client.HTTPException) as e:
+                if attempt >= Settings.DOWNLOAD_RETRIES:
+                    raise DownloadError(url, str(e) or type(e).__name__) from e
+            except Exception as e:
+                raise DownloadError(url, str(e)) from e
+
+            attempt += 1
+            self._report(name, 0, "Conexao interrompida, retomando...")
+            time.sleep(Settings.DOWNLOAD_RETRY_DELAY * attempt)
+
+    def _download_segmented(
+        self, url: str, part: Path, state_path: Path, name: str, segments: int
+    ) -> bool:
+        """
+        Fetch url into part as concurrent byte ranges.
+
+        Segment progress is kept in the state file so an interrupted
+        segmented download resumes each range where it stopped.
+
+        Returns:
+            True if the file was downloaded, False if the server is not
+            suitable (no range support or file too small) and the caller
+            should use a single stream instead
+
+        Raises:
+            DownloadError: If a segment keeps failing
+        """
+        state = self._load_part_state(state_path)
+        if part.exists() and state.get("url") == url and "segments" not in state:
+            return False  # leftover single-stream download, resume that instead
+
+        try:
+            with self._http.open(
+                url, method="HEAD", timeout=Settings.API_TIMEOUT
+            ) as response:
+                accepts_ranges = response.headers.get("Accept-Ranges", "") == "bytes"
+                total = int(response.headers.get("Content-Length") or 0)
+                validator = self._validator(response)
+        except (OSError, http.client.HTTPException, ValueError):
+            return False
+
+        segments = min(segments, total // Settings.SEGMENT_MIN_BYTES)
+        if not accepts_ranges or not validator or segments < 2:
+            return False
+
+        ranges: list[list[int]] = state.get("segments", [])
+        same_file = (
+            state.get("url") == url
+            and state.get("validator") == validator
+            and state.get("total") == total
+            and part.exists()
+            and part.stat().st_size == total
+        )
+        if not same_file:
+            size = -(-total // segments)
+            ranges = [
+                [start, min(start + size, total) - 1, 0]
+                for start in range(0, total, size)
+            ]
+
+        lock = threading.Lock()
+        abort = threading.Event()
+        downloaded = sum(done for _, _, done in ranges)
+
+        def save_state() -> None:
+            with lock:
+                snapshot = [list(r) for r in ranges]
+            self._save_part_state(
+                state_path,
+                {"url": url, "validator": validator, "total": total, "segments": snapshot},
+            )
+
+        def fetch(segment: list[int]) -> None:
+            nonlocal downloaded
+            start, end, done = segment
+            if start + done > end:
+                return
+
+            headers = {"Range": f"bytes={start + done}-{end}", "If-Range": validator}
+            with self._http.open(
+                url, headers, timeout=Settings.DOWNLOAD_TIMEOUT
+            ) as response:
+                if response.status != 206:
+                    raise _RangeNotHonored(url)
+                pos = start + done
+                while not abort.is_set() and (chunk := response.read(self.CHUNK_SIZE)):
+                    chunk = chunk[: end + 1 - pos]
+                    os.pwrite(fd, chunk, pos)
+                    pos += len(chunk)
+                    with lock:
+                        segment[2] += len(chunk)
+                        downloaded += len(chunk)
+                        current = downloaded
+                    percent = min(100, current * 100 // total)
+                    self._report(name, percent, f"Baixando... {percent}%", current, total)
+
+            if not abort.is_set() and segment[0] + segment[2] <= segment[1]:
+                raise ConnectionError(f"segmento incompleto ({start}-{end})")
+
+        fd = os.open(part, os.O_RDWR | os.O_CREAT)
         try:
-            self._report(name, 0, "Iniciando download...")
+            if not same_file:
+                os.ftruncate(fd, 0)
+                try:
+                    os.posix_fallocate(fd, 0, total)
+                except (AttributeError, OSError):
+                    os.ftruncate(fd, total)
+            save_state()
+
+            with ThreadPoolExecutor(
+                max_workers=len(ranges), thread_name_prefix="segment"
+            ) as executor:
+                futures = [
+                    executor.submit(self._with_retries, url, name, partial(fetch, r))
+                    for r in ranges
+                ]
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                        save_state()
+                except BaseException:
+                    abort.set()
+                    raise
 
-            def progress_hook(block_num: int, block_size: int, total_size: int) -> None:
-                if total_size > 0:
-                    downloaded = block_num * block_size
-                    percent = min(100, downloaded * 100 // total_size)
-                    self._report(name, percent, f"Baixando... {percent}%", downloaded, total_size)
+        except _RangeNotHonored:
+            # The file changed on the server; start over with one stream
+            os.close(fd)
+            fd = -1
+            part.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            return False
+        finally:
+            if fd >= 0:
+                os.close(fd)
+                save_state()
 
-            urllib.request.urlretrieve(url, dest, reporthook=progress_hook)
-            self._report(name, 100, "Download concluido!")
-            return dest
+        if sum(done for _, _, done in ranges) != total:
+            raise DownloadError(url, "download segmentado incompleto")
+        return True
 
+    def _download_attempt(
+        self, url: str, part: Path, state_path: Path, name: str
+    ) -> None:
+        """Fetch url into part, resuming from its current size if possible."""
+        state = self._load_part_state(state_path)
+        offset = part.stat().st_size if part.exists() else 0
+
+        headers: dict[str, str] = {}
+        resuming = bool(
+            offset
+            and state.get("url") == url
+            and state.get("validator")
+            and "segments" not in state  # preallocated, size is not progress
+        )
+        if resuming:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = state["validator"]
+
+        try:
+            response = self._http.open(url, headers, timeout=Settings.DOWNLOAD_TIMEOUT)
         except urllib.error.HTTPError as e:
-            raise DownloadError(url, f"HTTP {e.code}: {e.reason}")
-        except urllib.error.URLError as e:
-            raise DownloadError(url, str(e.reason))
-        except Exception as e:
-            raise DownloadError(url, str(e))
+            if e.code != 416 or not resuming:
+                raise
+            # Range not satisfiable: the part is complete or stale
+            if offset == state.get("total"):
+                return
+            part.unlink(missing_ok=True)
+            state_path.unlink(missing_ok=True)
+            return self._download_attempt(url, part, state_path, name)
+
+        with response:
+            total = 0
+            if resuming and response.status == 206:
+                start, total = self._parse_content_range(
+                    response.headers.get("Content-Range", "")
+                )
+                if start != offset:
+                    part.unlink(missing_ok=True)
+                    raise ConnectionError("Content-Range inconsistente")
+                mode = "ab"
+            else:
+                offset = 0
+                total = int(response.headers.get("Content-Length") or 0)
+                mode = "wb"
+
+            self._save_part_state(
+                state_path,
+                {"url": url, "validator": self._validator(response), "total": total},
+            )
+
+            downloaded = offset
+            with open(part, mode) as f:
+                while chunk := response.read(self.CHUNK_SIZE):
+                    f.write(chunk)
+                    downloaded += len(chunk)
+                    if total > 0:
+                        percent = min(100, downloaded * 100 // total)
+                        self._report(
+                            name, percent, f"Baixando... {percent}%", downloaded, total
+                        )
+
+        if total and downloaded != total:
+            raise ConnectionError(f"download incompleto ({downloaded}/{total} bytes)")
+
+    @staticmethod
+    def _validator(response: Any) -> str | None:
+        """Strong validator usable in If-Range (ETag or Last-Modified)."""
+        etag: str | None = response.headers.get("ETag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        last_modified: str | None = response.headers.get("Last-Modified")
+        return last_modified
+
+    @staticmethod
+    def _parse_content_range(value: str) -> tuple[int, int]:
+        """Parse 'bytes START-END/TOTAL' into (start, total)."""
+        try:
+            _, _, spec = value.partition(" ")
+            span, _, total = spec.partition("/")
+            start = int(span.split("-")[0])
+            return start, int(total) if total.isdigit() else 0
+        except ValueError:
+            return -1, 0
+
+    @staticmethod
+    def _load_part_state(state_path: Path) -> dict[str, Any]:
+        try:
+            state = json.loads(state_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    @staticmethod
+    def _save_part_state(state_path: Path, state: dict[str, Any]) -> None:
+        state_path.write_text(json.dumps(state))
 
-    def get_github_release_url(self, repo: str, asset_pattern: str) -> str | None:
+    def get_github_release(self, repo: str) -> ReleaseInfo:
         """
-        Get download URL for latest GitHub release asset.
+        Get metadata for the latest GitHub release of a repository.
+
+        Cached metadata is reused without a request within
+        Settings.RELEASE_CACHE_TTL, and revalidated afterwards with
+        If-None-Match/If-Modified-Since so an unchanged release costs a
+        304 (which GitHub does not count against the rate limit). Stale
+        metadata is used if GitHub cannot be reached or is rate limiting.
 
         Args:
             repo: GitHub repo in format "owner/repo"
-            asset_pattern: Pattern to match asset filename
 
         Returns:
-            Download URL or None if not found
+            ReleaseInfo for the latest release
+
+        Raises:
+            DownloadError: If the release cannot be fetched and nothing is
+                cached (including when the API rate limit is exhausted)
         """
         api_url = f"{Settings.GITHUB_API_BASE}/{repo}/releases/latest"
+        cached = self._release_cache.load(repo)
 
-        try:
-            req = urllib.request.Request(api_url)
-            req.add_header("User-Agent", Settings.USER_AGENT)
+        if cached and self._release_cache.is_fresh(cached):
+            return ReleaseInfo.from_api(repo, cached["release"])
 
-            with urllib.request.urlopen(req, timeout=Settings.API_TIMEOUT) as response:
+        headers = {"Accept": "application/vnd.github+json"}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            with self._http.open(
+                api_url, headers, timeout=Settings.API_TIMEOUT, compressed=True
+            ) as response:
                 data = json.loads(response.read().decode())
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
 
-            # First try to find exact pattern match
-            for asset in data.get("assets", []):
-                name = asset.get("name", "")
-                if asset_pattern.lower() in name.lower() and name.endswith(".zip"):
-                    return asset.get("browser_download_url")
+        except urllib.error.HTTPError as e:
+            if not cached:
+                raise DownloadError(api_url, self._describe_api_error(e)) from e
+            if e.code == 304:
+                self._release_cache.touch(repo, cached)
+            return ReleaseInfo.from_api(repo, cached["release"])
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            if cached:
+                return ReleaseInfo.from_api(repo, cached["release"])
+            raise DownloadError(api_url, str(e) or type(e).__name__) from e
 
-            # Fallback: any zip file
-            for asset in data.get("assets", []):
-                if asset.get("name", "").endswith(".zip"):
-                    return asset.get("browser_download_url")
+        release = ReleaseInfo.from_api(repo, data)
+        self._release_cache.save(repo, release.to_cache(), etag, last_modified)
+        return release
 
-        except Exception:
-            pass
+    @staticmethod
+    def _describe_api_error(error: urllib.error.HTTPError) -> str:
+        """Build a readable reason for a GitHub API error response."""
+        if error.code in (403, 429) and error.headers.get("X-RateLimit-Remaining") == "0":
+            reset = error.headers.get("X-RateLimit-Reset")
+            if reset and reset.isdigit():
+                when = time.strftime("%H:%M", time.localtime(int(reset)))
+                return f"limite de requisicoes da API do GitHub excedido (libera as {when})"
+            return "limite de requisicoes da API do GitHub excedido"
+        return f"HTTP {error.code}: {error.reason}"
 
-        return None
+    def get_github_release_url(
+        self, repo: str, asset_pattern: str, formats: tuple[str, ...] | None = None
+    ) -> str | None:
+        """
+        Get download URL for latest GitHub release asset.
+
+        The smallest asset providing the wanted formats is chosen (see
+        ReleaseInfo.select_asset).
+
+        Args:
+            repo: GitHub repo in format "owner/repo"
+            asset_pattern: Pattern to match asset filename
+            formats: Acceptable font formats (default Settings.ASSET_FORMATS)
+
+        Returns:
+            Download URL or None if the release has no matching asset
+
+        Raises:
+            DownloadError: If the release metadata cannot be fetched
+        """
+        asset = self.get_github_release(repo).find_asset(asset_pattern, formats)
+        return asset.url if asset else None
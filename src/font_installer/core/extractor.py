@@ -1,17 +1,698 @@
 """Font extraction from various archive formats."""
 
 import os
+import re
+import shutil
+import struct
 import subprocess
 import zipfile
-from pathlib import Path
+import zlib
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Protocol
 
 from ..config.settings import Settings
 from .exceptions import ExtractionError
 
 
+class StreamExtractionUnsupported(ExtractionError):
+    """The ZIP stream uses a layout that cannot be read sequentially."""
+
+
+class ByteStream(Protocol):
+    """Readable binary stream (a file, an HTTP body or a wrapper of one)."""
+
+    def read(self, amt: int = -1, /) -> bytes: ...
+
+
+class _StreamReader:
+    """Buffered sequential reader over a non-seekable stream."""
+
+    def __init__(self, stream: ByteStream, chunk_size: int = 64 * 1024):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buffer = b""
+
+    def read(self, n: int) -> bytes:
+        """Read up to n bytes, using buffered data first."""
+        if not self._buffer:
+            return self._stream.read(n)
+        data, self._buffer = self._buffer[:n], self._buffer[n:]
+        return data
+
+    def read_exact(self, n: int) -> bytes:
+        """Read exactly n bytes or raise on a truncated stream."""
+        parts = []
+        while n > 0:
+            data = self.read(min(n, self._chunk_size))
+            if not data:
+                raise ExtractionError("<stream>", "arquivo ZIP truncado")
+            parts.append(data)
+            n -= len(data)
+        return b"".join(parts)
+
+    def unread(self, data: bytes) -> None:
+        """Push bytes back to be read again."""
+        self._buffer = data + self._buffer
+
+    def chunks(self, n: int) -> Iterator[bytes]:
+        """Yield exactly n bytes in chunks."""
+        while n > 0:
+            data = self.read(min(n, self._chunk_size))
+            if not data:
+                raise ExtractionError("<stream>", "arquivo ZIP truncado")
+            n -= len(data)
+            yield data
+
+
+# --- Microsoft cabinet (.cab) reader ----------------------------------------
+
+_CAB_SIGNATURE = b"MSCF"
+_CFHEADER = struct.Struct("<4sIIIIIBBHHHHH")
+_CFFOLDER = struct.Struct("<IHH")
+_CFFILE = struct.Struct("<IIHHHH")
+_CFDATA = struct.Struct("<IHH")
+
+# CFHEADER flags
+_CAB_PREV_CABINET = 0x0001
+_CAB_NEXT_CABINET = 0x0002
+_CAB_RESERVE_PRESENT = 0x0004
+# CFFILE attribute: name is UTF-8 instead of the OEM code page
+_CAB_NAME_IS_UTF = 0x80
+
+_COMPRESS_NONE = 0
+_COMPRESS_MSZIP = 1
+_COMPRESS_LZX = 3
+
+
+@dataclass(frozen=True)
+class CabinetFolder:
+    """A CFFOLDER entry: a run of data blocks compressed as one stream."""
+
+    data_offset: int
+    blocks: int
+    compression: int
+
+    @property
+    def method(self) -> int:
+        return self.compression & 0x000F
+
+
+@dataclass(frozen=True)
+class CabinetMember:
+    """A CFFILE entry: a file stored at an offset in a folder's stream."""
+
+    name: str
+    size: int
+    folder: int
+    offset: int
+
+
+class Cabinet:
+    """
+    In-process reader for Microsoft cabinet files.
+
+    Lists folders and members and decompresses stored, MSZIP and LZX
+    folders straight from a seekable file object. Each folder is only
+    decompressed up to the end of the last requested member. Cabinets
+    spanning several files and Quantum compression are not supported
+    (ExtractionError is raised, so callers can fall back to cabextract).
+    """
+
+    # How far into a file (e.g. a self-extracting .exe) to look for "MSCF"
+    SCAN_CHUNK = 1024 * 1024
+
+    def __init__(self, fileobj: BinaryIO, offset: int = 0, name: str = "<cab>"):
+        """
+        Parse the cabinet header, folders and member list.
+
+        Args:
+            fileobj: Seekable binary file
+            offset: Position of the cabinet inside the file
+            name: Archive name used in error messages
+
+        Raises:
+            ExtractionError: If there is no valid cabinet at offset
+        """
+        self._file = fileobj
+        self._base = offset
+        self.name = name
+
+        (
+            signature,
+            _,
+            size,
+            _,
+            files_offset,
+            _,
+            minor,
+            major,
+            folder_count,
+            file_count,
+            flags,
+            _,
+            _,
+        ) = _CFHEADER.unpack(self._read_at(0, _CFHEADER.size))
+        if signature != _CAB_SIGNATURE or (major, minor) != (1, 3):
+            raise ExtractionError(name, "cabinet invalido")
+        if flags & (_CAB_PREV_CABINET | _CAB_NEXT_CABINET):
+            raise ExtractionError(name, "cabinets em varias partes nao sao suportados")
+        self.size = size
+
+        pos = _CFHEADER.size
+        folder_reserve = 0
+        self._data_reserve = 0
+        if flags & _CAB_RESERVE_PRESENT:
+            header_reserve, folder_reserve, self._data_reserve = struct.unpack(
+                "<HBB", self._read_at(pos, 4)
+            )
+            pos += 4 + header_reserve
+
+        self.folders: list[CabinetFolder] = []
+        for _ in range(folder_count):
+            self.folders.append(CabinetFolder(*_CFFOLDER.unpack(self._read_at(pos, 8))))
+            pos += _CFFOLDER.size + folder_reserve
+
+        self.members: list[CabinetMember] = []
+        pos = files_offset
+        for _ in range(file_count):
+            size, offset, folder, _, _, attribs = _CFFILE.unpack(self._read_at(pos, 16))
+            raw = self._read_at(pos + 16, 256, exact=False)
+            end = raw.find(b"\x00")
+            if end < 0 or folder >= len(self.folders):
+                raise ExtractionError(name, "entrada de arquivo invalida no cabinet")
+            encoding = "utf-8" if attribs & _CAB_NAME_IS_UTF else "cp1252"
+            self.members.append(
+                CabinetMember(
+                    raw[:end].decode(encoding, "replace"), size, folder, offset
+                )
+            )
+            pos += 16 + end + 1
+
+    @classmethod
+    def locate(cls, fileobj: BinaryIO, name: str = "<cab>") -> "Cabinet | None":
+        """
+        Open the cabinet at the start of a file or embedded in it.
+
+        Self-extracting executables carry the cabinet after the PE stub, so
+        the file is scanned for the "MSCF" signature and each candidate is
+        validated by parsing its header.
+
+        Returns:
+            Cabinet, or None if the file contains no valid cabinet
+        """
+        fileobj.seek(0)
+        position = 0
+        tail = b""
+        while chunk := fileobj.read(cls.SCAN_CHUNK):
+            window = tail + chunk
+            start = position - len(tail)
+            index = window.find(_CAB_SIGNATURE)
+            while index >= 0:
+                try:
+                    return cls(fileobj, start + index, name)
+                except (ExtractionError, struct.error):
+                    index = window.find(_CAB_SIGNATURE, index + 1)
+                finally:
+                    fileobj.seek(position + len(chunk))
+            position += len(chunk)
+            tail = window[-(len(_CAB_SIGNATURE) - 1) :]
+        return None
+
+    def _read_at(self, pos: int, n: int, exact: bool = True) -> bytes:
+        self._file.seek(self._base + pos)
+        data = self._file.read(n)
+        if exact and len(data) != n:
+            raise ExtractionError(self.name, "cabinet truncado")
+        return data
+
+    def extract(
+        self, members: list[CabinetMember]
+    ) -> Iterator[tuple[CabinetMember, bytes]]:
+        """
+        Decompress members, folder by folder.
+
+        Args:
+            members: Entries from self.members
+
+        Yields:
+            (member, contents) in folder stream order
+
+        Raises:
+            ExtractionError: If a folder is corrupt or uses an unsupported
+                compression method
+        """
+        parts: dict[CabinetMember, list[bytes]] = {}
+        for member, data in self._member_chunks(members):
+            if data is None:
+                yield member, b"".join(parts.pop(member, []))
+            else:
+                parts.setdefault(member, []).append(data)
+
+    def extract_files(
+        self,
+        members: list[CabinetMember],
+        path_for: Callable[[CabinetMember], Path],
+    ) -> Iterator[tuple[CabinetMember, Path]]:
+        """
+        Decompress members straight into files.
+
+        Each member is written block by block as its folder is decoded, so
+        large members (nested cabinets) are never held in memory.
+
+        Args:
+            members: Entries from self.members
+            path_for: Returns the file to write a member to
+
+        Yields:
+            (member, path) as each member is completed
+
+        Raises:
+            ExtractionError: If a folder is corrupt or uses an unsupported
+                compression method
+        """
+        files: dict[CabinetMember, BinaryIO] = {}
+        try:
+            for member, data in self._member_chunks(members):
+                f = files.get(member)
+                if f is None:
+                    f = files[member] = open(path_for(member), "wb")
+                if data is None:
+                    f.close()
+                    del files[member]
+                    yield member, Path(f.name)
+                else:
+                    f.write(data)
+        finally:
+            for f in files.values():
+                f.close()
+
+    def _member_chunks(
+        self, members: list[CabinetMember]
+    ) -> Iterator[tuple[CabinetMember, bytes | None]]:
+        """
+        Decompress members, folder by folder, without buffering them.
+
+        Yields (member, data) for each piece of a member as its folder is
+        decoded, then (member, None) once the member is complete. Each
+        folder is only decoded up to the end of its last requested member.
+        """
+        by_folder: dict[int, list[CabinetMember]] = {}
+        for member in members:
+            by_folder.setdefault(member.folder, []).append(member)
+
+        for index, wanted in sorted(by_folder.items()):
+            pending = sorted(wanted, key=lambda m: (m.offset, m.size))
+            active: list[CabinetMember] = []
+            position = 0
+            for chunk in self._folder_stream(self.folders[index]):
+                end = position + len(chunk)
+                while pending and pending[0].offset <= end:
+                    active.append(pending.pop(0))
+                for member in active:
+                    start = max(member.offset - position, 0)
+                    stop = min(member.offset + member.size - position, len(chunk))
+                    if stop > start:
+                        yield member, chunk[start:stop]
+                for member in [m for m in active if m.offset + m.size <= end]:
+                    active.remove(member)
+                    yield member, None
+                position = end
+                if not pending and not active:
+                    break
+            if pending or active:
+                raise ExtractionError(self.name, "dados do cabinet truncados")
+
+    def _folder_stream(self, folder: CabinetFolder) -> Iterator[bytes]:
+        """Yield a folder's decompressed data, one CFDATA block at a time."""
+        if folder.method == _COMPRESS_LZX:
+            lzx = _LzxDecoder((folder.compression >> 8) & 0x1F, self.name)
+        elif folder.method not in (_COMPRESS_NONE, _COMPRESS_MSZIP):
+            raise ExtractionError(self.name, "compressao de cabinet nao suportada")
+        history = b""
+
+        pos = folder.data_offset
+        for _ in range(folder.blocks):
+            _, packed, unpacked = _CFDATA.unpack(self._read_at(pos, _CFDATA.size))
+            pos += _CFDATA.size + self._data_reserve
+            data = self._read_at(pos, packed)
+            pos += packed
+
+            if folder.method == _COMPRESS_NONE:
+                yield data
+            elif folder.method == _COMPRESS_MSZIP:
+                # Each block is a raw deflate stream primed with the last
+                # 32 KiB of output
+                if data[:2] != b"CK":
+                    raise ExtractionError(self.name, "bloco MSZIP invalido")
+                try:
+                    inflater = zlib.decompressobj(-15, zdict=history) if history else (
+                        zlib.decompressobj(-15)
+                    )
+                    out = inflater.decompress(data[2:]) + inflater.flush()
+                except zlib.error as e:
+                    raise ExtractionError(self.name, str(e)) from e
+                history = (history + out)[-32768:]
+                yield out
+            else:
+                yield lzx.decompress(data, unpacked)
+
+
+def _huffman_table(lengths: list[int], name: str) -> tuple[list[int], int] | None:
+    """
+    Build a canonical Huffman lookup table.
+
+    Returns:
+        (table, bits): table is indexed by the next ``bits`` input bits and
+        holds ``symbol << 5 | code length`` (0 for unused codes), or None
+        if every length is zero
+    """
+    codes = sorted((length, symbol) for symbol, length in enumerate(lengths) if length)
+    if not codes:
+        return None
+    bits = codes[-1][0]
+    table = [0] * (1 << bits)
+    code = 0
+    previous = codes[0][0]
+    for length, symbol in codes:
+        code <<= length - previous
+        previous = length
+        span = 1 << (bits - length)
+        start = code * span
+        if start + span > len(table):
+            raise ExtractionError(name, "tabela Huffman invalida")
+        table[start : start + span] = [symbol << 5 | length] * span
+        code += 1
+    return table, bits
+
+
+class _LzxBits:
+    """LZX bit reader: 16-bit little-endian words, most significant bit first."""
+
+    def __init__(self, data: bytes, name: str):
+        self.data = data
+        self.name = name
+        self.pos = 0
+        self.buf = 0
+        self.count = 0
+
+    def ensure(self, n: int) -> None:
+        data = self.data
+        while self.count < n:
+            pos = self.pos
+            word = data[pos : pos + 2]
+            value = int.from_bytes(word, "little") if len(word) == 2 else (
+                word[0] if word else 0
+            )
+            self.buf = ((self.buf & ((1 << self.count) - 1)) << 16) | value
+            self.pos = pos + 2
+            self.count += 16
+
+    def read(self, n: int) -> int:
+        self.ensure(n)
+        self.count -= n
+        return (self.buf >> self.count) & ((1 << n) - 1)
+
+    def decode(self, tree: tuple[list[int], int] | None) -> int:
+        if tree is None:
+            raise ExtractionError(self.name, "arvore Huffman vazia")
+        table, bits = tree
+        self.ensure(bits)
+        entry = table[(self.buf >> (self.count - bits)) & ((1 << bits) - 1)]
+        if not entry:
+            raise ExtractionError(self.name, "codigo Huffman invalido")
+        self.count -= entry & 31
+        return entry >> 5
+
+    def align_to_bytes(self) -> None:
+        """
+        Switch to byte reads for an uncompressed block.
+
+        Buffered whole words go back to the input; if the bit position is
+        already on a word boundary, one padding word is skipped.
+        """
+        self.pos -= 2 * (self.count // 16)
+        if self.count % 16 == 0:
+            self.pos += 2
+        self.buf = self.count = 0
+
+    def read_bytes(self, n: int) -> bytes:
+        data = self.data[self.pos : self.pos + n]
+        if len(data) != n:
+            raise ExtractionError(self.name, "bloco LZX truncado")
+        self.pos += n
+        return data
+
+
+class _LzxDecoder:
+    """
+    LZX decompressor for cabinet folders.
+
+    ``decompress`` takes one CFDATA block (an LZX frame of up to 32 KiB of
+    output) at a time; the window, repeated offsets and current block carry
+    over between calls.
+    """
+
+    VERBATIM = 1
+    ALIGNED = 2
+    UNCOMPRESSED = 3
+
+    MIN_MATCH = 2
+    NUM_PRIMARY_LENGTHS = 7
+    LENGTH_ELEMENTS = 249
+    PRETREE_ELEMENTS = 20
+    ALIGNED_ELEMENTS = 8
+    # Position slots per window size (2^15 .. 2^21)
+    POSITION_SLOTS = {15: 30, 16: 32, 17: 34, 18: 36, 19: 38, 20: 42, 21: 50}
+    EXTRA_BITS = [min(max(i // 2 - 1, 0), 17) for i in range(50)]
+    POSITION_BASE = [0]
+    for _bits in EXTRA_BITS[:-1]:
+        POSITION_BASE.append(POSITION_BASE[-1] + (1 << _bits))
+    del _bits
+
+    def __init__(self, window_bits: int, name: str):
+        if window_bits not in self.POSITION_SLOTS:
+            raise ExtractionError(name, "janela LZX invalida")
+        self.name = name
+        self.window_size = 1 << window_bits
+        self.main_elements = 256 + self.POSITION_SLOTS[window_bits] * 8
+        self.main_lengths = [0] * self.main_elements
+        self.length_lengths = [0] * self.LENGTH_ELEMENTS
+        self.main_tree: tuple[list[int], int] | None = None
+        self.length_tree: tuple[list[int], int] | None = None
+        self.aligned_tree: tuple[list[int], int] | None = None
+        self.repeated = [1, 1, 1]
+        self.header_read = False
+        self.intel_size = 0
+        self.intel_started = False
+        self.block_type = 0
+        self.block_length = 0
+        self.block_remaining = 0
+        self.history = bytearray()
+        # Bytes of the next frame produced by a match that ran past a frame
+        self.overrun = 0
+        self.frame_position = 0
+
+    def decompress(self, data: bytes, frame_size: int) -> bytes:
+        """Decode one frame of frame_size bytes from a CFDATA block."""
+        bits = _LzxBits(data, self.name)
+        if not self.header_read:
+            if bits.read(1):
+                self.intel_size = (bits.read(16) << 16) | bits.read(16)
+            self.header_read = True
+
+        history = self.history
+        start = len(history) - self.overrun
+        target = start + frame_size
+        while len(history) < target:
+            if self.block_remaining == 0:
+                if self.block_type == self.UNCOMPRESSED and self.block_length & 1:
+                    bits.read_bytes(1)  # pad byte after an odd-sized block
+                self._read_block_header(bits)
+            run = min(self.block_remaining, target - len(history))
+            if self.block_type == self.UNCOMPRESSED:
+                history += bits.read_bytes(run)
+                self.block_remaining -= run
+            else:
+                produced = self._decode_matches(bits, history, run)
+                if produced > self.block_remaining:
+                    raise ExtractionError(
+                        self.name, "bloco LZX excede o tamanho declarado"
+                    )
+                self.block_remaining -= produced
+
+        self.overrun = len(history) - target
+        frame = bytes(history[start:target])
+        if len(history) > 2 * self.window_size:
+            del history[: -self.window_size]
+
+        if self.intel_started and self.intel_size and frame_size > 10:
+            frame = self._undo_e8(frame)
+        self.frame_position += frame_size
+        return frame
+
+    def _read_block_header(self, bits: _LzxBits) -> None:
+        self.block_type = bits.read(3)
+        high = bits.read(16)
+        self.block_length = self.block_remaining = (high << 8) | bits.read(8)
+
+        if self.block_type == self.ALIGNED:
+            self.aligned_tree = _huffman_table(
+                [bits.read(3) for _ in range(self.ALIGNED_ELEMENTS)], self.name
+            )
+        if self.block_type in (self.VERBATIM, self.ALIGNED):
+            self._read_lengths(bits, self.main_lengths, 0, 256)
+            self._read_lengths(bits, self.main_lengths, 256, self.main_elements)
+            self.main_tree = _huffman_table(self.main_lengths, self.name)
+            if self.main_lengths[0xE8]:
+                self.intel_started = True
+            self._read_lengths(bits, self.length_lengths, 0, self.LENGTH_ELEMENTS)
+            self.length_tree = _huffman_table(self.length_lengths, self.name)
+        elif self.block_type == self.UNCOMPRESSED:
+            self.intel_started = True
+            bits.align_to_bytes()
+            self.repeated = list(struct.unpack("<III", bits.read_bytes(12)))
+        else:
+            raise ExtractionError(self.name, "tipo de bloco LZX invalido")
+
+    def _read_lengths(
+        self, bits: _LzxBits, lengths: list[int], first: int, last: int
+    ) -> None:
+        """Read code lengths for lengths[first:last], delta-coded by a pretree."""
+        pretree = _huffman_table(
+            [bits.read(4) for _ in range(self.PRETREE_ELEMENTS)], self.name
+        )
+        x = first
+        while x < last:
+            code = bits.decode(pretree)
+            if code == 17:
+                run = min(bits.read(4) + 4, last - x)
+                lengths[x : x + run] = [0] * run
+            elif code == 18:
+                run = min(bits.read(5) + 20, last - x)
+                lengths[x : x + run] = [0] * run
+            elif code == 19:
+                run = min(bits.read(1) + 4, last - x)
+                value = (lengths[x] - bits.decode(pretree)) % 17
+                lengths[x : x + run] = [value] * run
+            else:
+                lengths[x] = (lengths[x] - code) % 17
+                run = 1
+            x += run
+
+    def _decode_matches(self, bits: _LzxBits, history: bytearray, run: int) -> int:
+        """
+        Decode literals and matches until at least run bytes are produced.
+
+        Returns:
+            Bytes produced (a final match may run past run)
+        """
+        if self.main_tree is None:
+            raise ExtractionError(self.name, "arvore Huffman vazia")
+        main_table, main_bits = self.main_tree
+        main_mask = (1 << main_bits) - 1
+        aligned = self.block_type == self.ALIGNED
+        extra_bits = self.EXTRA_BITS
+        position_base = self.POSITION_BASE
+        r0, r1, r2 = self.repeated
+        # Hot loop: the bit reader's state lives in locals
+        data = bits.data
+        size = len(data)
+        pos, buf, count = bits.pos, bits.buf, bits.count
+
+        produced = 0
+        while produced < run:
+            if count < 16:
+                value = data[pos] if pos < size else 0
+                if pos + 1 < size:
+                    value |= data[pos + 1] << 8
+                buf = ((buf & ((1 << count) - 1)) << 16) | value
+                pos += 2
+                count += 16
+            entry = main_table[(buf >> (count - main_bits)) & main_mask]
+            if not entry:
+                raise ExtractionError(self.name, "codigo Huffman invalido")
+            count -= entry & 31
+            symbol = entry >> 5
+            if symbol < 256:
+                history.append(symbol)
+                produced += 1
+                continue
+
+            symbol -= 256
+            bits.pos, bits.buf, bits.count = pos, buf, count
+            length = symbol & 7
+            if length == self.NUM_PRIMARY_LENGTHS:
+                length += bits.decode(self.length_tree)
+            length += self.MIN_MATCH
+
+            slot = symbol >> 3
+            if slot > 2:
+                extra = extra_bits[slot]
+                offset = position_base[slot] - 2
+                if aligned and extra >= 3:
+                    if extra > 3:
+                        offset += bits.read(extra - 3) << 3
+                    offset += bits.decode(self.aligned_tree)
+                elif extra:
+                    offset += bits.read(extra)
+                r2, r1, r0 = r1, r0, offset
+            elif slot == 0:
+                offset = r0
+            elif slot == 1:
+                offset = r1
+                r1, r0 = r0, offset
+            else:
+                offset = r2
+                r2, r0 = r0, offset
+            pos, buf, count = bits.pos, bits.buf, bits.count
+
+            start = len(history) - offset
+            if start < 0 or offset == 0:
+                raise ExtractionError(self.name, "deslocamento LZX fora da janela")
+            if offset >= length:
+                history += history[start : start + length]
+            else:
+                pattern = history[start:]
+                history += (pattern * (length // offset + 1))[:length]
+            produced += length
+
+        bits.pos, bits.buf, bits.count = pos, buf, count
+        self.repeated = [r0, r1, r2]
+        return produced
+
+    def _undo_e8(self, frame: bytes) -> bytes:
+        """Reverse the encoder's x86 CALL (0xE8) address translation."""
+        data = bytearray(frame)
+        end = len(data) - 10
+        size = self.intel_size
+        index = data.find(0xE8, 0, end)
+        while index >= 0:
+            current = self.frame_position + index
+            absolute = int.from_bytes(
+                data[index + 1 : index + 5], "little", signed=True
+            )
+            if -current <= absolute < size:
+                relative = absolute - current if absolute >= 0 else absolute + size
+                data[index + 1 : index + 5] = (relative & 0xFFFFFFFF).to_bytes(
+                    4, "little"
+                )
+            index = data.find(0xE8, index + 5, end)
+        return bytes(data)
+
+
 class FontExtractor:
     """Extracts font files from archives."""
 
+    _LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+    _LOCAL_SIGNATURE = b"PK\x03\x04"
+    # Central directory, end of central directory and ZIP64 records
+    _END_SIGNATURES = (b"PK\x01\x02", b"PK\x05\x06", b"PK\x06\x06")
+    _DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+
     @staticmethod
     def _is_font_file(path: Path) -> bool:
         """Check if file is a font file."""
@@ -28,10 +709,194 @@ class FontExtractor:
                     fonts.append(file_path)
         return fonts
 
+    @staticmethod
+    def _is_font_member(name: str) -> bool:
+        """Check if an archive member name is a (non-hidden) font file."""
+        member = PurePosixPath(name)
+        return (
+            not name.endswith("/")
+            and not member.name.startswith(".")
+            and member.suffix.lower() in Settings.FONT_EXTENSIONS
+        )
+
+    # Font representations, in order of preference, per format policy
+    FORMAT_PREFERENCES: dict[str, tuple[str, ...]] = {
+        "auto": ("ttf", "otf", "variable"),
+        "ttf": ("ttf", "otf", "variable"),
+        "otf": ("otf", "ttf", "variable"),
+        "variable": ("variable", "ttf", "otf"),
+    }
+    # Name tokens marking variable builds, and tokens that are not part of
+    # a face's family/style name
+    _VARIABLE_TOKENS = frozenset({"variable", "vf"})
+    _NEUTRAL_TOKENS = frozenset({"variable", "vf", "static"})
+    _STYLE_SUFFIXES = ("italic", "oblique")
+
+    @classmethod
+    def _font_kind(cls, name: str, is_variable: bool = False) -> str:
+        """
+        Classify a font member as "ttf", "otf" or "variable".
+
+        Variable builds are recognised by their ``fvar`` table (is_variable)
+        or by name: axis tags in brackets, a "variable"/"VF" token, or a
+        "variable" directory outside any "static" one.
+        """
+        path = PurePosixPath(name.lower())
+        directories = {
+            token for part in path.parent.parts for token in re.split(r"[-_ ]+", part)
+        }
+        if (
+            is_variable
+            or "[" in path.name
+            or set(re.split(r"[-_ ]+", path.stem)) & cls._VARIABLE_TOKENS
+            or ("variable" in directories and "static" not in directories)
+        ):
+            return "variable"
+        return "otf" if path.suffix == ".otf" else "ttf"
+
+    @classmethod
+    def _face_key(cls, name: str) -> tuple[str, str]:
+        """
+        Family and style key of a font member, independent of its format.
+
+        ``JetBrainsMono-Bold.ttf`` and ``otf/JetBrainsMono-Bold.otf`` share
+        ("jetbrainsmono", "jetbrainsmono-bold"); ``Font[wght].ttf`` and
+        ``FontItalic-VF.ttf`` belong to family "font".
+        """
+        stem = re.sub(r"\[[^\]]*\]", "", PurePosixPath(name).stem.lower())
+        parts = [
+            p for p in re.split(r"[-_ ]+", stem) if p and p not in cls._NEUTRAL_TOKENS
+        ]
+        style = "-".join(parts) or stem
+        family = parts[0] if parts else stem
+        for suffix in cls._STYLE_SUFFIXES:
+            if family.endswith(suffix) and family != suffix:
+                family = family.removesuffix(suffix)
+        return family, style
+
+    @classmethod
+    def _select_variants(
+        cls,
+        names: list[str],
+        font_format: str | None = None,
+        is_variable: Callable[[str], bool] | None = None,
+    ) -> list[str]:
+        """
+        Pick one representation per family and style.
+
+        Within each family, only the files of the most preferred kind the
+        archive offers are kept (static TTF, static OTF or variable,
+        ordered by the policy), and files for the same style are
+        deduplicated, preferring hinted builds and shallower paths.
+
+        Args:
+            names: Font member names (POSIX-style relative paths)
+            font_format: "auto", "ttf", "otf" or "variable"
+                (default Settings.FONT_FORMAT)
+            is_variable: Optional check of a member's font tables
+
+        Returns:
+            Chosen names, in archive order
+        """
+        preference = cls.FORMAT_PREFERENCES[font_format or Settings.FONT_FORMAT]
+        families: dict[str, list[tuple[str, str, str]]] = {}
+        for name in names:
+            kind = cls._font_kind(name, bool(is_variable and is_variable(name)))
+            family, style = cls._face_key(name)
+            families.setdefault(family, []).append((name, kind, style))
+
+        chosen: set[str] = set()
+        for members in families.values():
+            kinds = {kind for _, kind, _ in members}
+            best = next(k for k in preference if k in kinds)
+            styles: dict[str, str] = {}
+            for name, kind, style in members:
+                if kind != best:
+                    continue
+                current = styles.get(style)
+                if current is None or cls._copy_rank(name) < cls._copy_rank(current):
+                    styles[style] = name
+            chosen.update(styles.values())
+        return [name for name in names if name in chosen]
+
+    @staticmethod
+    def _copy_rank(name: str) -> tuple[bool, int, str]:
+        """Sort key among copies of one face: hinted, shallow, then by name."""
+        path = PurePosixPath(name.lower())
+        unhinted = "unhinted" in path.parts or "unhinted" in path.stem
+        return unhinted, len(path.parts), name
+
+    @staticmethod
+    def _has_fvar(header: bytes) -> bool:
+        """Check an SFNT header (offset table + table records) for ``fvar``."""
+        if len(header) < 12 or header[:4] == b"ttcf":
+            return False
+        num_tables = int.from_bytes(header[4:6], "big")
+        records = header[12 : 12 + 16 * num_tables]
+        return any(records[i : i + 4] == b"fvar" for i in range(0, len(records), 16))
+
+    # Bytes needed to see every table record of a typical font
+    _SFNT_HEADER_BYTES = 12 + 16 * 64
+
+    # Nested archive suffixes worth opening when looking for fonts
+    NESTED_ARCHIVES = (".exe", ".cab")
+    # Levels of archives-inside-archives to unpack
+    MAX_NESTING = 3
+
+    @classmethod
+    def _cab_filter(cls) -> str:
+        """
+        Build the cabextract -F pattern for fonts and nested archives.
+
+        cabextract takes a single shell-style pattern, so the suffixes are
+        folded into one character class per position (e.g. ``*.[cot][atx]
+        [bcef]``). The pattern may also match a few other names, which is
+        harmless; it never misses a font.
+        """
+        suffixes = [s.lstrip(".") for s in (*Settings.FONT_EXTENSIONS, *cls.NESTED_ARCHIVES)]
+        if len({len(s) for s in suffixes}) != 1:
+            return "*"
+        classes = (
+            "".join(sorted({c for s in suffixes for c in (s[i].lower(), s[i].upper())}))
+            for i in range(len(suffixes[0]))
+        )
+        return "*." + "".join(f"[{c}]" for c in classes)
+
+    @classmethod
+    def _cabextract_command(cls, archive_path: Path, output_dir: Path) -> list[str]:
+        """cabextract invocation that writes only fonts and nested archives."""
+        return [
+            "cabextract",
+            "-L",
+            "-F",
+            cls._cab_filter(),
+            "-d",
+            str(output_dir),
+            str(archive_path),
+        ]
+
+    @classmethod
+    def _nested_archives(cls, directory: Path) -> list[Path]:
+        """Find archives extracted into a directory tree."""
+        return sorted(
+            path
+            for path in directory.rglob("*")
+            if path.suffix.lower() in cls.NESTED_ARCHIVES and path.is_file()
+        )
+
     def extract_from_cab(self, archive_path: Path, output_dir: Path) -> list[Path]:
         """
         Extract fonts from Windows cabinet/executable file.
 
+        The in-process cabinet reader is the default (see
+        extract_cab_fonts); cabextract is optional. When it is installed it
+        is tried first for archives of Settings.CABEXTRACT_MIN_BYTES or
+        more, where the pure-Python LZX decoder is slow, and it is the
+        fallback when the reader fails or finds nothing. cabextract only
+        writes font files and nested archives, and if the archive holds no
+        fonts directly, nested archives are unpacked concurrently, level by
+        level, until fonts are found.
+
         Args:
             archive_path: Path to .exe or .cab file
             output_dir: Directory to extract to
@@ -43,68 +908,195 @@ class FontExtractor:
             ExtractionError: If extraction fails
         """
         output_dir.mkdir(parents=True, exist_ok=True)
-        fonts_found: list[Path] = []
+        cabextract = self.has_cabextract()
+        if cabextract and self.is_large_cabinet(archive_path):
+            try:
+                fonts = self._cabextract_fonts(archive_path, output_dir)
+                if fonts:
+                    return fonts
+            except ExtractionError:
+                pass  # fall back to the in-process reader
+            cabextract = False  # already tried
+
+        try:
+            fonts = self.extract_cab_fonts(archive_path, output_dir)
+        except ExtractionError:
+            if not cabextract:
+                raise
+            fonts = []
+        except OSError as e:
+            if not cabextract:
+                raise ExtractionError(str(archive_path), str(e)) from e
+            fonts = []
+        if fonts or not cabextract:
+            return fonts
+        return self._cabextract_fonts(archive_path, output_dir)
+
+    @staticmethod
+    def has_cabextract() -> bool:
+        """Check whether the optional cabextract binary is on PATH."""
+        return shutil.which("cabextract") is not None
 
+    @staticmethod
+    def is_large_cabinet(archive_path: Path) -> bool:
+        """Check whether an archive is big enough to prefer cabextract."""
+        try:
+            return archive_path.stat().st_size >= Settings.CABEXTRACT_MIN_BYTES
+        except OSError:
+            return False
+
+    def _cabextract_fonts(self, archive_path: Path, output_dir: Path) -> list[Path]:
+        """Extract fonts with cabextract, unpacking nested archives if needed."""
         try:
-            # First extraction attempt
             result = subprocess.run(
-                ["cabextract", "-L", "-d", str(output_dir), str(archive_path)],
+                self._cabextract_command(archive_path, output_dir),
                 capture_output=True,
                 text=True,
             )
-
             if result.returncode != 0:
                 raise ExtractionError(str(archive_path), result.stderr)
 
-            # Find fonts after first extraction
             fonts_found = self._find_fonts_in_directory(output_dir)
-
             # If no fonts found, try nested archives
             if not fonts_found:
                 fonts_found = self._extract_nested(output_dir)
-
-        except subprocess.SubprocessError as e:
-            raise ExtractionError(str(archive_path), str(e))
+        except (subprocess.SubprocessError, OSError) as e:
+            raise ExtractionError(str(archive_path), str(e)) from e
 
         return fonts_found
 
+    def extract_cab_fonts(
+        self, archive_path: Path, output_dir: Path, depth: int = 0
+    ) -> list[Path]:
+        """
+        Extract fonts with the in-process cabinet reader.
+
+        Only font members are decompressed, and each folder only up to its
+        last font. If the cabinet holds no fonts, nested cabinets and
+        executables are unpacked (each into ``<name>.d``) and searched, up
+        to MAX_NESTING levels. Fonts are written with lower-case file names,
+        like ``cabextract -L``.
+
+        Args:
+            archive_path: Path to .exe or .cab file
+            output_dir: Directory to extract to
+            depth: Current nesting level
+
+        Returns:
+            List of extracted font file paths
+
+        Raises:
+            ExtractionError: If no cabinet is found or it cannot be decoded
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with open(archive_path, "rb") as f:
+            cab = Cabinet.locate(f, str(archive_path))
+            if cab is None:
+                raise ExtractionError(str(archive_path), "nenhum cabinet encontrado")
+
+            fonts = [m for m in cab.members if self._is_font_member(self._cab_name(m))]
+            if fonts:
+                return [
+                    path
+                    for _, path in cab.extract_files(
+                        fonts, partial(self._cab_target, output_dir)
+                    )
+                ]
+            if depth >= self.MAX_NESTING:
+                return []
+
+            nested = [
+                m
+                for m in cab.members
+                if PurePosixPath(self._cab_name(m)).suffix.lower()
+                in self.NESTED_ARCHIVES
+            ]
+            found: list[Path] = []
+            for _, inner in cab.extract_files(
+                nested, partial(self._cab_target, output_dir)
+            ):
+                try:
+                    found += self.extract_cab_fonts(
+                        inner, inner.with_name(inner.name + ".d"), depth + 1
+                    )
+                except ExtractionError:
+                    continue  # e.g. an executable without a cabinet
+                finally:
+                    inner.unlink(missing_ok=True)
+            return found
+
+    @staticmethod
+    def _cab_name(member: CabinetMember) -> str:
+        """Member name with "/" separators (cabinets store DOS paths)."""
+        return member.name.replace("\\", "/")
+
+    @classmethod
+    def _cab_target(cls, output_dir: Path, member: CabinetMember) -> Path:
+        """File for a cabinet member: its lower-case base name in output_dir."""
+        name = PurePosixPath(cls._cab_name(member)).name.lower()
+        if name in ("", ".", ".."):
+            raise ExtractionError(member.name, "nome de arquivo invalido no cabinet")
+        return output_dir / name
+
     def _extract_nested(self, directory: Path) -> list[Path]:
         """Extract fonts from nested archives within a directory."""
-        fonts_found: list[Path] = []
+        seen: set[Path] = set()
 
-        # Try nested .exe files
-        for exe_file in directory.rglob("*.exe"):
-            try:
-                subprocess.run(
-                    ["cabextract", "-L", "-d", str(directory), str(exe_file)],
-                    capture_output=True,
-                    check=True,
-                )
-            except subprocess.CalledProcessError:
-                continue
+        for _ in range(self.MAX_NESTING):
+            nested = [p for p in self._nested_archives(directory) if p not in seen]
+            if not nested:
+                break
+            seen.update(nested)
 
-        # Try nested .cab files
-        for cab_file in directory.rglob("*.cab"):
-            try:
-                subprocess.run(
-                    ["cabextract", "-L", "-d", str(directory), str(cab_file)],
-                    capture_output=True,
-                    check=True,
-                )
-            except subprocess.CalledProcessError:
-                continue
+            workers = min(len(nested), os.cpu_count() or 1)
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="cabextract"
+            ) as executor:
+                list(executor.map(self._extract_nested_archive, nested))
 
-        # Collect all fonts after nested extraction
-        fonts_found = self._find_fonts_in_directory(directory)
-        return fonts_found
+            fonts_found = self._find_fonts_in_directory(directory)
+            if fonts_found:
+                return fonts_found
+
+        return self._find_fonts_in_directory(directory)
+
+    def _extract_nested_archive(self, archive: Path) -> bool:
+        """
+        Unpack a nested archive next to itself, then delete it.
+
+        Each archive gets its own directory so concurrent extractions never
+        write to the same path.
+
+        Returns:
+            True if extraction succeeded
+        """
+        output_dir = archive.with_name(archive.name + ".d")
+        try:
+            subprocess.run(
+                self._cabextract_command(archive, output_dir),
+                capture_output=True,
+                check=True,
+            )
+        except (subprocess.CalledProcessError, OSError):
+            return False
+        archive.unlink(missing_ok=True)
+        return True
 
-    def extract_from_zip(self, zip_path: Path, output_dir: Path) -> list[Path]:
+    def extract_from_zip(
+        self, zip_path: Path, output_dir: Path, font_format: str | None = None
+    ) -> list[Path]:
         """
         Extract fonts from ZIP archive.
 
+        Only the selected font members are written: one representation per
+        family and style, chosen by the format policy (see
+        _select_variants), and docs, webfonts and other files are never
+        extracted.
+
         Args:
             zip_path: Path to .zip file
             output_dir: Directory to extract to
+            font_format: Format policy (default Settings.FONT_FORMAT)
 
         Returns:
             List of extracted font file paths
@@ -116,22 +1108,189 @@ class FontExtractor:
 
         try:
             with zipfile.ZipFile(zip_path, "r") as zf:
-                zf.extractall(output_dir)
-        except zipfile.BadZipFile as e:
-            raise ExtractionError(str(zip_path), str(e))
+                # Choose the fonts from the central directory, then extract
+                # only those members
+                members = {
+                    info.filename: info
+                    for info in zf.infolist()
+                    if self._is_font_member(info.filename)
+                }
 
-        # Find fonts, preferring static versions over variable
-        fonts_found: list[Path] = []
-        for root, _, files in os.walk(output_dir):
-            for file in files:
-                if not file.startswith(".") and self._is_font_file(Path(file)):
-                    file_path = Path(root) / file
-                    # Prefer static fonts over variable fonts
-                    if "static" in str(root).lower() or "variable" not in file.lower():
-                        fonts_found.append(file_path)
-
-        # Fallback: get all fonts if no static fonts found
-        if not fonts_found:
-            fonts_found = self._find_fonts_in_directory(output_dir)
+                def is_variable(name: str) -> bool:
+                    with zf.open(members[name]) as f:
+                        return self._has_fvar(f.read(self._SFNT_HEADER_BYTES))
 
-        return fonts_found
+                return [
+                    Path(zf.extract(members[name], output_dir))
+                    for name in self._select_variants(
+                        list(members), font_format, is_variable
+                    )
+                ]
+        except (zipfile.BadZipFile, zlib.error) as e:
+            raise ExtractionError(str(zip_path), str(e)) from e
+
+    def extract_zip_stream(
+        self, stream: ByteStream, output_dir: Path, font_format: str | None = None
+    ) -> list[Path]:
+        """
+        Extract fonts from a ZIP archive while it is being read.
+
+        The archive is parsed front to back from its local file headers,
+        so it never has to be stored or seeked: font members are inflated
+        straight into output_dir as their bytes arrive and everything else
+        is skipped. Once the stream reaches the central directory the same
+        format policy as extract_from_zip is applied and the files that
+        were not chosen are removed.
+
+        Args:
+            stream: Binary stream positioned at the start of the archive
+            output_dir: Directory to extract to
+            font_format: Format policy (default Settings.FONT_FORMAT)
+
+        Returns:
+            List of extracted font file paths
+
+        Raises:
+            StreamExtractionUnsupported: If a member cannot be read
+                sequentially (encrypted, unsupported compression, or
+                stored with a trailing data descriptor)
+            ExtractionError: If the archive is corrupt or truncated
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        reader = _StreamReader(stream)
+        extracted: dict[str, Path] = {}
+
+        while True:
+            signature = reader.read_exact(4)
+            if signature in self._END_SIGNATURES:
+                break
+            if signature != self._LOCAL_SIGNATURE:
+                raise ExtractionError("<stream>", "cabecalho ZIP invalido")
+
+            name, target = self._extract_stream_member(
+                reader, signature + reader.read_exact(26), output_dir
+            )
+            if target is not None:
+                extracted[name] = target
+
+        def is_variable(name: str) -> bool:
+            with open(extracted[name], "rb") as f:
+                return self._has_fvar(f.read(self._SFNT_HEADER_BYTES))
+
+        chosen = set(self._select_variants(list(extracted), font_format, is_variable))
+        for name, path in extracted.items():
+            if name not in chosen:
+                path.unlink(missing_ok=True)
+        return [extracted[name] for name in extracted if name in chosen]
+
+    def _extract_stream_member(
+        self, reader: _StreamReader, header: bytes, output_dir: Path
+    ) -> tuple[str, Path | None]:
+        """
+        Read one member from the stream, writing it out if it is a font.
+
+        Returns:
+            Tuple of (member name, written path or None if skipped)
+        """
+        (_, _, flags, method, _, _, crc, compressed, size, name_len, extra_len) = (
+            self._LOCAL_HEADER.unpack(header)
+        )
+        raw_name = reader.read_exact(name_len)
+        name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+        extra = reader.read_exact(extra_len)
+
+        zip64 = False
+        if 0xFFFFFFFF in (compressed, size):
+            zip64 = True
+            size, compressed = self._zip64_sizes(extra, size, compressed)
+
+        has_descriptor = bool(flags & 0x08)
+        target = self._stream_target(name, output_dir)
+        readable = not flags & 0x01 and method in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+
+        if not readable and (target is not None or has_descriptor):
+            raise StreamExtractionUnsupported(name, "membro ZIP nao suportado")
+        if has_descriptor and method == zipfile.ZIP_STORED:
+            raise StreamExtractionUnsupported(name, "tamanho do membro desconhecido")
+
+        if target is None and not has_descriptor:
+            for _ in reader.chunks(compressed):
+                pass
+            return name, None
+
+        if target is not None:
+            target.parent.mkdir(parents=True, exist_ok=True)
+        checksum = 0
+        out = open(target, "wb") if target is not None else None
+        try:
+            if method == zipfile.ZIP_DEFLATED:
+                data_iter = self._inflate(reader, None if has_descriptor else compressed)
+            else:
+                data_iter = reader.chunks(compressed)
+            for data in data_iter:
+                if out is not None:
+                    out.write(data)
+                    checksum = zlib.crc32(data, checksum)
+        finally:
+            if out is not None:
+                out.close()
+
+        if has_descriptor:
+            crc = self._read_descriptor(reader, zip64)
+        if target is not None and checksum != crc:
+            raise ExtractionError(name, "CRC invalido")
+        return name, target
+
+    @staticmethod
+    def _inflate(reader: _StreamReader, compressed: int | None) -> Iterator[bytes]:
+        """Yield inflated data for one member, returning unused input to reader."""
+        inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+        remaining = compressed
+        while not inflater.eof:
+            amount = 64 * 1024 if remaining is None else min(64 * 1024, remaining)
+            data = reader.read(amount) if amount else b""
+            if not data:
+                raise ExtractionError("<stream>", "arquivo ZIP truncado")
+            if remaining is not None:
+                remaining -= len(data)
+            yield inflater.decompress(data)
+        if inflater.unused_data:
+            reader.unread(inflater.unused_data)
+
+    @staticmethod
+    def _zip64_sizes(extra: bytes, size: int, compressed: int) -> tuple[int, int]:
+        """Read 64-bit sizes from the ZIP64 extra field of a local header."""
+        pos = 0
+        while pos + 4 <= len(extra):
+            tag, length = struct.unpack_from("<HH", extra, pos)
+            if tag == 0x0001:
+                field = extra[pos + 4 : pos + 4 + length]
+                values = [
+                    struct.unpack_from("<Q", field, i)[0]
+                    for i in range(0, len(field) - 7, 8)
+                ]
+                if size == 0xFFFFFFFF and values:
+                    size = values.pop(0)
+                if compressed == 0xFFFFFFFF and values:
+                    compressed = values.pop(0)
+                break
+            pos += 4 + length
+        return size, compressed
+
+    @classmethod
+    def _read_descriptor(cls, reader: _StreamReader, zip64: bool) -> int:
+        """Consume a data descriptor and return its CRC-32."""
+        first = reader.read_exact(4)
+        if first == cls._DESCRIPTOR_SIGNATURE:
+            first = reader.read_exact(4)
+        reader.read_exact(16 if zip64 else 8)
+        return int.from_bytes(first, "little")
+
+    def _stream_target(self, name: str, output_dir: Path) -> Path | None:
+        """Output path for a font member, or None if it should be skipped."""
+        if not self._is_font_member(name):
+            return None
+        parts = PurePosixPath(name.replace("\\", "/")).parts
+        if not parts or parts[0] == "/" or ".." in parts:
+            return None
+        return output_dir.joinpath(*parts)
@@ -0,0 +1,95 @@
+"""Cheap file placement for installs (rename, links, in-kernel copies)."""
+
+import errno
+import fcntl
+import os
+import shutil
+from pathlib import Path
+
+# ioctl request for FICLONE from linux/fs.h (reflink on btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+# Strategy names reported by place_file()
+RENAME = "rename"
+HARDLINK = "hardlink"
+REFLINK = "reflink"
+COPY_FILE_RANGE = "copy_file_range"
+COPY = "copy"
+
+
+def place_file(src: Path, dest: Path, move: bool = False) -> str:
+    """
+    Put the contents of src at dest as cheaply as the filesystem allows.
+
+    Strategies are tried in order: rename (only when move is set), hard
+    link, FICLONE reflink, ``os.copy_file_range`` and finally a regular
+    copy. The first three never copy file data; copy_file_range copies
+    inside the kernel. An existing dest is replaced atomically.
+
+    Args:
+        src: Source file
+        dest: Destination path
+        move: Whether src may be consumed (renamed into place)
+
+    Returns:
+        Name of the strategy used
+
+    Raises:
+        OSError: If the file cannot be placed
+    """
+    if move:
+        try:
+            os.replace(src, dest)
+            return RENAME
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    try:
+        strategy = _link_or_copy(src, tmp)
+        os.replace(tmp, dest)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return strategy
+
+
+def _link_or_copy(src: Path, dest: Path) -> str:
+    """Create dest (which must not exist) with the contents of src."""
+    dest.unlink(missing_ok=True)
+    try:
+        os.link(src, dest)
+        return HARDLINK
+    except OSError:
+        pass
+
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return REFLINK
+        except OSError:
+            pass
+
+        if hasattr(os, "copy_file_range"):
+            try:
+                _copy_file_range(fsrc.fileno(), fdst.fileno())
+                return COPY_FILE_RANGE
+            except OSError:
+                fdst.truncate(0)
+
+        fsrc.seek(0)
+        fdst.seek(0)
+        shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+        return COPY
+
+
+def _copy_file_range(src_fd: int, dest_fd: int) -> None:
+    """Copy a whole file with copy_file_range(2)."""
+    size = os.fstat(src_fd).st_size
+    offset = 0
+    while offset < size:
+        copied = os.copy_file_range(src_fd, dest_fd, size - offset, offset, offset)
+        if copied == 0:
+            raise OSError(errno.EIO, "copy_file_range copiou menos que o esperado")
+        offset += copied
@@ -0,0 +1,198 @@
+"""Incremental, coalesced fontconfig cache refresh."""
+
+import fcntl
+import os
+import subprocess
+import sys
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from ..config.settings import Settings
+
+
+class FontCacheRefresher:
+    """
+    Runs ``fc-cache`` for changed font directories, in the background.
+
+    Requests append directories to a queue file under ``state_dir``; a
+    single runner, serialized across processes by an ``flock``, drains the
+    queue and runs one ``fc-cache`` (without ``-f``) per batch, so
+    fontconfig only rescans directories whose mtime changed. Requests made
+    while a refresh is running are merged into the runner's next batch
+    instead of starting another one. Background runners are detached
+    processes, so the requesting program may exit before they finish.
+    """
+
+    QUEUE_NAME = "fc-cache.queue"
+    LOCK_NAME = "fc-cache.lock"
+
+    def __init__(self, state_dir: Path | None = None):
+        self.state_dir = state_dir or Settings.DATA_DIR
+        self._lock = threading.Lock()
+        self._runner: subprocess.Popen | None = None
+
+    @property
+    def queue_path(self) -> Path:
+        return self.state_dir / self.QUEUE_NAME
+
+    @property
+    def lock_path(self) -> Path:
+        return self.state_dir / self.LOCK_NAME
+
+    def request(self, directories: Iterable[Path], wait: bool = False) -> bool:
+        """
+        Schedule a cache refresh for directories.
+
+        Args:
+            directories: Font directories whose contents changed
+            wait: Run the refresh in the calling thread (waiting for any
+                refresh already in progress) instead of in the background
+
+        Returns:
+            True if the refresh was scheduled (or, with wait, succeeded)
+        """
+        paths = [str(Path(d)) for d in directories]
+        if not paths:
+            return True
+        try:
+            self._enqueue(paths)
+        except OSError:
+            return False
+
+        if wait:
+            return self.run_pending(wait=True)
+
+        with self._lock:
+            if self._runner_active():
+                # The runner re-checks the queue after releasing the lock
+                return True
+            # A live runner that no longer holds the lock may already be past
+            # its last queue check, so start another one; extra runners find
+            # the lock taken or the queue empty and exit
+            if self._runner is not None:
+                self._runner.poll()
+            try:
+                self._runner = self._spawn_runner()
+            except OSError:
+                return False
+        return True
+
+    def run_pending(self, wait: bool = False) -> bool:
+        """
+        Drain the queue, running fc-cache once per batch of requests.
+
+        Args:
+            wait: Block until another runner finishes instead of leaving
+                the queue to it
+
+        Returns:
+            False if an fc-cache run failed, True otherwise
+        """
+        ok = True
+        while True:
+            with open(self.lock_path, "a") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+                except BlockingIOError:
+                    return ok  # the active runner will drain the queue
+                try:
+                    while directories := self._take_queue():
+                        ok = self._run_fc_cache(directories) and ok
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+            # Entries queued while we were releasing the lock
+            if not self._has_pending():
+                return ok
+
+    def _enqueue(self, directories: list[str]) -> None:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.queue_path, "a") as queue:
+            fcntl.flock(queue, fcntl.LOCK_EX)
+            queue.write("".join(f"{d}\n" for d in directories))
+            queue.flush()
+            fcntl.flock(queue, fcntl.LOCK_UN)
+
+    def _take_queue(self) -> list[str]:
+        """Atomically read and empty the queue."""
+        try:
+            queue = open(self.queue_path, "r+")
+        except FileNotFoundError:
+            return []
+        with queue:
+            fcntl.flock(queue, fcntl.LOCK_EX)
+            lines = queue.read().splitlines()
+            queue.seek(0)
+            queue.truncate()
+            fcntl.flock(queue, fcntl.LOCK_UN)
+        return self._collapse(lines)
+
+    def _has_pending(self) -> bool:
+        try:
+            return self.queue_path.stat().st_size > 0
+        except OSError:
+            return False
+
+    def _runner_active(self) -> bool:
+        """Check whether some process holds the runner lock."""
+        try:
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        except BlockingIOError:
+            return True
+        except OSError:
+            pass
+        return False
+
+    def _spawn_runner(self) -> subprocess.Popen:
+        """Start a detached process that drains the queue."""
+        env = dict(os.environ)
+        package_root = str(Path(__file__).resolve().parents[2])
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (package_root, env.get("PYTHONPATH")) if p
+        )
+        return subprocess.Popen(
+            [sys.executable, "-m", "font_installer.core.fontcache", str(self.state_dir)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            env=env,
+        )
+
+    @staticmethod
+    def _collapse(lines: list[str]) -> list[str]:
+        """Deduplicate directories, dropping those inside another one."""
+        directories = sorted({Path(line) for line in lines if line.strip()})
+        kept: list[Path] = []
+        for directory in directories:
+            if not directory.is_dir():
+                continue
+            if not any(directory.is_relative_to(parent) for parent in kept):
+                kept.append(directory)
+        return [str(d) for d in kept]
+
+    @staticmethod
+    def _fc_cache_command(directories: list[str]) -> list[str]:
+        """fc-cache command line for directories (incremental, no -f)."""
+        return ["fc-cache", *directories]
+
+    @staticmethod
+    def _run_fc_cache(directories: list[str]) -> bool:
+        """Run fc-cache (incremental, no -f) for directories."""
+        if not directories:
+            return True
+        try:
+            result = subprocess.run(
+                FontCacheRefresher._fc_cache_command(directories),
+                capture_output=True,
+            )
+            return result.returncode == 0
+        except (subprocess.SubprocessError, OSError):
+            return False
+
+
+if __name__ == "__main__":
+    FontCacheRefresher(Path(sys.argv[1]) if len(sys.argv) > 1 else None).run_pending()
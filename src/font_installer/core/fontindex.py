@@ -0,0 +1,278 @@
+"""Index of installed font faces, read from their SFNT name and OS/2 tables."""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from ..config.settings import Settings
+from ..utils.system import FontDirectoryScanner, SystemChecker
+
+_OFFSET_TABLE = struct.Struct(">4sH")
+_TABLE_RECORD = struct.Struct(">4sIII")
+_NAME_HEADER = struct.Struct(">HHH")
+_NAME_RECORD = struct.Struct(">HHHHHH")
+
+# name table IDs
+_FAMILY = 1
+_SUBFAMILY = 2
+_VERSION = 5
+_TYPOGRAPHIC_FAMILY = 16
+_TYPOGRAPHIC_SUBFAMILY = 17
+
+# Windows platform, en-US
+_PLATFORM_WINDOWS = 3
+_LANGUAGE_EN_US = 0x0409
+
+
+@dataclass(frozen=True)
+class FontFace:
+    """One face of an installed font file (collections hold several)."""
+
+    path: Path
+    family: str
+    style: str
+    weight: int
+    version: str
+    font_format: str  # "ttf", "otf" or "variable"
+    index: int = 0  # face number inside a .ttc collection
+
+
+def read_faces(path: Path) -> list[FontFace]:
+    """
+    Read family, style, weight, version and format of every face in a font.
+
+    The file is memory-mapped and only the table directory and the
+    ``name`` and ``OS/2`` tables are touched, so glyph data is never read.
+
+    Args:
+        path: TTF, OTF or TTC file
+
+    Returns:
+        One FontFace per face
+
+    Raises:
+        ValueError: If the file is not a readable SFNT font
+    """
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError(f"{path}: arquivo vazio") from None
+    with data:
+        try:
+            if data[:4] == b"ttcf":
+                (count,) = struct.unpack_from(">I", data, 8)
+                offsets = struct.unpack_from(f">{count}I", data, 12)
+            else:
+                offsets = (0,)
+            return [
+                _read_face(data, offset, path, i) for i, offset in enumerate(offsets)
+            ]
+        except struct.error as e:
+            raise ValueError(f"{path}: fonte truncada ({e})") from e
+
+
+def _read_face(data: mmap.mmap, offset: int, path: Path, index: int) -> FontFace:
+    """Parse one face starting at its offset table."""
+    version, num_tables = _OFFSET_TABLE.unpack_from(data, offset)
+    if version not in (b"\x00\x01\x00\x00", b"OTTO", b"true"):
+        raise ValueError(f"{path}: assinatura SFNT desconhecida")
+
+    tables: dict[bytes, tuple[int, int]] = {}
+    for i in range(num_tables):
+        tag, _, table_offset, length = _TABLE_RECORD.unpack_from(
+            data, offset + 12 + i * _TABLE_RECORD.size
+        )
+        tables[tag] = (table_offset, length)
+
+    names = _read_names(data, tables[b"name"]) if b"name" in tables else {}
+    weight = 400
+    if b"OS/2" in tables and tables[b"OS/2"][1] >= 6:
+        (weight,) = struct.unpack_from(">H", data, tables[b"OS/2"][0] + 4)
+
+    if b"fvar" in tables:
+        font_format = "variable"
+    else:
+        font_format = "otf" if version == b"OTTO" else "ttf"
+
+    font_version = names.get(_VERSION, "")
+    if font_version.lower().startswith("version "):
+        font_version = font_version[8:]
+    return FontFace(
+        path=path,
+        family=names.get(_TYPOGRAPHIC_FAMILY) or names.get(_FAMILY) or path.stem,
+        style=(
+            names.get(_TYPOGRAPHIC_SUBFAMILY) or names.get(_SUBFAMILY) or "Regular"
+        ),
+        weight=weight,
+        version=font_version.split(";")[0].strip(),
+        font_format=font_format,
+        index=index,
+    )
+
+
+def _read_names(data: mmap.mmap, table: tuple[int, int]) -> dict[int, str]:
+    """
+    Decode the name records we use, preferring Windows English strings.
+
+    Returns:
+        Mapping of name ID to string
+    """
+    start, length = table
+    _, count, string_offset = _NAME_HEADER.unpack_from(data, start)
+    wanted = {
+        _FAMILY,
+        _SUBFAMILY,
+        _VERSION,
+        _TYPOGRAPHIC_FAMILY,
+        _TYPOGRAPHIC_SUBFAMILY,
+    }
+    best: dict[int, tuple[int, str]] = {}
+
+    for i in range(count):
+        record = start + _NAME_HEADER.size + i * _NAME_RECORD.size
+        platform, encoding, language, name_id, size, offset = (
+            _NAME_RECORD.unpack_from(data, record)
+        )
+        if name_id not in wanted:
+            continue
+        if platform == _PLATFORM_WINDOWS or platform == 0:
+            codec = "utf-16-be"
+        elif platform == 1 and encoding == 0:
+            codec = "mac_roman"
+        else:
+            continue
+        if platform != _PLATFORM_WINDOWS:
+            rank = 0
+        else:
+            rank = 2 if language == _LANGUAGE_EN_US else 1
+        if name_id in best and best[name_id][0] >= rank:
+            continue
+        position = start + string_offset + offset
+        if string_offset + offset + size > length:
+            continue
+        raw = data[position : position + size]
+        best[name_id] = (rank, raw.decode(codec, errors="replace").strip("\x00 "))
+
+    return {name_id: text for name_id, (_, text) in best.items()}
+
+
+def group_by_family(faces: Iterable[FontFace]) -> dict[str, list[FontFace]]:
+    """Group faces by family name, sorted by family, then weight and style."""
+    grouped: dict[str, list[FontFace]] = {}
+    for face in faces:
+        grouped.setdefault(face.family, []).append(face)
+    return {
+        family: sorted(members, key=lambda f: (f.weight, f.style, str(f.path)))
+        for family, members in sorted(grouped.items(), key=lambda i: i[0].lower())
+    }
+
+
+class FontIndex:
+    """
+    Index of the font faces installed in our font directories.
+
+    Parsed faces are cached in a JSON file keyed by path, modification
+    time and size, so a refresh only reads files that were added or
+    changed since the last one.
+    """
+
+    INDEX_NAME = "font-index.json"
+
+    def __init__(self, cache_dir: Path | None = None):
+        self.cache_path = (cache_dir or Settings.CACHE_DIR) / self.INDEX_NAME
+        self._lock = threading.Lock()
+
+    def scan(self, directories: Iterable[Path] | None = None) -> list[FontFace]:
+        """
+        Index every font file under directories.
+
+        Args:
+            directories: Directories to scan recursively (default: our
+                ClearType and developer font directories)
+
+        Returns:
+            Faces of every readable font file, ordered by path
+        """
+        if directories is None:
+            # The process-wide snapshot, shared with SystemChecker
+            snapshot = SystemChecker.font_snapshot()
+        else:
+            snapshot = FontDirectoryScanner(
+                {str(d): Path(d) for d in directories}
+            ).snapshot()
+        roots = [Path(root) for root in snapshot.roots]
+
+        with self._lock:
+            cached = self._load()
+            # Entries for other directories are kept as they are
+            others = {
+                key: entry
+                for key, entry in cached.items()
+                if not any(Path(key).is_relative_to(root) for root in roots)
+            }
+            entries: dict[str, dict] = {}
+            for file in snapshot.entries:
+                key = str(file.path)
+                entry = cached.get(key)
+                if (
+                    not entry
+                    or entry["mtime_ns"] != file.mtime_ns
+                    or entry["size"] != file.size
+                ):
+                    try:
+                        faces = [self._face_to_dict(f) for f in read_faces(file.path)]
+                    except (OSError, ValueError):
+                        faces = []
+                    entry = {
+                        "mtime_ns": file.mtime_ns,
+                        "size": file.size,
+                        "faces": faces,
+                    }
+                entries[key] = entry
+
+            if {**others, **entries} != cached:
+                self._save({**others, **entries})
+
+        return [
+            self._face_from_dict(path, face)
+            for path, entry in sorted(entries.items())
+            for face in entry["faces"]
+        ]
+
+    def families(
+        self, directories: Iterable[Path] | None = None
+    ) -> dict[str, list[FontFace]]:
+        """Index directories and group the faces by family."""
+        return group_by_family(self.scan(directories))
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            entries = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _save(self, entries: dict[str, dict]) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_name(f"{self.INDEX_NAME}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(entries))
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass  # the index is only a cache
+
+    @staticmethod
+    def _face_to_dict(face: FontFace) -> dict:
+        data = asdict(face)
+        del data["path"]
+        return data
+
+    @staticmethod
+    def _face_from_dict(path: str, data: dict) -> FontFace:
+        return FontFace(path=Path(path), **data)
@@ -2,16 +2,43 @@
 
 import shutil
 import subprocess
-import tempfile
-from dataclasses import dataclass
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Callable
 
-from ..config.fonts import DEV_FONTS, FontInfo
+from ..config.fonts import DEV_FONTS
 from ..config.settings import Settings
-from .downloader import Downloader, DownloadProgress, ProgressCallback
-from .exceptions import DependencyError, InstallationError
-from .extractor import FontExtractor
+from .cache import DownloadCache, file_sha256
+from .downloader import AssetSelection, Downloader
+from .exceptions import (
+    DependencyError,
+    DownloadError,
+    ExtractionError,
+    InstallationError,
+)
+from .extractor import FontExtractor, StreamExtractionUnsupported
+from .fontcache import FontCacheRefresher
+from .lockfile import LockedFont, Lockfile, VerifyingReader, verify_download
+from .manifest import InstallManifest, InstallRecord
+from .progress import ProgressBus, ProgressCallback
+from .steps import (
+    CLEARTYPE_KEY,
+    CORE_KEY,
+    FontPlacer,
+    InstallSummary,
+    archive_name,
+    asset_formats_for,
+    cleartype_record,
+    dev_font_record,
+    format_for,
+    github_source,
+    locked_members,
+    locked_record,
+    staging_dir,
+)
 
 
 @dataclass
@@ -22,6 +49,40 @@ class InstallResult:
     font_name: str
     files_installed: int
     message: str
+    # How files were placed, e.g. "rename" or "copy_file_range+rename"
+    strategy: str = ""
+    # Breakdown of files_installed
+    files_new: int = 0
+    files_updated: int = 0
+    files_unchanged: int = 0
+    # Release asset choice for developer fonts (see ReleaseInfo.select_asset)
+    asset_selection: AssetSelection | None = None
+    # Filled in by install_font(): the key, wall time in seconds and bytes
+    # downloaded (0 when the download cache had the artifact)
+    key: str = ""
+    elapsed: float = 0.0
+    bytes_downloaded: int = 0
+
+
+@dataclass
+class UpdateCheck:
+    """Installed and latest release of a developer font."""
+
+    key: str
+    font_name: str
+    installed_version: str | None
+    latest_version: str | None = None
+    outdated: bool = False
+    error: str | None = None
+
+
+@dataclass
+class LockResult:
+    """Lockfile entry resolved for a font key, or why it could not be."""
+
+    key: str
+    locked: LockedFont | None = None
+    error: str | None = None
 
 
 class FontInstaller:
@@ -32,15 +93,54 @@ class FontInstaller:
     progress reporting and error handling.
     """
 
-    def __init__(self, progress_callback: ProgressCallback | None = None):
-        self._callback = progress_callback
-        self._downloader = Downloader(progress_callback)
+    def __init__(
+        self,
+        progress_callback: ProgressCallback | None = None,
+        cache: DownloadCache | None = None,
+        progress_bus: ProgressBus | None = None,
+        stream_zip: bool | None = None,
+        manifest: InstallManifest | None = None,
+        font_cache: FontCacheRefresher | None = None,
+        font_format: str | None = None,
+        lockfile: Lockfile | None = None,
+    ):
+        self._bus = progress_bus or ProgressBus()
+        if progress_callback:
+            self._bus.subscribe(progress_callback)
+        self._downloader = Downloader(progress_bus=self._bus)
         self._extractor = FontExtractor()
+        self._cache = cache or DownloadCache()
+        # Places fonts, records installs and tracks changed directories
+        self._placer = FontPlacer(manifest, font_cache)
+        self._stream_zip = (
+            Settings.STREAM_ZIP_DOWNLOADS if stream_zip is None else stream_zip
+        )
+        # Format policy for this run; overrides FontInfo.font_format
+        self._font_format = font_format
+        # Per-thread count of bytes downloaded by the running install_font()
+        self._transfer = threading.local()
+        # With a lockfile, install_font() installs its exact downloads
+        self._lockfile = lockfile
+
+    @property
+    def progress(self) -> ProgressBus:
+        """
+        Progress bus for this installer.
+
+        Extra subscribers (loggers, printers) can be attached with
+        ``installer.progress.subscribe(fn)``. Updates are delivered from
+        the bus thread; call ``installer.progress.flush()`` to deliver the
+        final states synchronously.
+        """
+        return self._bus
 
     def _report(self, name: str, percent: int, status: str) -> None:
-        """Report progress."""
-        if self._callback:
-            self._callback(DownloadProgress(name=name, percent=percent, status=status))
+        """Publish progress to the bus."""
+        self._bus.publish(name, percent, status)
+
+    def _count_download(self, size: int) -> None:
+        """Add to the bytes downloaded by this thread's install."""
+        self._transfer.bytes = getattr(self._transfer, "bytes", 0) + size
 
     @staticmethod
     def check_dependencies() -> tuple[bool, list[str]]:
@@ -58,15 +158,20 @@ class FontInstaller:
     @staticmethod
     def install_dependencies() -> tuple[bool, str]:
         """
-        Install required system dependencies via apt.
+        Install required and optional system dependencies via apt.
 
         Requires sudo privileges.
 
         Returns:
-            Tuple of (success, message)
+            Tuple of (success, message); success only depends on the
+            required tools
         """
-        ok, missing = FontInstaller.check_dependencies()
-        if ok:
+        missing = [
+            tool
+            for tool in (*Settings.REQUIRED_TOOLS, *Settings.OPTIONAL_TOOLS)
+            if shutil.which(tool) is None
+        ]
+        if not missing:
             return True, "Todas as dependencias ja estao instaladas"
 
         # Map tool names to apt package names
@@ -115,25 +220,146 @@ class FontInstaller:
         if not ok:
             raise DependencyError(missing)
 
-    def _install_fonts_to_dir(self, fonts: list[Path], target_dir: Path) -> int:
+    def _fetch(self, url: str, dest: Path, name: str, segments: int = 1) -> Path:
         """
-        Copy font files to target directory.
+        Get an artifact from the download cache, downloading it on a miss.
+
+        Downloads go to the cache's partial area so an interrupted transfer
+        is resumed on the next run.
+
+        Args:
+            url: Source URL
+            dest: Download path used when the cache is not writable
+            name: Display name for progress
+            segments: Concurrent byte ranges to use for the download
 
         Returns:
-            Number of files installed
+            Path to the artifact (inside the cache when possible)
         """
-        target_dir.mkdir(parents=True, exist_ok=True)
-        installed = 0
-
-        for font in fonts:
-            dest = target_dir / font.name.lower()
+        cached = self._cache.lookup(url)
+        if cached:
+            self._report(name, 100, "Usando arquivo em cache")
+            return cached
+
+        with self._cache.claim(url) as partial:
+            if partial is None:
+                path = self._downloader.download_file(url, dest, name, segments)
+                self._count_download(path.stat().st_size)
+                return path
+
+            # Another installer may have finished it while we waited
+            cached = self._cache.lookup(url)
+            if cached:
+                self._report(name, 100, "Usando arquivo em cache")
+                return cached
+
+            self._downloader.download_file(url, partial, name, segments)
+            self._count_download(partial.stat().st_size)
             try:
-                shutil.copy2(font, dest)
-                installed += 1
-            except (shutil.Error, OSError):
-                continue
+                return self._cache.store(url, partial)
+            except OSError:
+                # A full cache must not break the install
+                return partial
+
+    def _stream_extract(
+        self,
+        url: str,
+        output_dir: Path,
+        name: str,
+        font_format: str | None = None,
+        locked: LockedFont | None = None,
+    ) -> list[Path] | None:
+        """
+        Extract fonts from a ZIP while it downloads.
+
+        Fonts are written to output_dir as the archive arrives; the archive
+        itself is never stored, so it is not added to the download cache.
+
+        Args:
+            locked: Lockfile entry the bytes are hashed and checked against
+                as they arrive
+
+        Returns:
+            Extracted font paths, or None if the archive is already cached
+            or cannot be read as a stream (use the regular download then)
+
+        Raises:
+            DownloadError: If the download differs from the lockfile entry
+        """
+        if self._cache.lookup(url):
+            return None
+
+        try:
+            with self._downloader.open_stream(url, name) as stream:
+                verifier = VerifyingReader(stream, locked) if locked else None
+                try:
+                    fonts = self._extractor.extract_zip_stream(
+                        verifier or stream, output_dir, font_format
+                    )
+                    if verifier is not None:
+                        verifier.verify()
+                    return fonts
+                finally:
+                    self._count_download(stream.position)
+        except StreamExtractionUnsupported:
+            shutil.rmtree(output_dir, ignore_errors=True)
+            return None
+
+    def _finish_install(
+        self,
+        font_name: str,
+        fonts: list[Path],
+        target_dir: Path,
+        label: str,
+        record: InstallRecord,
+    ) -> InstallResult:
+        """
+        Install extracted font files, record them and build the result.
+
+        Args:
+            font_name: Display name for progress and result
+            fonts: Extracted font files
+            target_dir: Installation directory
+            label: Result wording, e.g. "fontes instaladas"
+            record: Manifest entry for the install (files are filled in)
+
+        Returns:
+            InstallResult with installation status
+        """
+        if not fonts:
+            return InstallResult(
+                success=False,
+                font_name=font_name,
+                files_installed=0,
+                message="Nenhuma fonte encontrada no arquivo",
+            )
+
+        self._report(font_name, 100, "Instalando fontes...")
+        summary = self._placer.install_fonts_to_dir(fonts, target_dir)
+        self._placer.record(record, summary)
+        result = self._install_result(font_name, label, summary)
+        self._report(font_name, 100, f"{result.files_installed} {label}!")
+        return result
 
-        return installed
+    @staticmethod
+    def _install_result(
+        font_name: str, label: str, summary: InstallSummary
+    ) -> InstallResult:
+        """Build the result of a successful install."""
+        installed = summary.new + summary.updated + summary.unchanged
+        return InstallResult(
+            success=True,
+            font_name=font_name,
+            files_installed=installed,
+            message=(
+                f"{installed} {label} com sucesso ({summary.new} novos, "
+                f"{summary.updated} atualizados, {summary.unchanged} inalterados)"
+            ),
+            strategy="+".join(sorted(summary.strategies)),
+            files_new=summary.new,
+            files_updated=summary.updated,
+            files_unchanged=summary.unchanged,
+        )
 
     def install_cleartype_fonts(self) -> InstallResult:
         """
@@ -144,14 +370,17 @@ class FontInstaller:
         """
         self._report("ClearType", 0, "Iniciando instalacao...")
 
-        with tempfile.TemporaryDirectory() as tmpdir:
+        with staging_dir() as tmpdir:
             tmppath = Path(tmpdir)
             ppviewer = tmppath / "PowerPointViewer.exe"
 
             try:
                 # Download PowerPoint Viewer
-                self._downloader.download_file(
-                    Settings.POWERPOINT_VIEWER_URL, ppviewer, "ClearType"
+                ppviewer = self._fetch(
+                    Settings.POWERPOINT_VIEWER_URL,
+                    ppviewer,
+                    "ClearType",
+                    segments=Settings.DOWNLOAD_SEGMENTS,
                 )
 
                 # Extract fonts
@@ -160,26 +389,13 @@ class FontInstaller:
                     ppviewer, tmppath / "extracted"
                 )
 
-                if not fonts:
-                    return InstallResult(
-                        success=False,
-                        font_name="ClearType",
-                        files_installed=0,
-                        message="Nenhuma fonte encontrada no arquivo",
-                    )
-
                 # Install fonts
-                self._report("ClearType", 100, "Instalando fontes...")
-                installed = self._install_fonts_to_dir(
-                    fonts, Settings.MICROSOFT_FONTS_DIR
-                )
-
-                self._report("ClearType", 100, f"{installed} fontes instaladas!")
-                return InstallResult(
-                    success=True,
-                    font_name="ClearType",
-                    files_installed=installed,
-                    message=f"{installed} fontes instaladas com sucesso",
+                return self._finish_install(
+                    "ClearType",
+                    fonts,
+                    Settings.MICROSOFT_FONTS_DIR,
+                    "fontes instaladas",
+                    cleartype_record(),
                 )
 
             except Exception as e:
@@ -214,58 +430,362 @@ class FontInstaller:
         self._report(font_name, 0, "Buscando release...")
 
         # Get download URL from GitHub
-        url = self._downloader.get_github_release_url(
-            font_info.repo, font_info.asset_pattern
-        )
+        try:
+            repo, asset_pattern = github_source(font_info)
+            release = self._downloader.get_github_release(repo)
+        except DownloadError as e:
+            return InstallResult(
+                success=False,
+                font_name=font_name,
+                files_installed=0,
+                message=str(e),
+            )
 
-        if not url:
+        font_format = format_for(font_info, self._font_format)
+        selection = release.select_asset(asset_pattern, asset_formats_for(font_format))
+        asset = selection.asset
+        if not asset:
             return InstallResult(
                 success=False,
                 font_name=font_name,
                 files_installed=0,
                 message="Release nao encontrada no GitHub",
             )
+        url = asset.url
 
-        with tempfile.TemporaryDirectory() as tmpdir:
+        with staging_dir() as tmpdir:
             tmppath = Path(tmpdir)
             zip_path = tmppath / f"{font_key}.zip"
 
             try:
-                # Download
-                self._downloader.download_file(url, zip_path, font_name)
+                fonts = None
+                if self._stream_zip:
+                    fonts = self._stream_extract(
+                        url, tmppath / font_key, font_name, font_format
+                    )
 
-                # Extract
-                self._report(font_name, 100, "Extraindo fontes...")
-                fonts = self._extractor.extract_from_zip(zip_path, tmppath / font_key)
+                if fonts is None:
+                    # Download
+                    zip_path = self._fetch(url, zip_path, font_name)
 
-                if not fonts:
-                    return InstallResult(
-                        success=False,
-                        font_name=font_name,
-                        files_installed=0,
-                        message="Nenhuma fonte encontrada no arquivo",
+                    # Extract
+                    self._report(font_name, 100, "Extraindo fontes...")
+                    fonts = self._extractor.extract_from_zip(
+                        zip_path, tmppath / font_key, font_format
                     )
 
                 # Install
-                self._report(font_name, 100, "Instalando fontes...")
-                installed = self._install_fonts_to_dir(fonts, Settings.DEV_FONTS_DIR)
+                result = self._finish_install(
+                    font_name,
+                    fonts,
+                    Settings.DEV_FONTS_DIR,
+                    "arquivos instalados",
+                    dev_font_record(font_key, font_info, release, asset),
+                )
+                return replace(result, asset_selection=selection)
 
-                self._report(font_name, 100, f"{installed} arquivos instalados!")
+            except Exception as e:
                 return InstallResult(
-                    success=True,
+                    success=False,
                     font_name=font_name,
-                    files_installed=installed,
-                    message=f"{installed} arquivos instalados com sucesso",
+                    files_installed=0,
+                    message=str(e),
+                )
+
+    def _extract_archive(
+        self, key: str, archive: Path, output_dir: Path, font_format: str | None
+    ) -> list[Path]:
+        """Extract the fonts of a downloaded archive (ClearType CAB or ZIP)."""
+        if key == CLEARTYPE_KEY:
+            return self._extractor.extract_from_cab(archive, output_dir)
+        return self._extractor.extract_from_zip(archive, output_dir, font_format)
+
+    def lock_font(self, key: str) -> LockedFont:
+        """
+        Resolve a font key to the exact download and files it installs.
+
+        The release is resolved once and the archive is downloaded (through
+        the download cache) to hash it and to list the fonts it provides
+        under the format policy.
+
+        Args:
+            key: CLEARTYPE_KEY or a key from DEV_FONTS
+
+        Returns:
+            LockedFont for the key
+
+        Raises:
+            InstallationError: If the key cannot be locked
+            DownloadError: If the release or the archive cannot be fetched
+            ExtractionError: If the archive holds no fonts
+        """
+        version = asset_id = font_format = None
+        if key == CLEARTYPE_KEY:
+            name, url = "ClearType", Settings.POWERPOINT_VIEWER_URL
+        elif key in DEV_FONTS:
+            font_info = DEV_FONTS[key]
+            name = font_info.name
+            self._report(name, 0, "Buscando release...")
+            repo, asset_pattern = github_source(font_info)
+            release = self._downloader.get_github_release(repo)
+            font_format = format_for(font_info, self._font_format)
+            asset = release.find_asset(asset_pattern, asset_formats_for(font_format))
+            if asset is None:
+                raise DownloadError(repo, "Release nao encontrada no GitHub")
+            url, version, asset_id = asset.url, release.tag, asset.id
+        elif key == CORE_KEY:
+            raise InstallationError("Core Fonts", "pacotes apt nao entram no lockfile")
+        else:
+            raise InstallationError(key, "Fonte desconhecida")
+
+        with staging_dir() as tmpdir:
+            tmppath = Path(tmpdir)
+            segments = Settings.DOWNLOAD_SEGMENTS if key == CLEARTYPE_KEY else 1
+            archive = self._fetch(
+                url, tmppath / archive_name(key), name, segments
+            )
+            sha256 = file_sha256(archive)
+            size = archive.stat().st_size
+            self._report(name, 100, "Listando fontes...")
+            fonts = self._extract_archive(key, archive, tmppath / key, font_format)
+
+        if not fonts:
+            raise ExtractionError(url, "Nenhuma fonte encontrada no arquivo")
+        self._report(name, 100, "Resolvida")
+        return LockedFont(
+            key=key,
+            name=name,
+            url=url,
+            size=size,
+            sha256=sha256,
+            members=tuple(sorted({font.name.lower() for font in fonts})),
+            version=version,
+            asset_id=asset_id,
+            font_format=font_format,
+        )
+
+    def lock_many(
+        self, keys: Iterable[str], jobs: int | None = None
+    ) -> list[LockResult]:
+        """
+        Resolve several font keys concurrently (see lock_font).
+
+        Returns:
+            LockResult for each key, in the order given
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return []
+
+        def lock(key: str) -> LockResult:
+            try:
+                return LockResult(key, locked=self.lock_font(key))
+            except Exception as e:
+                return LockResult(key, error=str(e))
+
+        workers = max(1, min(jobs or Settings.INSTALL_JOBS, len(keys)))
+        try:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="font-lock"
+            ) as executor:
+                return list(executor.map(lock, keys))
+        finally:
+            self._bus.flush()
+
+    def install_locked(self, key: str) -> InstallResult:
+        """
+        Install a font from its lockfile entry.
+
+        No release metadata is requested: the locked URL is downloaded (or
+        taken from the download cache) and its size and sha256 must match
+        the lockfile before anything is extracted; streamed ZIPs are hashed
+        as they arrive and discarded on a mismatch. Exactly the locked
+        files are installed.
+
+        Args:
+            key: Key present in the installer's lockfile
+
+        Returns:
+            InstallResult with installation status
+        """
+        locked = self._lockfile.fonts.get(key) if self._lockfile else None
+        if locked is None:
+            return InstallResult(
+                success=False,
+                font_name=key,
+                files_installed=0,
+                message=f"Fonte ausente no lockfile: {key}",
+            )
+
+        name = locked.name
+        cleartype = key == CLEARTYPE_KEY
+        self._report(name, 0, "Usando lockfile...")
+
+        with staging_dir() as tmpdir:
+            tmppath = Path(tmpdir)
+            try:
+                fonts = None
+                if self._stream_zip and not cleartype:
+                    fonts = self._stream_extract(
+                        locked.url, tmppath / key, name, locked.font_format, locked
+                    )
+
+                if fonts is None:
+                    segments = Settings.DOWNLOAD_SEGMENTS if cleartype else 1
+                    archive = self._fetch(
+                        locked.url, tmppath / archive_name(key), name, segments
+                    )
+                    self._report(name, 100, "Verificando sha256...")
+                    verify_download(
+                        locked,
+                        archive.stat().st_size,
+                        file_sha256(archive),
+                        locked.url,
+                    )
+                    self._report(name, 100, "Extraindo fontes...")
+                    fonts = self._extract_archive(
+                        key, archive, tmppath / key, locked.font_format
+                    )
+
+                record = locked_record(locked, cleartype)
+                return self._finish_install(
+                    name,
+                    locked_members(locked, fonts),
+                    record.target_dir,
+                    "fontes instaladas" if cleartype else "arquivos instalados",
+                    record,
                 )
 
             except Exception as e:
                 return InstallResult(
                     success=False,
-                    font_name=font_name,
+                    font_name=name,
                     files_installed=0,
                     message=str(e),
                 )
 
+    def install_font(self, key: str) -> InstallResult:
+        """
+        Install a single font by key.
+
+        The result carries the key, the elapsed time and the number of
+        bytes downloaded for it. With a lockfile, fonts are installed from
+        their locked entries (see install_locked).
+
+        Args:
+            key: CLEARTYPE_KEY, CORE_KEY or a key from DEV_FONTS
+
+        Returns:
+            InstallResult with installation status
+        """
+        start = time.monotonic()
+        self._transfer.bytes = 0
+        if key == CORE_KEY:
+            result = self.install_core_fonts()
+        elif self._lockfile is not None:
+            result = self.install_locked(key)
+        elif key == CLEARTYPE_KEY:
+            result = self.install_cleartype_fonts()
+        else:
+            result = self.install_dev_font(key)
+        return replace(
+            result,
+            key=key,
+            elapsed=time.monotonic() - start,
+            bytes_downloaded=self._transfer.bytes,
+        )
+
+    def install_many(
+        self, keys: Iterable[str], jobs: int | None = None
+    ) -> Iterator[InstallResult]:
+        """
+        Install several fonts concurrently on a bounded worker pool.
+
+        Results are yielded as each installation finishes, so the total
+        time is close to that of the slowest font rather than the sum.
+
+        Args:
+            keys: CLEARTYPE_KEY, CORE_KEY and/or keys from DEV_FONTS
+            jobs: Maximum number of concurrent installs
+                (defaults to Settings.INSTALL_JOBS)
+
+        Yields:
+            InstallResult for each key, in completion order
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return
+
+        workers = max(1, min(jobs or Settings.INSTALL_JOBS, len(keys)))
+        executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="font-install"
+        )
+        try:
+            futures = {executor.submit(self.install_font, key): key for key in keys}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield InstallResult(
+                        success=False,
+                        font_name=futures[future],
+                        files_installed=0,
+                        message=str(e),
+                        key=futures[future],
+                    )
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._bus.flush()
+
+    def check_updates(self, jobs: int | None = None) -> list[UpdateCheck]:
+        """
+        Compare installed developer fonts with their latest releases.
+
+        Releases are resolved concurrently, through the release metadata
+        cache (so unchanged releases cost at most a conditional request).
+        A font is outdated when the matching asset's id differs from the
+        recorded one, or the release tag differs if no id was recorded.
+
+        Args:
+            jobs: Maximum number of concurrent lookups
+                (defaults to Settings.INSTALL_JOBS)
+
+        Returns:
+            UpdateCheck for each installed developer font, ordered by key
+        """
+        records = [r for r in self._placer.manifest.installs() if r.key in DEV_FONTS]
+        if not records:
+            return []
+
+        def check(record: InstallRecord) -> UpdateCheck:
+            font_info = DEV_FONTS[record.key]
+            result = UpdateCheck(record.key, font_info.name, record.version)
+            try:
+                repo, asset_pattern = github_source(font_info)
+                release = self._downloader.get_github_release(repo)
+            except DownloadError as e:
+                result.error = str(e)
+                return result
+
+            asset = release.find_asset(
+                asset_pattern,
+                asset_formats_for(format_for(font_info, self._font_format)),
+            )
+            result.latest_version = release.tag
+            if asset is None:
+                result.error = "Release nao encontrada no GitHub"
+            elif record.asset_id is not None and asset.id:
+                result.outdated = asset.id != record.asset_id
+            else:
+                result.outdated = release.tag != record.version
+            return result
+
+        workers = max(1, min(jobs or Settings.INSTALL_JOBS, len(records)))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="font-update"
+        ) as executor:
+            return list(executor.map(check, records))
+
     @staticmethod
     def install_core_fonts() -> InstallResult:
         """
@@ -287,7 +807,7 @@ class FontInstaller:
                 files_installed=1,
                 message="Core Fonts instaladas via apt",
             )
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, OSError) as e:
             return InstallResult(
                 success=False,
                 font_name="Core Fonts",
@@ -295,20 +815,38 @@ class FontInstaller:
                 message=f"Erro ao executar apt: {e}",
             )
 
+    def refresh_font_cache(self, wait: bool = False) -> bool:
+        """
+        Refresh the font cache for directories changed by this installer.
+
+        Only directories that received new or updated files are rescanned,
+        incrementally (without ``fc-cache -f``). By default the refresh runs
+        in a detached background process, coalesced with refreshes
+        requested by other installers, and this returns immediately.
+
+        Args:
+            wait: Run the refresh before returning
+
+        Returns:
+            True if the refresh was scheduled (or, with wait, succeeded)
+        """
+        return self._placer.refresh_font_cache(wait)
+
     @staticmethod
-    def update_font_cache() -> bool:
+    def update_font_cache(directories: Iterable[Path] | None = None) -> bool:
         """
-        Update system font cache.
+        Update system font cache and wait for it.
+
+        Runs ``fc-cache`` without ``-f``, so only directories whose contents
+        changed are rescanned.
+
+        Args:
+            directories: Directories to refresh (defaults to
+                Settings.FONTS_BASE_DIR; an empty list refreshes nothing)
 
         Returns:
             True if successful
         """
-        try:
-            subprocess.run(
-                ["fc-cache", "-f", str(Settings.FONTS_BASE_DIR)],
-                capture_output=True,
-                check=True,
-            )
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        if directories is None:
+            directories = [Settings.FONTS_BASE_DIR]
+        return FontCacheRefresher().request(directories, wait=True)
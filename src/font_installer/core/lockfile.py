@@ -0,0 +1,140 @@
+"""Lockfile of resolved font downloads, for reproducible installs."""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from ..config.settings import Settings
+from .exceptions import DownloadError
+from .extractor import ByteStream
+
+
+@dataclass(frozen=True)
+class LockedFont:
+    """Exact download and contents of one font key."""
+
+    key: str
+    name: str
+    url: str
+    size: int
+    sha256: str
+    # Installed file names (lowercase basenames, as placed by the installer)
+    members: tuple[str, ...]
+    version: str | None = None
+    asset_id: int | None = None
+    # Format policy the members were chosen with
+    font_format: str | None = None
+
+
+@dataclass
+class Lockfile:
+    """
+    Resolved downloads for a set of font keys.
+
+    Written by ``font-installer lock`` and read by ``install --locked``,
+    which installs these exact bytes without asking GitHub for releases.
+    """
+
+    VERSION = 1
+
+    fonts: dict[str, LockedFont] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "Lockfile":
+        """
+        Read a lockfile.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If it is not a lockfile of a supported version
+        """
+        data = json.loads(path.read_text())
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            raise ValueError(f"{path}: versao de lockfile nao suportada")
+        if not isinstance(data.get("fonts"), dict):
+            raise ValueError(f"{path}: lockfile invalido (sem tabela de fontes)")
+        try:
+            fonts = {
+                key: LockedFont(
+                    key=key, **{**entry, "members": tuple(entry["members"])}
+                )
+                for key, entry in data["fonts"].items()
+            }
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"{path}: lockfile invalido ({e})") from e
+        return cls(fonts)
+
+    def save(self, path: Path) -> None:
+        """Write the lockfile atomically, with keys in sorted order."""
+        fonts = {}
+        for key, locked in sorted(self.fonts.items()):
+            entry = asdict(locked)
+            del entry["key"]
+            entry["members"] = list(locked.members)
+            fonts[key] = entry
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"version": self.VERSION, "fonts": fonts}, indent=2) + "\n"
+        )
+        os.replace(tmp, path)
+
+    @staticmethod
+    def default_path() -> Path:
+        """Lockfile in the current directory."""
+        return Path.cwd() / Settings.LOCKFILE_NAME
+
+
+class VerifyingReader:
+    """
+    Binary stream wrapper that hashes everything read through it.
+
+    Used to check a locked download while it is being consumed; call
+    ``verify()`` once the body has been read (it drains what is left).
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, stream: ByteStream, locked: LockedFont):
+        self._stream = stream
+        self._locked = locked
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def read(self, amt: int = -1) -> bytes:
+        data = self._stream.read(amt)
+        self._digest.update(data)
+        self.size += len(data)
+        if self.size > self._locked.size:
+            raise DownloadError(self._locked.url, "maior que o tamanho do lockfile")
+        return data
+
+    def verify(self) -> None:
+        """
+        Read the rest of the stream and compare it with the lockfile.
+
+        Raises:
+            DownloadError: If the size or sha256 differs
+        """
+        while self.read(self.CHUNK_SIZE):
+            pass
+        verify_download(
+            self._locked, self.size, self._digest.hexdigest(), self._locked.url
+        )
+
+
+def verify_download(locked: LockedFont, size: int, sha256: str, source: str) -> None:
+    """
+    Check a download against its lockfile entry.
+
+    Raises:
+        DownloadError: If the size or sha256 differs
+    """
+    if size != locked.size:
+        raise DownloadError(
+            source, f"tamanho {size} difere do lockfile ({locked.size})"
+        )
+    if sha256 != locked.sha256:
+        raise DownloadError(source, "sha256 difere do lockfile")
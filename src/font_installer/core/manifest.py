@@ -0,0 +1,186 @@
+"""Persistent record of installed fonts (SQLite)."""
+
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..config.settings import Settings
+
+
+@dataclass(frozen=True)
+class InstalledFile:
+    """A font file placed by an install."""
+
+    path: Path
+    size: int
+    sha256: str
+
+
+@dataclass
+class InstallRecord:
+    """What was installed for one font key, and where it came from."""
+
+    key: str
+    name: str
+    category: str
+    target_dir: Path
+    version: str | None = None
+    asset_url: str | None = None
+    asset_id: int | None = None
+    asset_size: int | None = None
+    installed_at: float = 0.0
+    files: list[InstalledFile] = field(default_factory=list)
+
+
+class InstallManifest:
+    """
+    SQLite database of installed fonts.
+
+    One row per installed font key (release tag, asset URL and size) and
+    one row per installed file (size and sha256), indexed by key, path and
+    hash. Every call opens its own connection, so an instance can be shared
+    between threads; WAL mode lets readers run while an install writes.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS installs (
+            key TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            target_dir TEXT NOT NULL,
+            version TEXT,
+            asset_url TEXT,
+            asset_id INTEGER,
+            asset_size INTEGER,
+            installed_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            key TEXT NOT NULL REFERENCES installs(key) ON DELETE CASCADE,
+            size INTEGER NOT NULL,
+            sha256 TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS files_by_key ON files(key);
+        CREATE INDEX IF NOT EXISTS files_by_sha256 ON files(sha256);
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or Settings.MANIFEST_PATH
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the database, creating it if needed."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(self.SCHEMA)
+            yield conn
+
+    def record_install(self, record: InstallRecord) -> None:
+        """
+        Store an install, replacing any earlier record for the same key.
+
+        The install row and all of its file rows are written in a single
+        transaction.
+        """
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM installs WHERE key = ?", (record.key,))
+            conn.execute(
+                "INSERT INTO installs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.key,
+                    record.name,
+                    record.category,
+                    str(record.target_dir),
+                    record.version,
+                    record.asset_url,
+                    record.asset_id,
+                    record.asset_size,
+                    record.installed_at or time.time(),
+                ),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                [(str(f.path), record.key, f.size, f.sha256) for f in record.files],
+            )
+
+    def remove(self, key: str) -> None:
+        """Forget an install and its files."""
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM installs WHERE key = ?", (key,))
+
+    def get(self, key: str) -> InstallRecord | None:
+        """
+        Look up the install record for a font key.
+
+        Returns:
+            InstallRecord with its files, or None if the key is not installed
+        """
+        if not self.path.exists():
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM installs WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            record = self._to_record(row)
+            record.files = self._files(conn, "key = ?", key)
+        return record
+
+    def installs(self) -> list[InstallRecord]:
+        """Return every install record with its files, ordered by key."""
+        if not self.path.exists():
+            return []
+        with self._connect() as conn:
+            records = {
+                row["key"]: self._to_record(row)
+                for row in conn.execute("SELECT * FROM installs ORDER BY key")
+            }
+            for row in conn.execute("SELECT * FROM files ORDER BY path"):
+                records[row["key"]].files.append(self._to_file(row))
+        return list(records.values())
+
+    def owner_of(self, path: Path) -> str | None:
+        """Return the font key that installed a file, if any."""
+        if not self.path.exists():
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT key FROM files WHERE path = ?", (str(path),)
+            ).fetchone()
+        return row["key"] if row else None
+
+    def files_with_hash(self, sha256: str) -> list[InstalledFile]:
+        """Return installed files with the given content hash."""
+        if not self.path.exists():
+            return []
+        with self._connect() as conn:
+            return self._files(conn, "sha256 = ?", sha256)
+
+    def _files(
+        self, conn: sqlite3.Connection, where: str, value: str
+    ) -> list[InstalledFile]:
+        rows = conn.execute(f"SELECT * FROM files WHERE {where} ORDER BY path", (value,))
+        return [self._to_file(row) for row in rows]
+
+    @staticmethod
+    def _to_file(row: sqlite3.Row) -> InstalledFile:
+        return InstalledFile(path=Path(row["path"]), size=row["size"], sha256=row["sha256"])
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> InstallRecord:
+        return InstallRecord(
+            key=row["key"],
+            name=row["name"],
+            category=row["category"],
+            target_dir=Path(row["target_dir"]),
+            version=row["version"],
+            asset_url=row["asset_url"],
+            asset_id=row["asset_id"],
+            asset_size=row["asset_size"],
+            installed_at=row["installed_at"],
+        )
@@ -0,0 +1,150 @@
+"""Progress events and the coalescing progress bus."""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Protocol
+
+from ..config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class DownloadProgress:
+    """Progress information for a download."""
+
+    name: str
+    percent: int
+    status: str
+    bytes_downloaded: int = 0
+    total_bytes: int = 0
+
+
+class ProgressCallback(Protocol):
+    """Protocol for progress callback functions."""
+
+    def __call__(self, progress: DownloadProgress) -> None: ...
+
+
+class ProgressBus:
+    """
+    Collapses progress updates to the latest state per task and delivers
+    them to subscribers at a fixed rate.
+
+    ``publish`` only updates one reusable DownloadProgress per task under a
+    short lock, so it never waits for subscribers; a daemon dispatcher
+    thread hands the changed events to every subscriber at most
+    ``rate_hz`` times per second. Subscribers receive a snapshot of each
+    event, safe to keep, and are never called concurrently.
+    """
+
+    def __init__(self, rate_hz: float | None = None):
+        rate = rate_hz or Settings.PROGRESS_RATE_HZ
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._deliver_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._events: dict[str, DownloadProgress] = {}
+        self._dirty: dict[str, DownloadProgress] = {}
+        self._subscribers: list[ProgressCallback] = []
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def subscribe(self, callback: ProgressCallback) -> Callable[[], None]:
+        """
+        Register a subscriber.
+
+        Returns:
+            Function that removes the subscription
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def publish(
+        self,
+        name: str,
+        percent: int,
+        status: str,
+        downloaded: int = 0,
+        total: int = 0,
+    ) -> None:
+        """Record the latest state of a task."""
+        with self._lock:
+            event = self._events.get(name)
+            if event is None:
+                event = self._events[name] = DownloadProgress(name, percent, status)
+            event.percent = percent
+            event.status = status
+            event.bytes_downloaded = downloaded
+            event.total_bytes = total
+
+            if not self._subscribers:
+                return
+            was_idle = not self._dirty
+            self._dirty[name] = event
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run, name="progress-bus", daemon=True
+                )
+                self._thread.start()
+                was_idle = True
+
+        if was_idle:
+            self._wakeup.set()
+
+    def __call__(self, progress: DownloadProgress) -> None:
+        """Publish a DownloadProgress (lets the bus act as a callback)."""
+        self.publish(
+            progress.name,
+            progress.percent,
+            progress.status,
+            progress.bytes_downloaded,
+            progress.total_bytes,
+        )
+
+    def flush(self) -> None:
+        """Deliver pending updates now, in the calling thread."""
+        with self._deliver_lock:
+            with self._lock:
+                # Snapshots, so publishers never mutate a delivered event
+                pending = [replace(event) for event in self._dirty.values()]
+                self._dirty.clear()
+                subscribers = list(self._subscribers)
+            for event in pending:
+                for callback in subscribers:
+                    # A failing subscriber must not starve the others or
+                    # kill the dispatcher thread
+                    try:
+                        callback(event)
+                    except Exception:
+                        logger.exception("Progress subscriber %r failed", callback)
+
+    def close(self) -> None:
+        """Stop the dispatcher thread after delivering pending updates."""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._wakeup.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            if self._closed:
+                return
+            # Let updates accumulate for one interval, then deliver
+            time.sleep(self.interval)
+            self._wakeup.clear()
+            self.flush()
@@ -0,0 +1,227 @@
+"""Install steps shared by the threaded and asyncio install engines."""
+
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from ..config.fonts import FontCategory, FontInfo
+from ..config.settings import Settings
+from ..utils.system import SystemChecker
+from .cache import file_sha256
+from .downloader import ReleaseAsset, ReleaseInfo
+from .exceptions import DownloadError, ExtractionError
+from .fileops import place_file
+from .fontcache import FontCacheRefresher
+from .lockfile import LockedFont
+from .manifest import InstalledFile, InstallManifest, InstallRecord
+
+# Key used by install_font()/install_many() for the ClearType bundle
+CLEARTYPE_KEY = "cleartype"
+# Key used by install_font()/install_many() for the apt Core Fonts package
+CORE_KEY = "core"
+
+
+@dataclass
+class InstallSummary:
+    """Outcome of placing extracted fonts into a directory."""
+
+    files: list[InstalledFile] = field(default_factory=list)
+    new: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    strategies: set[str] = field(default_factory=set)
+
+
+def format_for(font_info: FontInfo, run_format: str | None = None) -> str:
+    """Format policy for a font: the run's, the font's, or the default."""
+    return run_format or font_info.font_format or Settings.FONT_FORMAT
+
+
+def asset_formats_for(font_format: str) -> tuple[str, ...] | None:
+    """Asset formats to ask for under a policy (None for the default)."""
+    return None if font_format == "auto" else (font_format,)
+
+
+def github_source(font_info: FontInfo) -> tuple[str, str]:
+    """
+    GitHub repository and asset pattern of a developer font.
+
+    Raises:
+        DownloadError: If the font has no GitHub release configured
+    """
+    if not font_info.repo or not font_info.asset_pattern:
+        raise DownloadError(font_info.name, "fonte sem release no GitHub")
+    return font_info.repo, font_info.asset_pattern
+
+
+def staging_dir() -> tempfile.TemporaryDirectory:
+    """
+    Create a temporary working directory for an install.
+
+    It lives under Settings.STAGING_DIR, on the same filesystem as the
+    fonts directory, so extracted fonts can be renamed into place;
+    the system temp directory is used if that is not writable.
+    """
+    try:
+        Settings.STAGING_DIR.mkdir(parents=True, exist_ok=True)
+        return tempfile.TemporaryDirectory(prefix="install-", dir=Settings.STAGING_DIR)
+    except OSError:
+        return tempfile.TemporaryDirectory()
+
+
+def archive_name(key: str) -> str:
+    """File name to download the archive of a font key to."""
+    return "PowerPointViewer.exe" if key == CLEARTYPE_KEY else f"{key}.zip"
+
+
+def cleartype_record() -> InstallRecord:
+    """Manifest entry for the ClearType bundle."""
+    return InstallRecord(
+        key=CLEARTYPE_KEY,
+        name="ClearType",
+        category=FontCategory.CLEARTYPE.value,
+        target_dir=Settings.MICROSOFT_FONTS_DIR,
+        asset_url=Settings.POWERPOINT_VIEWER_URL,
+    )
+
+
+def dev_font_record(
+    font_key: str, font_info: FontInfo, release: ReleaseInfo, asset: ReleaseAsset
+) -> InstallRecord:
+    """Manifest entry for a developer font release."""
+    return InstallRecord(
+        key=font_key,
+        name=font_info.name,
+        category=font_info.category.value,
+        target_dir=Settings.DEV_FONTS_DIR,
+        version=release.tag,
+        asset_url=asset.url,
+        asset_id=asset.id,
+        asset_size=asset.size,
+    )
+
+
+def locked_members(locked: LockedFont, fonts: list[Path]) -> list[Path]:
+    """
+    Pick the extracted files listed in a lockfile entry.
+
+    Raises:
+        ExtractionError: If a locked file was not extracted
+    """
+    by_name = {font.name.lower(): font for font in fonts}
+    missing = [member for member in locked.members if member not in by_name]
+    if missing:
+        raise ExtractionError(
+            locked.url, f"arquivos do lockfile ausentes: {', '.join(missing)}"
+        )
+    return [by_name[member] for member in locked.members]
+
+
+def locked_record(locked: LockedFont, cleartype: bool) -> InstallRecord:
+    """Manifest entry for an install from a lockfile entry."""
+    if cleartype:
+        category, target_dir = FontCategory.CLEARTYPE, Settings.MICROSOFT_FONTS_DIR
+    else:
+        category, target_dir = FontCategory.DEVELOPER, Settings.DEV_FONTS_DIR
+    return InstallRecord(
+        key=locked.key,
+        name=locked.name,
+        category=category.value,
+        target_dir=target_dir,
+        version=locked.version,
+        asset_url=locked.url,
+        asset_id=locked.asset_id,
+        asset_size=locked.size,
+    )
+
+
+class FontPlacer:
+    """
+    Places extracted fonts into font directories and records installs.
+
+    Remembers which directories received new or changed files so a single
+    font cache refresh can cover a whole batch. Safe to share between
+    worker threads.
+    """
+
+    def __init__(
+        self,
+        manifest: InstallManifest | None = None,
+        font_cache: FontCacheRefresher | None = None,
+    ):
+        self.manifest = manifest or InstallManifest()
+        self.font_cache = font_cache or FontCacheRefresher()
+        # Font directories written to since the last font cache refresh
+        self._changed_dirs: set[Path] = set()
+        self._lock = threading.Lock()
+
+    def install_fonts_to_dir(
+        self, fonts: Iterable[Path], target_dir: Path
+    ) -> InstallSummary:
+        """
+        Move extracted font files into the target directory.
+
+        Files are placed with fileops.place_file (rename, hard link,
+        reflink or in-kernel copy, whichever the filesystems allow); the
+        extracted files are consumed. An installed file with the same size
+        and sha256 is left untouched, so reinstalling identical fonts does
+        not rewrite them or change the directory.
+
+        Returns:
+            InstallSummary with the installed files and per-file outcomes
+        """
+        target_dir.mkdir(parents=True, exist_ok=True)
+        summary = InstallSummary()
+
+        for font in fonts:
+            dest = target_dir / font.name.lower()
+            try:
+                size = font.stat().st_size
+                sha256 = file_sha256(font)
+                existed = dest.is_file()
+                if existed and self._has_content(dest, size, sha256):
+                    summary.unchanged += 1
+                else:
+                    summary.strategies.add(place_file(font, dest, move=True))
+                    if existed:
+                        summary.updated += 1
+                    else:
+                        summary.new += 1
+            except OSError:
+                continue
+            summary.files.append(InstalledFile(dest, size, sha256))
+
+        if summary.new or summary.updated:
+            with self._lock:
+                self._changed_dirs.add(target_dir)
+            # Cached fc-list data does not see changes below its directories
+            SystemChecker.fonts_changed()
+        return summary
+
+    @staticmethod
+    def _has_content(dest: Path, size: int, sha256: str) -> bool:
+        """Check whether an installed file already has the given content."""
+        return dest.stat().st_size == size and file_sha256(dest) == sha256
+
+    def record(self, record: InstallRecord, summary: InstallSummary) -> None:
+        """Save an install to the manifest (best effort)."""
+        try:
+            self.manifest.record_install(replace(record, files=summary.files))
+        except (sqlite3.Error, OSError):
+            pass
+
+    def refresh_font_cache(self, wait: bool = False) -> bool:
+        """
+        Refresh the font cache for directories changed since the last call.
+
+        See FontInstaller.refresh_font_cache.
+
+        Returns:
+            True if the refresh was scheduled (or, with wait, succeeded)
+        """
+        with self._lock:
+            directories, self._changed_dirs = self._changed_dirs, set()
+        return self.font_cache.request(sorted(directories), wait=wait)
@@ -22,8 +22,8 @@ from textual.widgets import (
 
 from ..config.fonts import CLEARTYPE_FONTS, DEV_FONTS
 from ..config.settings import Settings
-from ..core.downloader import DownloadProgress
-from ..core.installer import FontInstaller
+from ..core.progress import DownloadProgress
+from ..core.installer import CLEARTYPE_KEY, FontInstaller
 from .styles import APP_CSS
 
 
@@ -62,7 +62,7 @@ class FontInstallerApp(App):
 
         # Dependencies Warning (hidden by default)
         yield Static(
-            "AVISO: Dependencias faltando! Execute: sudo apt install cabextract fontconfig",
+            "AVISO: Dependencias faltando! Execute: sudo apt install fontconfig",
             id="deps-warning",
         )
 
@@ -192,7 +192,7 @@ class FontInstallerApp(App):
             warning.add_class("visible")
             self._log("[bold red]Dependencias faltando![/]")
             self._log(f"[red]Faltando: {', '.join(missing)}[/]")
-            self._log("[yellow]Execute: sudo apt install cabextract fontconfig[/]")
+            self._log("[yellow]Execute: sudo apt install fontconfig[/]")
         else:
             status_bar.update("Todas as dependencias instaladas")
             status_bar.add_class("ok")
@@ -204,7 +204,7 @@ class FontInstallerApp(App):
         log.write(message)
 
     def _on_progress(self, progress: DownloadProgress) -> None:
-        """Handle progress updates from the installer."""
+        """Handle coalesced progress updates from the installer's bus."""
         self.call_from_thread(self._update_progress, progress)
 
     def _update_progress(self, progress: DownloadProgress) -> None:
@@ -287,39 +287,27 @@ class FontInstallerApp(App):
         total_installed = 0
 
         try:
-            # Install ClearType fonts
-            if install_cleartype:
-                self.call_from_thread(
-                    self._log, "[bold cyan]>> Instalando fontes ClearType...[/]"
+            # Install ClearType and Dev fonts concurrently
+            keys = ([CLEARTYPE_KEY] if install_cleartype else []) + dev_fonts
+            if keys:
+                names = ", ".join(
+                    "ClearType" if key == CLEARTYPE_KEY else DEV_FONTS[key].name
+                    for key in keys
                 )
-                result = self._installer.install_cleartype_fonts()
-                if result.success:
-                    total_installed += result.files_installed
-                    self.call_from_thread(
-                        self._log,
-                        f"[green]   ClearType: {result.files_installed} fontes instaladas[/]",
-                    )
-                else:
-                    self.call_from_thread(
-                        self._log, f"[red]   ClearType: {result.message}[/]"
-                    )
-
-            # Install Dev fonts
-            for font_key in dev_fonts:
-                font_name = DEV_FONTS[font_key].name
                 self.call_from_thread(
-                    self._log, f"[bold cyan]>> Instalando {font_name}...[/]"
+                    self._log, f"[bold cyan]>> Instalando {names}...[/]"
                 )
-                result = self._installer.install_dev_font(font_key)
+
+            for result in self._installer.install_many(keys):
                 if result.success:
                     total_installed += result.files_installed
                     self.call_from_thread(
                         self._log,
-                        f"[green]   {font_name}: {result.files_installed} arquivos instalados[/]",
+                        f"[green]   {result.font_name}: {result.files_installed} arquivos instalados[/]",
                     )
                 else:
                     self.call_from_thread(
-                        self._log, f"[red]   {font_name}: {result.message}[/]"
+                        self._log, f"[red]   {result.font_name}: {result.message}[/]"
                     )
 
             # Install Core fonts
@@ -337,10 +325,12 @@ class FontInstallerApp(App):
                         self._log, f"[red]   Core Fonts: {result.message}[/]"
                     )
 
-            # Update font cache
-            self.call_from_thread(self._log, "[cyan]>> Atualizando cache de fontes...[/]")
-            FontInstaller.update_font_cache()
-            self.call_from_thread(self._log, "[green]   Cache atualizado![/]")
+            # Refresh font cache in the background
+            if self._installer.refresh_font_cache():
+                self.call_from_thread(
+                    self._log,
+                    "[cyan]>> Cache de fontes sendo atualizado em segundo plano[/]",
+                )
 
             # Summary
             self.call_from_thread(
@@ -1,5 +1,5 @@
 """Utility modules."""
 
-from .system import SystemChecker
+from .system import FontAvailability, FontDirectoryScanner, SystemChecker
 
-__all__ = ["SystemChecker"]
+__all__ = ["FontAvailability", "FontDirectoryScanner", "SystemChecker"]
@@ -3,6 +3,8 @@
 import os
 import shutil
 import subprocess
+import threading
+from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -20,18 +22,272 @@ class SystemInfo:
     is_linux: bool
 
 
+@dataclass(frozen=True)
+class FontFileEntry:
+    """A font file found by FontDirectoryScanner."""
+
+    path: Path
+    category: str
+    size: int
+    mtime_ns: int
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+
+@dataclass(frozen=True)
+class FontDirectorySnapshot:
+    """Font files of our directories at one point in time."""
+
+    entries: tuple[FontFileEntry, ...]
+    # (directory, st_mtime_ns) of every scanned directory
+    directories: tuple[tuple[str, int], ...]
+    # Category roots the snapshot was taken for
+    roots: tuple[str, ...] = ()
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """Number of font files per category."""
+        counts: dict[str, int] = {}
+        for entry in self.entries:
+            counts[entry.category] = counts.get(entry.category, 0) + 1
+        return counts
+
+    @property
+    def total(self) -> int:
+        return len(self.entries)
+
+    def names(self, category: str) -> list[str]:
+        """Sorted file names of a category."""
+        return sorted(e.name for e in self.entries if e.category == category)
+
+
+class FontDirectoryScanner:
+    """
+    Recursive, single-pass scanner of our font directories.
+
+    Each directory tree is walked once with ``os.scandir``, classifying
+    entries by their category root and keeping the ``stat`` data scandir
+    already has. The snapshot is reused while the modification time of
+    every scanned directory is unchanged: adding, removing or replacing a
+    file (installs rename files into place) changes its directory's mtime,
+    so checking for staleness costs one ``stat`` per directory instead of
+    a listing.
+    """
+
+    def __init__(self, categories: dict[str, Path] | None = None):
+        self._categories = categories
+        self._lock = threading.Lock()
+        self._snapshot: FontDirectorySnapshot | None = None
+
+    @property
+    def categories(self) -> dict[str, Path]:
+        """Category name -> root directory (default: our font directories)."""
+        if self._categories is not None:
+            return self._categories
+        return {
+            "microsoft": Settings.MICROSOFT_FONTS_DIR,
+            "dev": Settings.DEV_FONTS_DIR,
+        }
+
+    def snapshot(self) -> FontDirectorySnapshot:
+        """Return the current snapshot, rescanning only if something changed."""
+        with self._lock:
+            if self._snapshot is None or self._is_stale(self._snapshot):
+                self._snapshot = self._scan()
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """Force the next snapshot() to rescan."""
+        with self._lock:
+            self._snapshot = None
+
+    def _is_stale(self, snapshot: FontDirectorySnapshot) -> bool:
+        if snapshot.roots != self._roots():
+            return True  # the configured directories changed
+        roots = set(snapshot.roots)
+        scanned = {directory for directory, _ in snapshot.directories}
+        if not roots <= scanned:
+            # A root that did not exist may have been created since
+            if any(os.path.isdir(root) for root in roots - scanned):
+                return True
+        for directory, mtime_ns in snapshot.directories:
+            try:
+                if os.stat(directory).st_mtime_ns != mtime_ns:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _scan(self) -> FontDirectorySnapshot:
+        entries: list[FontFileEntry] = []
+        directories: list[tuple[str, int]] = []
+        for category, root in self.categories.items():
+            pending = [str(root)]
+            while pending:
+                directory = pending.pop()
+                try:
+                    directories.append((directory, os.stat(directory).st_mtime_ns))
+                    with os.scandir(directory) as it:
+                        for entry in it:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                                continue
+                            suffix = os.path.splitext(entry.name)[1].lower()
+                            if suffix not in Settings.FONT_EXTENSIONS:
+                                continue
+                            st = entry.stat()
+                            entries.append(
+                                FontFileEntry(
+                                    path=Path(entry.path),
+                                    category=category,
+                                    size=st.st_size,
+                                    mtime_ns=st.st_mtime_ns,
+                                )
+                            )
+                except OSError:
+                    continue
+        entries.sort(key=lambda e: (e.category, str(e.path)))
+        return FontDirectorySnapshot(tuple(entries), tuple(directories), self._roots())
+
+    def _roots(self) -> tuple[str, ...]:
+        return tuple(str(root) for root in self.categories.values())
+
+
+class FontAvailability:
+    """
+    Answers "is this font family available?" from a single fc-list call.
+
+    ``fc-list --format`` is run once and parsed into a family -> files map;
+    the map is reused until the modification time of one of the font
+    directories changes. Only the directories themselves are stamped, not
+    their subdirectories (a recursive walk of /usr/share/fonts per query
+    costs more than it saves), so whoever installs fonts below them calls
+    invalidate(); our installer does so through SystemChecker.fonts_changed().
+    """
+
+    FC_LIST_FORMAT = "%{family}\t%{file}\n"
+    # Characters with a meaning in fontconfig patterns ("Hack:style=Bold")
+    PATTERN_CHARS = frozenset(":-,\\")
+
+    def __init__(self, directories: Iterable[Path] | None = None):
+        self.directories = [Path(d) for d in (directories or Settings.FONTCONFIG_DIRS)]
+        self._lock = threading.Lock()
+        self._families: dict[str, list[Path]] | None = None
+        self._stamp: tuple[tuple[str, int], ...] = ()
+
+    @staticmethod
+    def _normalize(family: str) -> str:
+        """Compare families like fontconfig: ignoring case and spaces."""
+        return family.replace(" ", "").lower()
+
+    def _directory_stamp(self) -> tuple[tuple[str, int], ...]:
+        """Modification times of the font directories (one stat each)."""
+        stamp = []
+        for directory in self.directories:
+            try:
+                stamp.append((str(directory), os.stat(directory).st_mtime_ns))
+            except OSError:
+                continue
+        return tuple(stamp)
+
+    def families(self) -> dict[str, list[Path]]:
+        """
+        Map of normalized family name to font files, refreshed on change.
+
+        Returns:
+            Empty map if fc-list is not available
+        """
+        with self._lock:
+            stamp = self._directory_stamp()
+            if self._families is None or stamp != self._stamp:
+                self._families = self._run_fc_list()
+                self._stamp = stamp
+            return self._families
+
+    def _run_fc_list(self) -> dict[str, list[Path]]:
+        try:
+            result = subprocess.run(
+                ["fc-list", "--format", self.FC_LIST_FORMAT],
+                capture_output=True,
+                text=True,
+            )
+        except (subprocess.SubprocessError, OSError):
+            return {}
+
+        families: dict[str, list[Path]] = {}
+        for line in result.stdout.splitlines():
+            names, _, file = line.partition("\t")
+            if not file:
+                continue
+            for name in names.split(","):
+                if name:
+                    families.setdefault(self._normalize(name), []).append(Path(file))
+        return families
+
+    def verify(self, font_name: str) -> bool:
+        """
+        Check whether a font is available to fontconfig.
+
+        Answers like ``fc-list <font_name>`` printing something, as this
+        check always did: a family name is looked up in the cached map,
+        ignoring case and spaces as fontconfig does, and a fontconfig
+        pattern ("Hack:style=Bold", "DejaVu Sans-12") or an empty name is
+        still passed to fc-list.
+        """
+        return self.verify_many([font_name])[font_name]
+
+    def verify_many(self, font_names: Iterable[str]) -> dict[str, bool]:
+        """Check several font families against one fc-list snapshot."""
+        families = self.families()
+        return {
+            name: self._match_pattern(name)
+            if self._is_pattern(name)
+            else self._normalize(name) in families
+            for name in font_names
+        }
+
+    @classmethod
+    def _is_pattern(cls, font_name: str) -> bool:
+        return not font_name.strip() or not cls.PATTERN_CHARS.isdisjoint(font_name)
+
+    @staticmethod
+    def _match_pattern(pattern: str) -> bool:
+        try:
+            result = subprocess.run(
+                ["fc-list", pattern],
+                capture_output=True,
+                text=True,
+            )
+        except (subprocess.SubprocessError, OSError):
+            return False
+        return bool(result.stdout.strip())
+
+    def invalidate(self) -> None:
+        """Force the next query to run fc-list again."""
+        with self._lock:
+            self._families = None
+
+
 class SystemChecker:
     """System environment checker."""
 
+    # Shared by every call in the process
+    _availability: FontAvailability | None = None
+    _scanner: FontDirectoryScanner | None = None
+
+    @staticmethod
+    def font_snapshot() -> FontDirectorySnapshot:
+        """Snapshot of our font directories (see FontDirectoryScanner)."""
+        if SystemChecker._scanner is None:
+            SystemChecker._scanner = FontDirectoryScanner()
+        return SystemChecker._scanner.snapshot()
+
     @staticmethod
     def get_installed_fonts_count() -> int:
-        """Count installed fonts in our directories."""
-        count = 0
-        for directory in [Settings.MICROSOFT_FONTS_DIR, Settings.DEV_FONTS_DIR]:
-            if directory.exists():
-                for ext in Settings.FONT_EXTENSIONS:
-                    count += len(list(directory.glob(f"*{ext}")))
-        return count
+        """Count installed fonts in our directories, including subdirectories."""
+        return SystemChecker.font_snapshot().total
 
     @staticmethod
     def list_installed_fonts() -> dict[str, list[str]]:
@@ -41,52 +297,60 @@ class SystemChecker:
         Returns:
             Dictionary with 'microsoft' and 'dev' font lists
         """
-        result: dict[str, list[str]] = {"microsoft": [], "dev": []}
-
-        if Settings.MICROSOFT_FONTS_DIR.exists():
-            result["microsoft"] = sorted(
-                f.name
-                for f in Settings.MICROSOFT_FONTS_DIR.iterdir()
-                if f.suffix.lower() in Settings.FONT_EXTENSIONS
-            )
-
-        if Settings.DEV_FONTS_DIR.exists():
-            result["dev"] = sorted(
-                f.name
-                for f in Settings.DEV_FONTS_DIR.iterdir()
-                if f.suffix.lower() in Settings.FONT_EXTENSIONS
-            )
-
-        return result
+        snapshot = SystemChecker.font_snapshot()
+        return {
+            "microsoft": snapshot.names("microsoft"),
+            "dev": snapshot.names("dev"),
+        }
 
     @staticmethod
     def get_system_info() -> SystemInfo:
         """Get system information for diagnostics."""
         return SystemInfo(
             fonts_dir=Settings.FONTS_BASE_DIR,
-            fonts_count=SystemChecker.get_installed_fonts_count(),
+            fonts_count=SystemChecker.font_snapshot().total,
             has_cabextract=shutil.which("cabextract") is not None,
             has_fc_cache=shutil.which("fc-cache") is not None,
             is_linux=os.name == "posix",
         )
 
+    @staticmethod
+    def font_availability() -> FontAvailability:
+        """Process-wide FontAvailability used by verify_font_available."""
+        if SystemChecker._availability is None:
+            SystemChecker._availability = FontAvailability()
+        return SystemChecker._availability
+
+    @staticmethod
+    def fonts_changed() -> None:
+        """Drop the cached font listings after fonts were installed."""
+        if SystemChecker._availability is not None:
+            SystemChecker._availability.invalidate()
+        if SystemChecker._scanner is not None:
+            SystemChecker._scanner.invalidate()
+
     @staticmethod
     def verify_font_available(font_name: str) -> bool:
         """
         Check if a font is available in the system.
 
+        Queries are answered from a cached fc-list listing (see
+        FontAvailability), so checking many fonts runs fc-list once.
+
         Args:
             font_name: Font family name to check
 
         Returns:
             True if font is available
         """
-        try:
-            result = subprocess.run(
-                ["fc-list", font_name],
-                capture_output=True,
-                text=True,
-            )
-            return bool(result.stdout.strip())
-        except subprocess.SubprocessError:
-            return False
+        return SystemChecker.font_availability().verify(font_name)
+
+    @staticmethod
+    def verify_fonts_available(font_names: Iterable[str]) -> dict[str, bool]:
+        """
+        Check several font families at once.
+
+        Returns:
+            Mapping of each name to its availability
+        """
+        return SystemChecker.font_availability().verify_many(font_names)
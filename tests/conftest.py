@@ -1,6 +1,9 @@
 """Pytest configuration and fixtures."""
 
 import tempfile
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
@@ -19,3 +22,124 @@ def sample_font_path(temp_dir: Path) -> Path:
     font_path = temp_dir / "sample.ttf"
     font_path.write_bytes(b"fake font data")
     return font_path
+
+
+@dataclass
+class Route:
+    """A canned response served by LocalServer."""
+
+    body: bytes
+    etag: str | None = None
+    headers: dict[str, str] = field(default_factory=dict)
+    status: int = 200
+    ranges: bool = True
+    # Close the connection after this many body bytes (first request only)
+    fail_after: int | None = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - silence test output
+        pass
+
+    def do_HEAD(self):
+        server: LocalServer = self.server.owner
+        server.requests.append((self.command, self.path, dict(self.headers)))
+        server.client_ports.add(self.client_address[1])
+        route = server.routes.get(self.path)
+        if route is None:
+            self._send(404, b"")
+            return
+        self.send_response(route.status)
+        for name, value in route.headers.items():
+            self.send_header(name, value)
+        if route.etag:
+            self.send_header("ETag", route.etag)
+        if route.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(route.body)))
+        self.end_headers()
+
+    def do_GET(self):
+        server: LocalServer = self.server.owner
+        server.requests.append((self.command, self.path, dict(self.headers)))
+        server.client_ports.add(self.client_address[1])
+        route = server.routes.get(self.path)
+        if route is None:
+            self._send(404, b"not found")
+            return
+
+        headers = dict(route.headers)
+        if route.etag:
+            headers["ETag"] = route.etag
+            if self.headers.get("If-None-Match") == route.etag:
+                self._send(304, b"", headers)
+                return
+
+        status, body = route.status, route.body
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if route.ranges:
+            headers["Accept-Ranges"] = "bytes"
+        if range_header and route.ranges and if_range in (None, route.etag):
+            start, _, end = range_header.removeprefix("bytes=").partition("-")
+            start, end = int(start), int(end) if end else len(body) - 1
+            if start >= len(body):
+                headers["Content-Range"] = f"bytes */{len(body)}"
+                self._send(416, b"", headers)
+                return
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            status, body = 206, body[start : end + 1]
+
+        limit = route.fail_after
+        route.fail_after = None
+        self._send(status, body, headers, limit)
+
+    def _send(self, status, body, headers=None, limit=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if limit is None:
+            self.wfile.write(body)
+        else:
+            self.wfile.write(body[:limit])
+            self.close_connection = True
+
+
+class LocalServer:
+    """Threaded HTTP server on localhost serving canned routes."""
+
+    def __init__(self):
+        self.routes: dict[str, Route] = {}
+        self.requests: list[tuple[str, str, dict[str, str]]] = []
+        self.client_ports: set[int] = set()  # one per TCP connection
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.owner = self
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+
+    def add(self, path: str, body: bytes, **kwargs) -> str:
+        """Serve body at path and return its URL."""
+        self.routes[path] = Route(body, **kwargs)
+        return self.url(path)
+
+    def url(self, path: str) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def http_server():
+    """Start a local HTTP server for download tests."""
+    server = LocalServer()
+    yield server
+    server.close()
@@ -0,0 +1,248 @@
+"""Tests for the asyncio install engine."""
+
+import asyncio
+import hashlib
+import io
+import json
+import os
+import zipfile
+from dataclasses import replace
+
+import pytest
+
+from font_installer.config.settings import Settings
+from font_installer.core.async_downloader import AsyncDownloader, AsyncHttpClient
+from font_installer.core.async_installer import AsyncFontInstaller
+from font_installer.core.cache import DownloadCache, ReleaseCache
+from font_installer.core.installer import InstallResult
+from font_installer.core.lockfile import LockedFont, Lockfile
+from font_installer.core.manifest import InstallManifest
+
+
+def _font_zip() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("Hack-v3/ttf/Hack-Regular.ttf", b"regular")
+        zf.writestr("Hack-v3/ttf/Hack-Bold.ttf", b"bold")
+        zf.writestr("Hack-v3/README.md", b"readme")
+    return buffer.getvalue()
+
+
+class TestAsyncDownloader:
+    """Tests for AsyncDownloader."""
+
+    BODY = bytes(range(256)) * 400
+
+    def test_download_resumes_after_drop(self, http_server, temp_dir, monkeypatch):
+        """Test that a dropped transfer resumes with a Range request."""
+        monkeypatch.setattr(Settings, "DOWNLOAD_RETRY_DELAY", 0)
+        url = http_server.add("/big.exe", self.BODY, etag='"v1"', fail_after=20000)
+        dest = temp_dir / "big.exe"
+        progress = []
+
+        asyncio.run(AsyncDownloader(progress.append).download_file(url, dest, "Big"))
+
+        assert dest.read_bytes() == self.BODY
+        assert http_server.requests[1][2]["Range"] == "bytes=20000-"
+        assert progress[-1].percent == 100
+
+    def test_keep_alive_and_conditional_release(self, http_server, temp_dir, monkeypatch):
+        """Test release revalidation over one pooled connection."""
+        monkeypatch.setattr(Settings, "GITHUB_API_BASE", http_server.url("/repos"))
+        release = {
+            "tag_name": "v3",
+            "assets": [{"name": "Hack-v3.zip", "browser_download_url": "http://x/h.zip"}],
+        }
+        http_server.add("/repos/o/r/releases/latest", json.dumps(release).encode(), etag='"e"')
+
+        async def run():
+            downloader = AsyncDownloader(release_cache=ReleaseCache(temp_dir, ttl=0))
+            first = await downloader.get_github_release_url("o/r", "Hack-")
+            second = await downloader.get_github_release("o/r")
+            downloader.close()
+            return first, second
+
+        url, release_info = asyncio.run(run())
+
+        assert url == "http://x/h.zip"
+        assert release_info.tag == "v3"
+        assert http_server.requests[1][2]["If-None-Match"] == '"e"'
+        assert len(http_server.client_ports) == 1
+
+    def test_redirect_and_error(self, http_server):
+        """Test redirect following and HTTPError on 404."""
+        http_server.add("/final", b"done")
+        http_server.add("/go", b"", status=301, headers={"Location": "/final"}, ranges=False)
+
+        async def run():
+            client = AsyncHttpClient()
+            async with await client.open(http_server.url("/go")) as response:
+                body = await response.read()
+            with pytest.raises(Exception) as excinfo:
+                await client.open(http_server.url("/missing"))
+            client.close()
+            return body, excinfo.value
+
+        body, error = asyncio.run(run())
+        assert body == b"done"
+        assert error.code == 404
+
+
+class TestAsyncFontInstaller:
+    """Tests for AsyncFontInstaller."""
+
+    def test_install_dev_font(self, http_server, temp_dir, monkeypatch):
+        """Test a full dev font install against a local server."""
+        zip_url = http_server.add("/dl/Hack-v3.zip", _font_zip())
+        release = {
+            "tag_name": "v3",
+            "assets": [{"name": "Hack-v3.zip", "browser_download_url": zip_url}],
+        }
+        http_server.add(
+            "/repos/source-foundry/Hack/releases/latest", json.dumps(release).encode()
+        )
+        monkeypatch.setattr(Settings, "GITHUB_API_BASE", http_server.url("/repos"))
+        monkeypatch.setattr(Settings, "CACHE_DIR", temp_dir / "cache")
+        monkeypatch.setattr(Settings, "DEV_FONTS_DIR", temp_dir / "dev")
+        monkeypatch.setattr(Settings, "STAGING_DIR", temp_dir / "staging")
+        manifest = InstallManifest(temp_dir / "manifest.sqlite3")
+
+        installer = AsyncFontInstaller(
+            cache=DownloadCache(temp_dir / "cache"), manifest=manifest
+        )
+        result = asyncio.run(installer.install_dev_font("hack"))
+
+        assert result.success, result.message
+        assert result.files_installed == 2
+        assert (temp_dir / "dev" / "hack-regular.ttf").read_bytes() == b"regular"
+        record = manifest.get("hack")
+        assert record.version == "v3"
+        assert record.asset_url == zip_url
+        assert {f.path.name for f in record.files} == {"hack-regular.ttf", "hack-bold.ttf"}
+
+    def test_install_font_reports_key_time_and_bytes(
+        self, http_server, temp_dir, monkeypatch
+    ):
+        """Test that install_font() fills the same result fields as FontInstaller."""
+        body = _font_zip()
+        zip_url = http_server.add("/dl/Hack-v3.zip", body)
+        release = {
+            "tag_name": "v3",
+            "assets": [{"name": "Hack-v3.zip", "browser_download_url": zip_url}],
+        }
+        http_server.add(
+            "/repos/source-foundry/Hack/releases/latest", json.dumps(release).encode()
+        )
+        monkeypatch.setattr(Settings, "GITHUB_API_BASE", http_server.url("/repos"))
+        monkeypatch.setattr(Settings, "CACHE_DIR", temp_dir / "cache")
+        monkeypatch.setattr(Settings, "DEV_FONTS_DIR", temp_dir / "dev")
+        monkeypatch.setattr(Settings, "STAGING_DIR", temp_dir / "staging")
+
+        installer = AsyncFontInstaller(
+            cache=DownloadCache(temp_dir / "cache"),
+            manifest=InstallManifest(temp_dir / "manifest.sqlite3"),
+        )
+        result = asyncio.run(installer.install_font("hack"))
+        again = asyncio.run(installer.install_font("hack"))
+
+        assert result.success, result.message
+        assert result.key == "hack"
+        assert result.elapsed > 0
+        assert result.bytes_downloaded == len(body)
+        assert again.bytes_downloaded == 0
+
+    def test_locked_install_checks_sha256(self, http_server, temp_dir, monkeypatch):
+        """Test that a lockfile makes install_font() verify the download."""
+        body = _font_zip()
+        url = http_server.add("/dl/Hack-v3.zip", body)
+        monkeypatch.setattr(Settings, "GITHUB_API_BASE", http_server.url("/nowhere"))
+        monkeypatch.setattr(Settings, "DEV_FONTS_DIR", temp_dir / "dev")
+        monkeypatch.setattr(Settings, "CACHE_DIR", temp_dir / "cache")
+        monkeypatch.setattr(Settings, "STAGING_DIR", temp_dir / "staging")
+        locked = LockedFont(
+            key="hack",
+            name="Hack",
+            url=url,
+            size=len(body),
+            sha256=hashlib.sha256(body).hexdigest(),
+            members=("hack-bold.ttf", "hack-regular.ttf"),
+        )
+
+        def install(entry):
+            installer = AsyncFontInstaller(
+                manifest=InstallManifest(temp_dir / "manifest.sqlite3"),
+                lockfile=Lockfile({"hack": entry}),
+            )
+            return asyncio.run(installer.install_font("hack"))
+
+        tampered = install(replace(locked, sha256="0" * 64))
+        result = install(locked)
+
+        assert not tampered.success
+        assert "sha256" in tampered.message
+        assert result.success, result.message
+        assert result.files_installed == 2
+        assert (temp_dir / "dev" / "hack-bold.ttf").read_bytes() == b"bold"
+        assert all(path.startswith("/dl/") for _, path, _ in http_server.requests)
+
+    def test_install_many_runs_concurrently(self, monkeypatch):
+        """Test that installs overlap on the event loop."""
+        running = 0
+        peak = 0
+
+        async def fake_install(self, key):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return InstallResult(True, key, 1, "ok")
+
+        monkeypatch.setattr(AsyncFontInstaller, "install_font", fake_install)
+
+        async def run():
+            installer = AsyncFontInstaller()
+            return [r async for r in installer.install_many(["a", "b", "c", "d", "e"], jobs=3)]
+
+        results = asyncio.run(run())
+        assert sorted(r.font_name for r in results) == ["a", "b", "c", "d", "e"]
+        assert peak == 3
+
+    def test_closing_install_many_waits_for_cancelled_tasks(self, monkeypatch):
+        """Test that leftover installs are cancelled and awaited on early exit."""
+        cleaned = []
+
+        async def fake_install(self, key):
+            try:
+                await asyncio.sleep(0 if key == "a" else 10)
+                return InstallResult(True, key, 1, "ok")
+            finally:
+                cleaned.append(key)
+
+        monkeypatch.setattr(AsyncFontInstaller, "install_font", fake_install)
+
+        async def run():
+            results = AsyncFontInstaller().install_many(["a", "b", "c"])
+            first = await anext(results)
+            await results.aclose()
+            return first, sorted(cleaned)
+
+        first, finished = asyncio.run(run())
+        assert first.font_name == "a"
+        assert finished == ["a", "b", "c"]
+
+    def test_update_font_cache_runs_fc_cache(self, temp_dir, monkeypatch):
+        """Test that fc-cache runs as a subprocess for the given directories."""
+        bin_dir = temp_dir / "bin"
+        bin_dir.mkdir()
+        log = temp_dir / "fc-cache.log"
+        script = bin_dir / "fc-cache"
+        script.write_text(f'#!/bin/sh\necho "$@" >> "{log}"\n')
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        fonts = temp_dir / "fonts"
+        (fonts / "dev").mkdir(parents=True)
+
+        assert asyncio.run(AsyncFontInstaller.update_font_cache([fonts / "dev", fonts]))
+        assert asyncio.run(AsyncFontInstaller.update_font_cache([]))
+        assert log.read_text().split() == [str(fonts)]
@@ -0,0 +1,114 @@
+"""Tests for the download cache."""
+
+from pathlib import Path
+
+import pytest
+
+from font_installer.core.cache import DownloadCache, file_sha256
+from font_installer.core.installer import FontInstaller
+
+
+def _make_file(directory: Path, name: str, size: int) -> Path:
+    path = directory / name
+    path.write_bytes(name.encode()[:1] * size)
+    return path
+
+
+class TestDownloadCache:
+    """Tests for DownloadCache."""
+
+    def test_store_and_lookup(self, temp_dir):
+        """Test that a stored file is found again by URL."""
+        cache = DownloadCache(temp_dir / "cache", max_bytes=1000)
+        src = _make_file(temp_dir, "a.zip", 100)
+
+        cached = cache.store("http://example.com/a.zip", src)
+
+        assert not src.exists()
+        assert cache.lookup("http://example.com/a.zip") == cached
+        assert cached.name == file_sha256(cached)
+        assert cache.lookup("http://example.com/other.zip") is None
+
+    def test_same_content_is_stored_once(self, temp_dir):
+        """Test that identical content under two URLs shares one file."""
+        cache = DownloadCache(temp_dir / "cache", max_bytes=1000)
+        first = cache.store("http://a/x.zip", _make_file(temp_dir, "x1", 50))
+        (temp_dir / "x2").write_bytes(first.read_bytes())
+        second = cache.store("http://b/x.zip", temp_dir / "x2")
+
+        assert first == second
+        stats = cache.stats()
+        assert stats.entries == 1
+        assert stats.urls == 2
+        assert stats.total_bytes == 50
+
+    def test_lru_eviction(self, temp_dir):
+        """Test that the least recently used file is evicted first."""
+        cache = DownloadCache(temp_dir / "cache", max_bytes=250)
+        cache.store("http://a", _make_file(temp_dir, "a", 100))
+        cache.store("http://b", _make_file(temp_dir, "b", 100))
+        assert cache.lookup("http://a") is not None  # a is now most recent
+
+        cache.store("http://c", _make_file(temp_dir, "c", 100))
+
+        assert cache.lookup("http://b") is None
+        assert cache.lookup("http://a") is not None
+        assert cache.lookup("http://c") is not None
+        assert cache.stats().total_bytes == 200
+
+    def test_prune_and_missing_blob(self, temp_dir):
+        """Test pruning to a smaller size and recovering from deleted files."""
+        cache = DownloadCache(temp_dir / "cache", max_bytes=1000)
+        a = cache.store("http://a", _make_file(temp_dir, "a", 100))
+        cache.store("http://b", _make_file(temp_dir, "b", 100))
+
+        a.unlink()
+        assert cache.lookup("http://a") is None
+
+        assert cache.prune(0) == 100
+        assert cache.stats().entries == 0
+
+    def test_prune_rejects_negative_limit(self, temp_dir):
+        """Test that a negative limit does not empty the cache."""
+        cache = DownloadCache(temp_dir / "cache", max_bytes=1000)
+        cache.store("http://a", _make_file(temp_dir, "a", 100))
+
+        with pytest.raises(ValueError):
+            cache.prune(-5)
+        assert cache.stats().entries == 1
+
+    def test_eviction_skips_claimed_blobs(self, temp_dir):
+        """Test that a blob whose URL is being fetched is not evicted."""
+        cache = DownloadCache(temp_dir / "cache", max_bytes=1000)
+        a = cache.store("http://a", _make_file(temp_dir, "a", 100))
+        cache.store("http://b", _make_file(temp_dir, "b", 100))
+
+        with cache.claim("http://a"):
+            assert cache.prune(0) == 100
+        assert a.exists()
+        assert cache.lookup("http://a") == a
+        assert cache.prune(0) == 100
+
+
+class TestInstallerCache:
+    """Tests for the installer's use of the cache."""
+
+    def test_fetch_uses_cache_before_network(self, temp_dir, monkeypatch):
+        """Test that a cached artifact is not downloaded again."""
+        cache = DownloadCache(temp_dir / "cache")
+        installer = FontInstaller(cache=cache)
+        downloads = []
+
+        def fake_download(url, dest, name, segments=1):
+            downloads.append(url)
+            dest.write_bytes(b"zip data")
+            return dest
+
+        monkeypatch.setattr(installer._downloader, "download_file", fake_download)
+
+        first = installer._fetch("http://x/font.zip", temp_dir / "1.zip", "Font")
+        second = installer._fetch("http://x/font.zip", temp_dir / "2.zip", "Font")
+
+        assert downloads == ["http://x/font.zip"]
+        assert first == second
+        assert second.read_bytes() == b"zip data"
@@ -0,0 +1,327 @@
+"""Tests for the command-line interface."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import font_installer
+from font_installer import cli
+from font_installer.config.fonts import DEV_FONTS
+from font_installer.config.settings import Settings
+from font_installer.core.cache import DownloadCache
+from font_installer.core.installer import (
+    FontInstaller,
+    InstallResult,
+    LockResult,
+    UpdateCheck,
+)
+from font_installer.core.lockfile import LockedFont, Lockfile
+
+from .test_fontindex import make_font
+
+
+class TestUpdateCommand:
+    """Tests for 'font-installer update'."""
+
+    def _patch(self, monkeypatch, checks):
+        installed = []
+        cache_updates = []
+
+        def fake_install_many(self, keys, jobs=None):
+            for key in keys:
+                installed.append(key)
+                yield InstallResult(True, key, 1, "ok")
+
+        def fake_refresh(self):
+            cache_updates.append(1)
+            return True
+
+        monkeypatch.setattr(FontInstaller, "check_updates", lambda self: checks)
+        monkeypatch.setattr(FontInstaller, "install_many", fake_install_many)
+        monkeypatch.setattr(FontInstaller, "refresh_font_cache", fake_refresh)
+        return installed, cache_updates
+
+    def test_installs_only_outdated_fonts(self, monkeypatch, capsys):
+        """Test that unchanged fonts are skipped and the cache refreshed once."""
+        installed, cache_updates = self._patch(
+            monkeypatch,
+            [
+                UpdateCheck("hack", "Hack", "v3", "v3"),
+                UpdateCheck("firacode", "Fira Code", "6.1", "6.2", outdated=True),
+                UpdateCheck("jetbrains", "JetBrains Mono", "2.3", "2.4", outdated=True),
+            ],
+        )
+
+        assert cli.update_command([]) == 0
+        assert installed == ["firacode", "jetbrains"]
+        assert cache_updates == [1]
+        assert "6.1 -> 6.2" in capsys.readouterr().out
+
+    @pytest.mark.parametrize(
+        "args", [["--format", "woff"], ["--format"], ["--chek"], ["extra"]]
+    )
+    def test_rejects_bad_arguments(self, monkeypatch, args):
+        """Test that usage errors exit before checking for updates."""
+        checked = []
+        monkeypatch.setattr(
+            FontInstaller, "check_updates", lambda self: checked.append(1) or []
+        )
+
+        assert cli.update_command(args) == cli.EXIT_USAGE
+        assert checked == []
+
+    def test_up_to_date_does_nothing(self, monkeypatch):
+        """Test the nightly no-op case: no installs and no cache refresh."""
+        installed, cache_updates = self._patch(
+            monkeypatch, [UpdateCheck("hack", "Hack", "v3", "v3")]
+        )
+
+        assert cli.update_command([]) == 0
+        assert installed == []
+        assert cache_updates == []
+
+    def test_check_only_and_errors(self, monkeypatch):
+        """Test --check and the exit code when a lookup fails."""
+        installed, _ = self._patch(
+            monkeypatch,
+            [
+                UpdateCheck("hack", "Hack", "v3", "v4", outdated=True),
+                UpdateCheck("firacode", "Fira Code", "6.1", error="HTTP 500"),
+            ],
+        )
+
+        assert cli.update_command(["--check"]) == 1
+        assert installed == []
+
+
+class TestInstallCommand:
+    """Tests for 'font-installer install'."""
+
+    @pytest.fixture
+    def installs(self, monkeypatch):
+        """Record installed keys; 'hack' fails."""
+        calls = {"keys": [], "cache": 0, "scheduled": True}
+
+        def fake_install_font(self, key):
+            calls["keys"].append(key)
+            calls["format"] = self._font_format
+            return InstallResult(
+                key != "hack", key, 2, "ok" if key != "hack" else "HTTP 500", key=key
+            )
+
+        def fake_refresh(self):
+            calls["cache"] += 1
+            return calls["scheduled"]
+
+        monkeypatch.setattr(FontInstaller, "install_font", fake_install_font)
+        monkeypatch.setattr(FontInstaller, "refresh_font_cache", fake_refresh)
+        return calls
+
+    def test_json_lines_and_partial_failure(self, installs, capsys):
+        """Test one JSON line per font, one cache refresh and exit code 3."""
+        code = cli.install_command(
+            ["calibri", "consolas", "firacode", "hack", "--json", "--jobs", "2"]
+        )
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert code == cli.EXIT_PARTIAL
+        assert sorted(installs["keys"]) == ["cleartype", "firacode", "hack"]
+        assert {line["key"]: line["success"] for line in lines} == {
+            "cleartype": True,
+            "firacode": True,
+            "hack": False,
+        }
+        assert {"seconds", "bytes_downloaded", "files"} <= lines[0].keys()
+        assert installs["cache"] == 1
+
+    def test_all_and_core_keys(self, installs):
+        """Test --all (ClearType and every dev font) and the core key."""
+        assert cli.install_command(["--all", "--json"]) == cli.EXIT_PARTIAL
+        assert set(installs["keys"]) == {"cleartype", *DEV_FONTS}
+
+        installs["keys"].clear()
+        assert cli.install_command(["core", "firacode"]) == cli.EXIT_OK
+        assert sorted(installs["keys"]) == ["core", "firacode"]
+
+    def test_font_cache_outcome(self, installs, capsys):
+        """Test that the background refresh is announced only if it started."""
+        cli.install_command(["firacode"])
+        assert "segundo plano" in capsys.readouterr().out
+
+        installs["scheduled"] = False
+        cli.install_command(["firacode", "--json"])
+        captured = capsys.readouterr()
+        assert "segundo plano" not in captured.out
+        assert "fc-cache" in captured.err
+
+    def test_format_reaches_installer(self, installs):
+        """Test that --format sets the installer's format policy."""
+        assert cli.install_command(["firacode", "--format", "otf"]) == cli.EXIT_OK
+        assert installs["format"] == "otf"
+
+    def test_every_install_failed(self, installs):
+        """Test exit code 1 when nothing could be installed."""
+        assert cli.install_command(["hack"]) == cli.EXIT_FAILED
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            [],
+            ["nao-existe"],
+            ["hack", "--jobs", "0"],
+            ["--jobs", "x"],
+            ["hack", "--lockfile", "fonts.lock.json"],
+            ["hack", "--format", "woff"],
+            ["--locked", "--format", "otf"],
+        ],
+    )
+    def test_usage_errors(self, args, installs, capsys):
+        """Test that bad arguments install nothing and exit with code 2."""
+        assert cli.install_command(args) == cli.EXIT_USAGE
+        assert installs["keys"] == []
+        assert installs["cache"] == 0
+
+
+class TestLockCommand:
+    """Tests for 'font-installer lock' and 'install --locked'."""
+
+    @staticmethod
+    def _locked(key):
+        url = f"http://x/{key}.zip"
+        return LockedFont(key, key.title(), url, 3, "ab" * 32, ("a.ttf",))
+
+    def test_lock_merges_into_existing_file(self, temp_dir, monkeypatch):
+        """Test that locking keeps entries of fonts that were not resolved."""
+        path = temp_dir / "fonts.lock.json"
+        Lockfile({"hack": self._locked("hack")}).save(path)
+
+        def fake_lock_many(installer, keys, jobs=None):
+            return [LockResult(key, self._locked(key)) for key in keys]
+
+        monkeypatch.setattr(FontInstaller, "lock_many", fake_lock_many)
+
+        assert cli.lock_command(["firacode", "--lockfile", str(path)]) == cli.EXIT_OK
+        assert set(Lockfile.load(path).fonts) == {"firacode", "hack"}
+
+    def test_failed_lock_writes_nothing(self, temp_dir, monkeypatch):
+        """Test that the lockfile is only written when every font resolved."""
+        path = temp_dir / "fonts.lock.json"
+
+        def fake_lock_many(installer, keys, jobs=None):
+            return [LockResult(key, error="HTTP 500") for key in keys]
+
+        monkeypatch.setattr(FontInstaller, "lock_many", fake_lock_many)
+
+        assert cli.lock_command(["hack", "--lockfile", str(path)]) == cli.EXIT_FAILED
+        assert not path.exists()
+        assert cli.lock_command(["core"]) == cli.EXIT_USAGE
+
+    def test_install_locked_uses_every_entry(self, temp_dir, monkeypatch):
+        """Test that 'install --locked' installs the lockfile's fonts from it."""
+        path = temp_dir / "fonts.lock.json"
+        Lockfile({k: self._locked(k) for k in ("hack", "firacode")}).save(path)
+        installed = []
+
+        def fake_install_font(self, key):
+            installed.append((key, self._lockfile.fonts[key].url))
+            return InstallResult(True, key, 1, "ok", key=key)
+
+        monkeypatch.setattr(FontInstaller, "install_font", fake_install_font)
+        monkeypatch.setattr(FontInstaller, "refresh_font_cache", lambda self: True)
+
+        args = ["--locked", "--lockfile", str(path), "--json"]
+        assert cli.install_command(args) == cli.EXIT_OK
+        assert sorted(installed) == [
+            ("firacode", "http://x/firacode.zip"),
+            ("hack", "http://x/hack.zip"),
+        ]
+        assert cli.install_command(["--locked", "--lockfile", "nada"]) == cli.EXIT_USAGE
+
+
+class TestListCommand:
+    """Tests for 'font-installer list'."""
+
+    def test_groups_by_family(self, temp_dir, monkeypatch, capsys):
+        """Test that fonts are listed per family with versions and styles."""
+        dev = temp_dir / "dev"
+        dev.mkdir()
+        monkeypatch.setattr(Settings, "MICROSOFT_FONTS_DIR", temp_dir / "microsoft")
+        monkeypatch.setattr(Settings, "DEV_FONTS_DIR", dev)
+        monkeypatch.setattr(Settings, "CACHE_DIR", temp_dir / "cache")
+        monkeypatch.setattr(Settings, "MANIFEST_PATH", temp_dir / "manifest.sqlite3")
+        (dev / "Mono-Bold.ttf").write_bytes(make_font("Mono", "Bold", 700, "2.304"))
+        (dev / "Mono-Regular.ttf").write_bytes(make_font("Mono", "Regular", 400, "2.304"))
+
+        assert cli.list_fonts() == 0
+
+        out = capsys.readouterr().out
+        assert "  Mono 2.304 [ttf]\n    Regular, Bold\n" in out
+        assert "Total: 1 familias, 2 arquivos" in out
+
+
+class TestCacheCommand:
+    """Tests for 'font-installer cache'."""
+
+    def test_prune_rejects_negative_size(self, temp_dir, monkeypatch, capsys):
+        """Test that 'cache prune -5' is an error, not a full clear."""
+        monkeypatch.setattr(Settings, "CACHE_DIR", temp_dir / "cache")
+        pruned = []
+        monkeypatch.setattr(DownloadCache, "prune", lambda self, limit: pruned.append(limit))
+
+        assert cli.cache_command(["prune", "-5"]) == 1
+        assert "Tamanho invalido" in capsys.readouterr().out
+        assert pruned == []
+
+
+class TestStartup:
+    """Import-time budget of commands that do not open the TUI."""
+
+    # Cumulative import time of font_installer.cli, in microseconds. Loading
+    # the TUI alone costs several times this.
+    IMPORT_BUDGET_US = 250_000
+
+    @staticmethod
+    def _import_times(args: list[str], home: Path) -> dict[str, int]:
+        """Run the CLI under -X importtime; return cumulative us per module."""
+        src = str(Path(font_installer.__file__).parents[1])
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "font_installer", *args],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "HOME": str(home), "PYTHONPATH": src},
+        )
+        assert result.returncode == 0, result.stderr
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, module = line.split("|")
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+        return times
+
+    @pytest.mark.parametrize("args", [["--help"], ["list"]])
+    def test_no_tui_imports(self, args, temp_dir):
+        """Test that non-TUI commands load neither Textual nor Rich."""
+        times = self._import_times(args, temp_dir)
+
+        assert "font_installer.cli" in times
+        loaded = {module.split(".")[0] for module in times}
+        assert not loaded & {"textual", "rich"}
+        assert "font_installer.core.downloader" not in times
+        assert times["font_installer.cli"] < self.IMPORT_BUDGET_US
+
+    def test_core_exports_load_on_access(self):
+        """Test that the lazy core package still exposes its names."""
+        from font_installer import core
+        from font_installer.core.installer import FontInstaller as Installer
+
+        assert core.FontInstaller is Installer
+        assert sorted(core.__all__) == sorted(core._EXPORTS)
+        assert "AsyncFontInstaller" in dir(core)
+        with pytest.raises(AttributeError):
+            assert core.NotAName
@@ -0,0 +1,366 @@
+"""Tests for the downloader."""
+
+import gzip
+import json
+import urllib.error
+
+import pytest
+
+from font_installer.config.settings import Settings
+from font_installer.core.cache import ReleaseCache
+from font_installer.core.downloader import (
+    AssetSelection,
+    Downloader,
+    HttpClient,
+    ReleaseInfo,
+)
+from font_installer.core.exceptions import DownloadError
+from font_installer.core.progress import ProgressBus
+
+RELEASE = {
+    "tag_name": "v2.0",
+    "assets": [
+        {"name": "Other-2.0.zip", "browser_download_url": "http://x/o.zip", "size": 9, "id": 1},
+        {"name": "Font-2.0.zip", "browser_download_url": "http://x/f.zip", "size": 5, "id": 2},
+    ],
+}
+
+
+class TestGithubRelease:
+    """Tests for release metadata lookups."""
+
+    @pytest.fixture
+    def api(self, http_server, monkeypatch):
+        monkeypatch.setattr(Settings, "GITHUB_API_BASE", http_server.url("/repos"))
+        return http_server
+
+    def test_conditional_request_reuses_cached_release(self, api, temp_dir):
+        """Test that an unchanged release is revalidated with If-None-Match."""
+        api.add("/repos/o/r/releases/latest", json.dumps(RELEASE).encode(), etag='"abc"')
+        downloader = Downloader(release_cache=ReleaseCache(temp_dir, ttl=0))
+
+        assert downloader.get_github_release_url("o/r", "font") == "http://x/f.zip"
+        release = downloader.get_github_release("o/r")
+
+        assert release.tag == "v2.0"
+        assert api.requests[1][2].get("If-None-Match") == '"abc"'
+
+    def test_fresh_cache_skips_network(self, api, temp_dir):
+        """Test that metadata within the TTL is served without a request."""
+        api.add("/repos/o/r/releases/latest", json.dumps(RELEASE).encode())
+        downloader = Downloader(release_cache=ReleaseCache(temp_dir, ttl=600))
+
+        downloader.get_github_release("o/r")
+        downloader.get_github_release("o/r")
+
+        assert len(api.requests) == 1
+
+    def test_rate_limit_is_reported(self, api, temp_dir):
+        """Test that rate limiting raises instead of returning None."""
+        api.add(
+            "/repos/o/r/releases/latest",
+            b"{}",
+            status=403,
+            headers={"X-RateLimit-Remaining": "0"},
+        )
+        downloader = Downloader(release_cache=ReleaseCache(temp_dir))
+
+        with pytest.raises(DownloadError, match="limite"):
+            downloader.get_github_release_url("o/r", "font")
+
+    def test_stale_cache_used_when_rate_limited(self, api, temp_dir):
+        """Test that cached metadata is used when the API refuses requests."""
+        cache = ReleaseCache(temp_dir, ttl=0)
+        cache.save("o/r", RELEASE, etag='"old"')
+        api.add("/repos/o/r/releases/latest", b"{}", status=429)
+
+        downloader = Downloader(release_cache=cache)
+        assert downloader.get_github_release_url("o/r", "other") == "http://x/o.zip"
+
+    @pytest.mark.parametrize("content", ["[]", '"x"', '{"release": {}, "fetched_at": "?"}'])
+    def test_malformed_cache_entry_is_ignored(self, api, temp_dir, content):
+        """Test that a corrupt cache file falls back to the network."""
+        api.add("/repos/o/r/releases/latest", json.dumps(RELEASE).encode())
+        (temp_dir / "o__r.json").write_text(content)
+        downloader = Downloader(release_cache=ReleaseCache(temp_dir, ttl=600))
+
+        assert downloader.get_github_release("o/r").tag == "v2.0"
+        assert len(api.requests) == 1
+
+
+def _release(*assets: tuple[str, int]) -> ReleaseInfo:
+    return ReleaseInfo.from_api(
+        "o/r",
+        {
+            "tag_name": "v1",
+            "assets": [
+                {"name": name, "browser_download_url": f"http://x/{name}", "size": size}
+                for name, size in assets
+            ],
+        },
+    )
+
+
+class TestAssetSelection:
+    """Tests for size-aware release asset selection."""
+
+    def test_prefers_smaller_ttf_asset_over_all_in_one(self):
+        """Test that a TTF-only zip wins over a larger bundle."""
+        release = _release(
+            ("Font-2.0.zip", 9_000_000),
+            ("Font-2.0-webfonts.zip", 1_000_000),
+            ("Font-2.0-ttf.zip", 3_000_000),
+            ("Font-2.0.tar.xz", 100),
+        )
+
+        selection = release.select_asset("Font-")
+
+        assert selection.asset.name == "Font-2.0-ttf.zip"
+        assert selection.reason == AssetSelection.SMALLEST
+        assert selection.baseline.name == "Font-2.0.zip"
+        assert selection.bytes_saved == 6_000_000
+
+    def test_requested_format(self):
+        """Test that only assets providing the wanted format qualify."""
+        release = _release(
+            ("Font-otf.zip", 2_000),
+            ("Font-ttf.zip", 3_000),
+            ("Font-variable.zip", 1_000),
+        )
+
+        assert release.find_asset("Font", ("otf",)).name == "Font-otf.zip"
+        assert release.find_asset("Font", ("variable",)).name == "Font-variable.zip"
+        assert release.find_asset("Font").name == "Font-otf.zip"
+
+    def test_falls_back_to_first_match(self):
+        """Test the previous behaviour when no asset declares the format."""
+        release = _release(("Font-web.zip", 5), ("Font-woff2.zip", 1))
+
+        selection = release.select_asset("Font")
+
+        assert selection.asset.name == "Font-web.zip"
+        assert selection.reason == AssetSelection.FIRST_MATCH
+        assert selection.bytes_saved == 0
+
+    def test_unknown_sizes_rank_last(self):
+        """Test that assets without a size are not treated as the smallest."""
+        release = _release(("Font-static.zip", 0), ("Font-ttf.zip", 10))
+
+        assert release.find_asset("Font").name == "Font-ttf.zip"
+
+
+class TestResumableDownload:
+    """Tests for resumable downloads."""
+
+    BODY = bytes(range(256)) * 400
+
+    @pytest.fixture(autouse=True)
+    def no_retry_delay(self, monkeypatch):
+        monkeypatch.setattr(Settings, "DOWNLOAD_RETRY_DELAY", 0)
+
+    def test_dropped_connection_resumes_with_range(self, http_server, temp_dir):
+        """Test that a dropped transfer is topped up instead of restarted."""
+        url = http_server.add("/big.exe", self.BODY, etag='"v1"', fail_after=30000)
+        dest = temp_dir / "big.exe"
+
+        Downloader().download_file(url, dest, "Big")
+
+        assert dest.read_bytes() == self.BODY
+        assert not (temp_dir / "big.exe.part").exists()
+        assert not (temp_dir / "big.exe.part.json").exists()
+        retry_headers = http_server.requests[1][2]
+        assert retry_headers["Range"] == "bytes=30000-"
+        assert retry_headers["If-Range"] == '"v1"'
+
+    def test_leftover_part_is_resumed(self, http_server, temp_dir):
+        """Test that a partial file from an earlier run is resumed."""
+        url = http_server.add("/big.exe", self.BODY, etag='"v1"')
+        dest = temp_dir / "big.exe"
+        (temp_dir / "big.exe.part").write_bytes(self.BODY[:1000])
+        (temp_dir / "big.exe.part.json").write_text(
+            json.dumps({"url": url, "validator": '"v1"', "total": len(self.BODY)})
+        )
+
+        Downloader().download_file(url, dest, "Big")
+
+        assert dest.read_bytes() == self.BODY
+        assert http_server.requests[0][2]["Range"] == "bytes=1000-"
+
+    def test_changed_file_restarts_from_zero(self, http_server, temp_dir):
+        """Test that a stale partial file is discarded when If-Range fails."""
+        url = http_server.add("/big.exe", self.BODY, etag='"v2"')
+        dest = temp_dir / "big.exe"
+        (temp_dir / "big.exe.part").write_bytes(b"x" * 1000)
+        (temp_dir / "big.exe.part.json").write_text(
+            json.dumps({"url": url, "validator": '"v1"', "total": len(self.BODY)})
+        )
+
+        Downloader().download_file(url, dest, "Big")
+
+        assert dest.read_bytes() == self.BODY
+
+    def test_server_without_ranges_falls_back(self, http_server, temp_dir):
+        """Test a full download when the server ignores Range."""
+        url = http_server.add(
+            "/big.exe", self.BODY, etag='"v1"', ranges=False, fail_after=5000
+        )
+        dest = temp_dir / "big.exe"
+
+        Downloader().download_file(url, dest, "Big")
+
+        assert dest.read_bytes() == self.BODY
+
+    def test_http_error_is_not_retried(self, http_server, temp_dir):
+        """Test that a 404 fails immediately with DownloadError."""
+        with pytest.raises(DownloadError, match="404"):
+            Downloader().download_file(http_server.url("/nope"), temp_dir / "x", "X")
+        assert len(http_server.requests) == 1
+
+
+class TestSegmentedDownload:
+    """Tests for segmented parallel downloads."""
+
+    BODY = bytes(range(256)) * 1000
+
+    @pytest.fixture(autouse=True)
+    def small_segments(self, monkeypatch):
+        monkeypatch.setattr(Settings, "SEGMENT_MIN_BYTES", 10_000)
+        monkeypatch.setattr(Settings, "DOWNLOAD_RETRY_DELAY", 0)
+
+    def _range_requests(self, server):
+        return [h["Range"] for m, _, h in server.requests if m == "GET" and "Range" in h]
+
+    def test_assembles_segments(self, http_server, temp_dir):
+        """Test that ranges are fetched separately and assembled in order."""
+        url = http_server.add("/big.exe", self.BODY, etag='"v1"')
+        dest = temp_dir / "big.exe"
+        published = []
+
+        class RecordingBus(ProgressBus):
+            def publish(self, name, percent, status, downloaded=0, total=0):
+                published.append((downloaded, total))
+                super().publish(name, percent, status, downloaded, total)
+
+        downloader = Downloader(progress_bus=RecordingBus())
+        downloader.download_file(url, dest, "Big", segments=4)
+
+        assert dest.read_bytes() == self.BODY
+        assert len(self._range_requests(http_server)) == 4
+        assert not (temp_dir / "big.exe.part.json").exists()
+        byte_reports = [(done, total) for done, total in published if total]
+        assert max(done for done, _ in byte_reports) == len(self.BODY)
+        assert all(total == len(self.BODY) for _, total in byte_reports)
+
+    def test_dropped_segment_is_retried(self, http_server, temp_dir):
+        """Test that a failed segment resumes its own range."""
+        url = http_server.add("/big.exe", self.BODY, etag='"v1"', fail_after=1000)
+        dest = temp_dir / "big.exe"
+
+        Downloader().download_file(url, dest, "Big", segments=4)
+
+        assert dest.read_bytes() == self.BODY
+        assert len(self._range_requests(http_server)) == 5
+
+    def test_falls_back_without_range_support(self, http_server, temp_dir):
+        """Test a single-stream download when ranges are not advertised."""
+        url = http_server.add("/big.exe", self.BODY, etag='"v1"', ranges=False)
+        dest = temp_dir / "big.exe"
+
+        Downloader().download_file(url, dest, "Big", segments=4)
+
+        assert dest.read_bytes() == self.BODY
+        assert self._range_requests(http_server) == []
+
+    def test_resumes_segment_state(self, http_server, temp_dir):
+        """Test that completed ranges are not fetched again."""
+        url = http_server.add("/big.exe", self.BODY, etag='"v1"')
+        dest = temp_dir / "big.exe"
+        half = len(self.BODY) // 2
+        part = temp_dir / "big.exe.part"
+        part.write_bytes(self.BODY[:half] + b"\0" * (len(self.BODY) - half))
+        (temp_dir / "big.exe.part.json").write_text(
+            json.dumps(
+                {
+                    "url": url,
+                    "validator": '"v1"',
+                    "total": len(self.BODY),
+                    "segments": [[0, half - 1, half], [half, len(self.BODY) - 1, 0]],
+                }
+            )
+        )
+
+        Downloader().download_file(url, dest, "Big", segments=2)
+
+        assert dest.read_bytes() == self.BODY
+        assert self._range_requests(http_server) == [f"bytes={half}-{len(self.BODY) - 1}"]
+
+
+class TestHttpClient:
+    """Tests for the pooled HTTP client."""
+
+    def test_reuses_keep_alive_connection(self, http_server):
+        """Test that sequential requests share one TCP connection."""
+        url = http_server.add("/a", b"a" * 1000)
+        client = HttpClient()
+
+        for _ in range(3):
+            with client.open(url) as response:
+                assert response.read() == b"a" * 1000
+
+        assert len(http_server.requests) == 3
+        assert len(http_server.client_ports) == 1
+
+    def test_not_modified_keeps_connection(self, http_server):
+        """Test that a 304 response leaves its connection reusable."""
+        url = http_server.add("/a", b"a" * 1000, etag='"v1"')
+        client = HttpClient()
+
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            client.open(url, {"If-None-Match": '"v1"'})
+        assert excinfo.value.code == 304
+        with client.open(url) as response:
+            assert response.read() == b"a" * 1000
+
+        assert len(http_server.client_ports) == 1
+
+    def test_follows_redirects(self, http_server):
+        """Test that redirects are followed without losing headers."""
+        target = http_server.add("/final", b"0123456789")
+        http_server.add(
+            "/start", b"", status=302, headers={"Location": "/final"}, ranges=False
+        )
+
+        with HttpClient().open(http_server.url("/start"), {"Range": "bytes=5-"}) as r:
+            assert r.status == 206
+            assert r.url == target
+            assert r.read() == b"56789"
+
+    def test_decodes_gzip(self, http_server):
+        """Test that gzip bodies are requested and decoded for API calls."""
+        body = json.dumps(RELEASE).encode()
+        url = http_server.add(
+            "/api", gzip.compress(body), headers={"Content-Encoding": "gzip"}
+        )
+
+        with HttpClient().open(url, compressed=True) as response:
+            assert json.loads(response.read()) == RELEASE
+        assert http_server.requests[0][2]["Accept-Encoding"] == "gzip"
+
+    def test_error_status_raises(self, http_server):
+        """Test that 4xx responses raise HTTPError like urlopen did."""
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            HttpClient().open(http_server.url("/missing"))
+        assert excinfo.value.code == 404
+
+    def test_downloader_shares_connections(self, http_server, temp_dir, monkeypatch):
+        """Test that metadata and file downloads reuse pooled connections."""
+        monkeypatch.setattr(Settings, "GITHUB_API_BASE", http_server.url("/repos"))
+        http_server.add("/repos/o/r/releases/latest", json.dumps(RELEASE).encode())
+        url = http_server.add("/f.zip", b"zip" * 100)
+        downloader = Downloader(release_cache=ReleaseCache(temp_dir, ttl=0))
+
+        downloader.get_github_release("o/r")
+        downloader.download_file(url, temp_dir / "1.zip", "F")
+        downloader.download_file(url, temp_dir / "2.zip", "F")
+
+        assert len(http_server.client_ports) == 1
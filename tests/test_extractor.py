@@ -0,0 +1,472 @@
+"""Tests for font extraction."""
+
+import base64
+import fnmatch
+import io
+import os
+import struct
+import sys
+import zipfile
+import zlib
+
+import pytest
+
+from font_installer.config.settings import Settings
+from font_installer.core.downloader import Downloader
+from font_installer.core.exceptions import ExtractionError
+from font_installer.core.extractor import (
+    Cabinet,
+    FontExtractor,
+    StreamExtractionUnsupported,
+)
+
+FONT_DATA = b"\x00\x01\x00\x00" + bytes(range(256)) * 64
+
+
+class _Unseekable(io.RawIOBase):
+    """Write-only stream that makes zipfile emit data descriptors."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data += b
+        return len(b)
+
+
+class _Trickle(io.RawIOBase):
+    """Readable stream that returns at most a few bytes per read."""
+
+    def __init__(self, data: bytes, step: int = 7):
+        self._data = memoryview(data)
+        self._step = step
+
+    def readable(self):
+        return True
+
+    def read(self, n=-1):
+        n = self._step if n < 0 else min(n, self._step)
+        chunk, self._data = self._data[:n], self._data[n:]
+        return bytes(chunk)
+
+
+def _make_zip(members: dict[str, bytes], compression=zipfile.ZIP_DEFLATED, seekable=True):
+    out = io.BytesIO() if seekable else _Unseekable()
+    with zipfile.ZipFile(out, "w", compression) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return out.getvalue() if seekable else bytes(out.data)
+
+
+MEMBERS = {
+    "Font/README.md": b"readme",
+    "Font/ttf/Font-Regular.ttf": FONT_DATA,
+    "Font/ttf/static/Font-Bold.ttf": FONT_DATA[::-1],
+    "Font/variable/Font[wght]-Variable.ttf": FONT_DATA * 2,
+    "Font/ttf/.hidden.ttf": b"x",
+}
+
+
+class TestZipStream:
+    """Tests for FontExtractor.extract_zip_stream."""
+
+    @pytest.mark.parametrize("seekable", [True, False])
+    def test_extracts_preferred_fonts(self, temp_dir, seekable):
+        """Test that fonts are inflated from the stream and variables dropped."""
+        archive = _make_zip(MEMBERS, seekable=seekable)
+
+        fonts = FontExtractor().extract_zip_stream(_Trickle(archive), temp_dir)
+
+        names = sorted(p.relative_to(temp_dir).as_posix() for p in fonts)
+        assert names == ["Font/ttf/Font-Regular.ttf", "Font/ttf/static/Font-Bold.ttf"]
+        assert (temp_dir / "Font/ttf/Font-Regular.ttf").read_bytes() == FONT_DATA
+        assert not (temp_dir / "Font/variable/Font[wght]-Variable.ttf").exists()
+        assert not (temp_dir / "Font/README.md").exists()
+
+    def test_stored_members(self, temp_dir):
+        """Test that uncompressed members are copied through."""
+        archive = _make_zip({"a/Mono.otf": FONT_DATA}, zipfile.ZIP_STORED)
+
+        fonts = FontExtractor().extract_zip_stream(io.BytesIO(archive), temp_dir)
+
+        assert [p.read_bytes() for p in fonts] == [FONT_DATA]
+
+    def test_stored_with_descriptor_is_unsupported(self, temp_dir):
+        """Test that a member of unknown length is refused, not guessed."""
+        archive = _make_zip({"Mono.ttf": FONT_DATA}, zipfile.ZIP_STORED, seekable=False)
+
+        with pytest.raises(StreamExtractionUnsupported):
+            FontExtractor().extract_zip_stream(io.BytesIO(archive), temp_dir)
+
+    def test_rejects_path_traversal(self, temp_dir):
+        """Test that members outside the output directory are skipped."""
+        archive = _make_zip({"../evil.ttf": FONT_DATA, "ok.ttf": FONT_DATA})
+
+        fonts = FontExtractor().extract_zip_stream(io.BytesIO(archive), temp_dir / "out")
+
+        assert [p.name for p in fonts] == ["ok.ttf"]
+        assert not (temp_dir / "evil.ttf").exists()
+
+    def test_extracts_from_resumed_download(self, http_server, temp_dir, monkeypatch):
+        """Test extraction over a download stream that drops mid-transfer."""
+        monkeypatch.setattr(Settings, "DOWNLOAD_RETRY_DELAY", 0)
+        archive = _make_zip({"Big.ttf": bytes(range(256)) * 2000}, zipfile.ZIP_STORED)
+        url = http_server.add("/font.zip", archive, etag='"z1"', fail_after=100000)
+
+        with Downloader().open_stream(url, "Font") as stream:
+            fonts = FontExtractor().extract_zip_stream(stream, temp_dir)
+
+        assert fonts[0].read_bytes() == bytes(range(256)) * 2000
+        assert http_server.requests[1][2]["Range"] == "bytes=100000-"
+
+
+class TestZipExtraction:
+    """Tests for FontExtractor.extract_from_zip."""
+
+    def test_extracts_only_selected_fonts(self, temp_dir):
+        """Test that only the chosen font members are written to disk."""
+        zip_path = temp_dir / "font.zip"
+        zip_path.write_bytes(_make_zip(MEMBERS))
+        out = temp_dir / "out"
+
+        fonts = FontExtractor().extract_from_zip(zip_path, out)
+
+        written = sorted(p.relative_to(out).as_posix() for p in out.rglob("*") if p.is_file())
+        assert written == ["Font/ttf/Font-Regular.ttf", "Font/ttf/static/Font-Bold.ttf"]
+        assert sorted(p.relative_to(out).as_posix() for p in fonts) == written
+
+    def test_falls_back_to_variable_fonts(self, temp_dir):
+        """Test that variable builds are used when nothing else is shipped."""
+        zip_path = temp_dir / "font.zip"
+        zip_path.write_bytes(_make_zip({"Font-Variable.ttf": FONT_DATA, "OFL.txt": b"l"}))
+
+        fonts = FontExtractor().extract_from_zip(zip_path, temp_dir / "out")
+
+        assert [p.name for p in fonts] == ["Font-Variable.ttf"]
+
+    @pytest.mark.parametrize(
+        ("font_format", "expected"),
+        [
+            ("auto", ["Font/ttf/Font-Bold.ttf", "Font/ttf/Font-Regular.ttf"]),
+            ("otf", ["Font/otf/Font-Bold.otf", "Font/otf/Font-Regular.otf"]),
+            ("variable", ["Font/variable/Font[wght].ttf"]),
+        ],
+    )
+    def test_format_policy_keeps_one_copy_per_face(
+        self, temp_dir, font_format, expected
+    ):
+        """Test that each face is installed once, in the policy's format."""
+        members = dict.fromkeys(
+            (
+                "Font/otf/Font-Regular.otf",
+                "Font/otf/Font-Bold.otf",
+                "Font/unhinted/ttf/Font-Regular.ttf",
+                "Font/ttf/Font-Regular.ttf",
+                "Font/ttf/Font-Bold.ttf",
+                "Font/variable/Font[wght].ttf",
+            ),
+            FONT_DATA,
+        )
+        zip_path = temp_dir / "font.zip"
+        zip_path.write_bytes(_make_zip(members))
+        out = temp_dir / "out"
+
+        fonts = FontExtractor().extract_from_zip(zip_path, out, font_format)
+
+        assert sorted(p.relative_to(out).as_posix() for p in fonts) == expected
+
+    def test_detects_variable_fonts_by_fvar_table(self, temp_dir):
+        """Test that an unlabelled variable build is dropped for statics."""
+        variable = b"\x00\x01\x00\x00\x00\x01" + b"\x00" * 6 + b"fvar" + b"\x00" * 12
+        zip_path = temp_dir / "font.zip"
+        zip_path.write_bytes(
+            _make_zip({"ttf/Font.ttf": variable, "ttf/static/Font-Bold.ttf": FONT_DATA})
+        )
+
+        fonts = FontExtractor().extract_from_zip(zip_path, temp_dir / "out")
+
+        assert [p.name for p in fonts] == ["Font-Bold.ttf"]
+
+
+FAKE_CABEXTRACT = """#!{python}
+import pathlib, sys
+args = sys.argv[1:]
+with open({log!r}, "a") as log:
+    log.write(" ".join(args) + "\\n")
+out = pathlib.Path(args[args.index("-d") + 1])
+out.mkdir(parents=True, exist_ok=True)
+for line in pathlib.Path(args[-1]).read_text().splitlines():
+    name, _, content = line.partition("=")
+    (out / name.lower()).write_text(content.replace(";", "\\n") or "font")
+"""
+
+
+class TestCabExtraction:
+    """Tests for FontExtractor.extract_from_cab (with a stand-in cabextract)."""
+
+    @pytest.fixture
+    def cabextract_log(self, temp_dir, monkeypatch):
+        bin_dir = temp_dir / "bin"
+        bin_dir.mkdir()
+        log = temp_dir / "cabextract.log"
+        script = bin_dir / "cabextract"
+        script.write_text(FAKE_CABEXTRACT.format(python=sys.executable, log=str(log)))
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        return log
+
+    def test_nested_archives_are_filtered_and_separated(self, temp_dir, cabextract_log):
+        """Test nested extraction with filters and one directory per archive."""
+        archive = temp_dir / "PowerPointViewer.exe"
+        archive.write_text("ppviewer.cab=CALIBRI.TTF;CAMBRIA.TTC\nextra.cab=CONSOLA.TTF")
+        out = temp_dir / "out"
+
+        fonts = FontExtractor().extract_from_cab(archive, out)
+
+        assert sorted(p.name for p in fonts) == ["calibri.ttf", "cambria.ttc", "consola.ttf"]
+        assert {p.parent.name for p in fonts} == {"ppviewer.cab.d", "extra.cab.d"}
+        assert not (out / "ppviewer.cab").exists()  # consumed once unpacked
+        calls = cabextract_log.read_text().splitlines()
+        assert len(calls) == 3
+        assert all(f"-F {FontExtractor._cab_filter()}" in call for call in calls)
+
+    def test_in_process_reader_is_the_default(self, temp_dir, cabextract_log):
+        """Test that an installed cabextract is not used for small cabinets."""
+        archive = temp_dir / "fonts.cab"
+        archive.write_bytes(_make_cab({"A.TTF": FONT_DATA}))
+
+        fonts = FontExtractor().extract_from_cab(archive, temp_dir / "out")
+
+        assert [p.read_bytes() for p in fonts] == [FONT_DATA]
+        assert not cabextract_log.exists()
+
+    def test_cabextract_first_for_large_cabinets(
+        self, temp_dir, cabextract_log, monkeypatch
+    ):
+        """Test that large archives go to cabextract before the Python reader."""
+        monkeypatch.setattr(Settings, "CABEXTRACT_MIN_BYTES", 0)
+        monkeypatch.setattr(
+            FontExtractor,
+            "extract_cab_fonts",
+            lambda *args: pytest.fail("in-process reader used"),
+        )
+        archive = temp_dir / "fonts.cab"
+        archive.write_text("CALIBRI.TTF=font")
+
+        fonts = FontExtractor().extract_from_cab(archive, temp_dir / "out")
+
+        assert [p.name for p in fonts] == ["calibri.ttf"]
+
+    def test_large_cabinet_falls_back_to_reader(
+        self, temp_dir, cabextract_log, monkeypatch
+    ):
+        """Test the in-process reader when cabextract yields no fonts."""
+        monkeypatch.setattr(Settings, "CABEXTRACT_MIN_BYTES", 0)
+        archive = temp_dir / "fonts.cab"
+        archive.write_bytes(_make_cab({"A.TTF": FONT_DATA}))
+
+        fonts = FontExtractor().extract_from_cab(archive, temp_dir / "out")
+
+        assert [p.read_bytes() for p in fonts] == [FONT_DATA]
+        assert len(cabextract_log.read_text().splitlines()) == 1
+
+    def test_filter_matches_fonts_and_archives(self):
+        """Test the single cabextract pattern covers the needed suffixes."""
+        pattern = FontExtractor._cab_filter()
+        for name in ("CALIBRI.TTF", "a.ttc", "b.otf", "ppviewer.cab", "x.EXE"):
+            assert fnmatch.fnmatchcase(name, pattern), name
+        assert not fnmatch.fnmatchcase("readme.txt", pattern)
+
+
+def _make_cab(members: dict[str, bytes], method: int = 0) -> bytes:
+    """Build a single-folder cabinet (0 = stored, 1 = MSZIP)."""
+    stream = b"".join(members.values())
+    blocks, history = [], b""
+    for i in range(0, len(stream), 32768):
+        chunk = stream[i : i + 32768]
+        if method == 1:
+            options = {"zdict": history} if history else {}
+            deflate = zlib.compressobj(9, zlib.DEFLATED, -15, **options)
+            packed = b"CK" + deflate.compress(chunk) + deflate.flush()
+            history = (history + chunk)[-32768:]
+        else:
+            packed = chunk
+        blocks.append(struct.pack("<IHH", 0, len(packed), len(chunk)) + packed)
+
+    entries, offset = b"", 0
+    for name, data in members.items():
+        entry = struct.pack("<IIHHHH", len(data), offset, 0, 0, 0, 0x20)
+        entries += entry + name.encode() + b"\0"
+        offset += len(data)
+    files_offset = 36 + 8
+    data_offset = files_offset + len(entries)
+    size = data_offset + sum(map(len, blocks))
+    header = struct.pack(
+        "<4sIIIIIBBHHHHH",
+        *(b"MSCF", 0, size, 0, files_offset, 0, 3, 1, 1, len(members), 0, 0, 0),
+    )
+    folder = struct.pack("<IHH", data_offset, len(blocks), method)
+    return header + folder + entries + b"".join(blocks)
+
+
+# LZX cabinet (64 KiB window, E8 translation, verbatim/uncompressed/aligned
+# blocks over two frames), cross-checked with libarchive's decoder
+LZX_CAB = base64.b64decode(
+    """
+TVNDRgAAAADpDwAAAAAAACwAAAAAAAAAAwEBAAIAAAAAAAAAZQAAAAIAAxBoAQAAAAAAAAAAIQAA
+ACAAcmVhZG1lLnR4dABYmAAAaAEAAAAAIQAAACAARk9OVFNcTFpYLlRURgAAAAAA2A4AgACA4EwD
+EIOpAABRAlZYAAh+AEfEIicpIojIcorfe/d9771Sf4iIIqc5Ihw56+pXnRNuO/FETs5Ol9NRVzYb
+jDGxbGOMjGUbYzE2bIyMsfZvGMvjzt1mACAwAFREYFZFAv9KBDoYn+6Ercq/OYVDfidilN40ETsu
+wf0RgHkAACIAACEZIvGm9D6VxAYz3OD/ufipxpp5+95Lo4KgP+a92n3ffFG/9aBv/f/78A/4qdSU
+9d5eVaV2nucfGmeTjW/PP4Uy5nPZWJN9bjD5vhygdB+O0OhHQzT7nxhNH//UzDYFydKF9/Q2is8x
+bimU5rmmWBnsm4JowHYEQqM3MUQzFzJGw+oyATWHVVOyr8JnIGXFlDm5NSzjNG1g5tX+guYSjidU
+iApR4SucGdC1Jb4l1i1Kt1sXlqGXLzDT1mAGaBATRmgiM4ZoMk/GaD5nA2qoO5Sy4Cul1iJolIxI
+oRpqoYZvqCZR0vaFb9gm26Tah7Wzxwsy4P/FGfJ6gUAD3zDQuGuPGvpH0OSoN9RE0nrUUQOUkg0p
+/Nw7W+Bgo3w4QED/jtANc+sQbzomdSTYXtvTheXiMqmxhzWuh6CFUqghG2rD6qCXKDIdDc+zFcq6
+qfikv69DGQFnN5aTeHAwRvJygA2q6AiS0bCTT+rq8oJvu1ioa0pGaOw9hdH85IygJpg0KaurQmly
+NT6j+W0oRrTeWBnW+4PN60I2f1eSjPuFmeVfYcxEWBgAjf3GQrO/MtGE1wxovH/GmvTTgPt+Pinq
+HzLpySgVSknjrLafB8ZtnzScF5RZOTAsQ1JDDGaMRgzQqH6P0GBzsmnhEpJb5GDN3egAklErlJOu
+yXvKN22Tv7kl+a3S4tNa9w9lYmeyadUS/1uh3OtaT8KujcoEyhtYBmPiwQzKzAGao9MnJdRpB55h
+Uiysf2zZ1GUJZD0VoTAfDNHS92M09UtATf5qlOUfm9NtceNM+b+hRv3jWAN/jjJ3Eg/Yko4fhMs0
+fxhmpncMNNYtA033zQgj/jREmF+N0etHATX+rFI2eoWKcIRslLylZLYKbF6A7uC5m6zCevgkY8Gh
+TCxDjGVRVTKYQzozQLMa7ELwTZdLs3AOtqmTu0I3KZO+yXzfNlnuAd38dk32/L4+Cfgep0xvYluC
+Xw/Kz7cVEvZvfJO9cSi5fjmW0b46mGS07qSTOurEb0qU5Ana/FShhB8aaJyfhhrqXTEN9mxA9b6b
+lMav8en3waHM/chYhtHndpK446GkvYljGYMhBjMKXwVoOFaK0Lm8FaLDmTVGU7obUOtK3STkumKU
+e+sBNXp8UMoerCcZE8ZlHmYMy2A8GZjpOjNAY7ozO8NKXVIy3XbhSSV1qYsTLivbCW/+NlaTcJM7
+yZp7akDg8OMTSo7iHOtYBxOgdAUWtQhsz4Wyklxhmx0tNSBqhCFKUV6ZjQqlod3D4ccnlCgkOtix
+ayfiFkiGKZaDyVA4IQ0rQiFKKK/Yxt7N2qHPu7JsnV+nSGFSAWnjq0oaUhnNWAYToHxiGoN2HoyA
+MqdaWbYuLrykk7rqAlBIxPDjE1MeJWhDwpLDjk8ogcl1vGMeTIBSZ1tZtq5CNomU9gnbqWqsAVwj
+DVFGqYY3K5SHiDCHHZ9QMhLtgMesnYqjBBWesQ0mQCllNdgIQ5RRcPmNxpu1Q56AZNnUgXqYakDH
+8OMTSiyyGdFYBhOgoMIavHYwjidbWbZuLr2kkzrqBA5KxaThISeRYMbQppZLh4efSJId71DHkpiY
+8y0s21ehm2RJfW64quebZS1BIIWENcptviHHKNIUc4XwUJPquOMeSl0iJRzCNi5VaChjSUxOxRXZ
+ACMUUXQJDjlGlAbTK1OEJWggHYw1Z2JZtrJCPA7kMqr4CiVYsiasaQ3wf0bFbUqthNvToSxUV3yb
+uEmbNKSEsQZjjOSmeNxLZgb/ZFTYpqlLDUgdXnyySXjEQi6W2xOhLIRXf5urSW5ytwSEKApwxyHH
+KNI4dYXwkJPuwOItlNtz3SxoCVDcktR5xWwwAcoouwxHHKKMomh0TcmW0MgtSsZleyqUx51whhqf
+UEIlrXmNbTBuiq4Epe6/CtUk3CSRK2kMMkZJqUOaPsNwUxAk8fDikz3VyrJxFbdJm5RJgbmwxAjc
+FHAJCJGU5KBDjlEZvUIpzrs8PPikz7aybF2FmxItoSBVUDUS19TGN5gAhRTimCMOUUaZVDudZKLc
+FSOUBjwrhoeflLIa2FDGkpjg5Ddg7rYnIFkGpAywQjnFMcsQYxRmNpDo1PC5E3HkbOHZnrlkkrrq
+9BNMKKkBIiiKREbgppZLR4iiSJIdd4zJ6BVKceZv4dmeCmUku+rbdFOwJQakG6pYchPfFAccoITS
+SnXcIccojIq7k4hShMaF0tBprvDGJ5TIRDfBsQ4mO0G4kYnBBiihQHIZVYhiFM2sQ6xaw+VOe7qS
+Zerq40swqaRuUsJWA2EMMkBoZacjlurgJqlLDUgdYYiySnhjMUpGq1D2hNvKTcKkvybXS+hIc1QN
+BDjHsQ4mQHHFOu4IQpStwFEEm5ItoSAdjDVNalUoHnoyG258Q8lLhqIcEbRKRoRudLHVgCSDClCE
+cgpnpCHFKKVp1wrQoqRHboquBNvzoSzkV6SahZsGpBirYNKUyjQDeFMRJPEIQpQ91cqycRW3SZuU
+SYG5sII3JFxyKGNJTKByHXeAEYoo5bWFftI51dcYUBqqrRsefMIJcZhDHUubMizBGKIKKp4BRiii
+lLIabIwmTcThAvZleyqUQAr4apLDOIYylsHEKJuIBvCmyEtFiHuylGXmKm+TN0mTBDhoxfjeFHIJ
+odAl0smOdzAByijmvUWh1GRX+51IYWMNcxu+SeFxJ8U0xzqUsaQk3Er1NBgAJZTTuCIboowijW4F
+J/TEeGhJYpDxDCUsuRNVWQUrQD0Jnm5l2boK26RN4qTBJdw1IGN48QkpkxK8Ieq2Qx5LYBIoscIF
+ZXsqlJPw6W/4TbklBqSOsaUB4wrhoSfOWMc7lLGkTmCN9g3GQEnKK7MRhiij7DMcDTf0ymbFS/BI
+F14NIhlTfIaSlnCENFrBglYAGIgKhgEAADMQAAAQBAAAxv//Z2x5cGgwMDboQNb//2dseXBoMDA3
+6EDm//9nbHlwaDAwOOhA9v//Z2x5cGgwMDnoAKAAAGdseXBoMDEw6ACwAABnbHlwaDAxMegAwAAA
+Z2x5cGgwMTLoANAAAGdseXBoMDEz6ADgAABnbHlwaDAxNOgA8AAAZ2x5cGgwMTXoGDsAAGdseXBo
+MDE26CVLAABnbHlwaDAxN+gyWwAAZ2x5cGgwMTjoP2sAAGdseXBoMDE56Ex7AABnbHlwaDAyMOhZ
+iwAAZ2x5cGgwMjHoQMb//2dseXBoMDIy6EDW//9nbHlwaDAyM+hA5v//Z2x5cGgwMjToQPb//2ds
+eXBoMDI16ACgAABnbHlwaDAyNugAsAAAZ2x5cGgwMjfoAMAAAGdseXBoMDI46ADQAABnbHlwaDAy
+OegA4AAAZ2x5cGgwMzDoAPAAAGdseXBoMDMx6AALQPq61JDoxAAAagrsYICkpBy4rJLokpJp40ra
+S0qnhe9r/72+//r50tJHV500nUynrn+n+zaSRTk32mt66S3nFjUO4gWLAzIMRmQijgIMi9FBw2AW
+HY8ONKDBYIjhwiFgNEYARmBQBVQloreikR8j3Ocxu1QPiJ1gRDciGVwe2G0n+uGfOCDOAAAYAJoh
+AapmGCt9RfruU7Edj+bzGFlF8BhZ+7IMav7ld7rUWtlUF2CXcJejl8fxhP4A3TRr6r5Cq0f8vzSd
+Sn7pMtX6y8ipsn7/R9cEawAvwaeKvjyean0ZPFXzUs1Uvi/vqOZAtZe9U3YvWaYVfPI71PJL8Kjk
+knVl61xoBvBSvOr1l2bSsFn2L82jbhP0y4hJL0KrEuuS7JLuoPU/DTdB0oys/NCSVr9Lc6n3l95T
+970srTv2k2MTEjzq+ctzqeuX4VPbL8Wmwn5pSHaE/crSAAQIgv0gzATJJneyK1v3Qg0gIFDoBysm
+la11oXbJea+BeusCaGU4XlQDAQgJ+k7ALcn4CzWAgEDWFdDKQr3CfoBtQDUQgAVBj2RN2AZQEKgI
+AoMgnXUgiNCK8b0/NjFBbN0LrUu2LykBJASqgwAS9HZCaElLXZKtkuoS7H/un/fYz9BNqAYCECEI
+fsg8+5/vmrAN4CBQEASQQ2T92I8QTagGAhCtCMoLDzkE3UE/XTKtbJ4L1QAAAg5B9UM/kjhhGsBA
+oOW9deW0ssku6S4IK4T9AN+BaiAADYKMjQRBbBBiaSIIL7Q+lGYCCBQEAWwQvWLp5XeyK1v1QnhJ
+DeACPhRwAQgVBC/vAj6AbUA1EIAGQabGgiBCK0P6JuBAcRCABkE7xl7eJ5uydS+0ASQEqvgAIQlO
+Npf3QZC6sdQANtmTTY1hbGImm6HVg3lDYxAoCAL4IJIJl/cQqD0wUJ6QBvBBiBPvnSAvIYfo+6/z
+wD/gm1ANBCDkEFk//COyCdUAAAIVQXShIX4T8AFMBKqCAIccJOuBf0AzoBrAQHn2bDI/5CNZCfz3
+iqiXAhADC+fZTsgGEBCoCAJ2NgSxNxGYmgiCczZgsTx7NplCPr1j6uUABD2wUJ6fBiQhySb84MCy
+efYT8gF0BKqCAEeyJvADuAhUBAE6G7AYWX5sMoR8e8nUyxAIkAbyQYgT1p3Qyti6LT+BQOyB5PP4
+JlQDAQhkBeCPkE2oBgIQNgixdPxgZLL52JgJIFArBOMbH/+YwLauhVYl18HaavmyxvBHCCdUAwEI
+xgpHsibwA9gIVAoBssbwR6gmVAMYCCw/WJkE3UI+gGdANRCAY23ZuhdalmwfXH2WlASqAQAEea/0
+eXQTqgEABGuDF1v4STH9E/SgQAhAsjZsXQutAJ4C1X0A4gR7J8jLtzYawCabW8P6BMdPAOro05Em
+TTazhrIJNWz3iqiXAhCuDQYQyabWsD7R8ZNj/T98++0J/QCqAtWsACRroX/AM6AaFUBkjfSPOyZe
+3kCgjRU46An6AygIVLECkayE/gDdgWqbAGzdt0GIocA2AAAAAJwAwBl7ydPLNIDi24HF8+wm7AP4
+CFRIFoT+ANmBajYAsfTeBiBmxdvyg8DTefbCt9QAkezbvWoAN2xNqPOGsIk83pYfQKD96ed/hP8B
+lMaqv/c+6W7CNYDWWP5I14RqALqxfQjRhGoArLH9kZMJ5Qcaqx/JnNANYN4cbA40B5mDzIG8V3O8
+G4NYm9Tc5sY3doMxY5Jzc5ob3NjT0f/78Mc=
+"""
+)
+LZX_README = b"LZX test cabinet\r\n" * 20
+LZX_FONT = b"".join(
+    b"\xe8" + ((i % 16) * 4096).to_bytes(4, "little") + b"glyph%03d" % (i % 40)
+    for i in range(3000)
+)
+
+
+class TestCabinet:
+    """Tests for the in-process cabinet reader."""
+
+    @pytest.mark.parametrize("method", [0, 1])
+    def test_reads_stored_and_mszip_folders(self, method):
+        """Test listing and decompressing members across data blocks."""
+        members = {
+            "FONTS\\A.TTF": FONT_DATA * 3,
+            "readme.txt": b"r" * 40000,
+            "B.OTF": b"b",
+        }
+        cab = Cabinet.locate(io.BytesIO(_make_cab(members, method)))
+
+        assert [m.name for m in cab.members] == list(members)
+        extracted = {m.name: data for m, data in cab.extract(cab.members)}
+        assert extracted == members
+
+    @pytest.mark.parametrize("method", [0, 1])
+    def test_extract_files_writes_blocks_to_disk(self, temp_dir, method):
+        """Test streaming members that span data blocks straight into files."""
+        members = {"big.cab": bytes(range(256)) * 300, "A.TTF": FONT_DATA, "E": b""}
+        cab = Cabinet.locate(io.BytesIO(_make_cab(members, method)))
+
+        written = dict(
+            cab.extract_files(cab.members, lambda m: temp_dir / m.name.lower())
+        )
+
+        assert {m.name: path.read_bytes() for m, path in written.items()} == members
+
+    def test_reads_lzx_folder(self):
+        """Test LZX decoding, including E8 call translation."""
+        cab = Cabinet.locate(io.BytesIO(LZX_CAB))
+
+        extracted = {m.name: data for m, data in cab.extract(cab.members)}
+
+        assert extracted == {"readme.txt": LZX_README, "FONTS\\LZX.TTF": LZX_FONT}
+
+    def test_finds_cabinet_inside_executable(self):
+        """Test that a cabinet after a PE stub (and a false match) is found."""
+        stub = b"MZ" + b"\0" * 5000 + b"MSCF not a header" + b"\0" * 100
+        cab = Cabinet.locate(io.BytesIO(stub + _make_cab({"A.TTF": FONT_DATA})))
+
+        assert [(m.name, data) for m, data in cab.extract(cab.members)] == [
+            ("A.TTF", FONT_DATA)
+        ]
+
+    def test_no_cabinet(self):
+        """Test that files without a cabinet are reported as such."""
+        assert Cabinet.locate(io.BytesIO(b"MZ" + b"\0" * 100)) is None
+
+    def test_unsupported_compression(self):
+        """Test that Quantum folders raise ExtractionError."""
+        data = bytearray(_make_cab({"A.TTF": FONT_DATA}))
+        struct.pack_into("<H", data, 36 + 6, 2)
+        cab = Cabinet.locate(io.BytesIO(bytes(data)))
+
+        with pytest.raises(ExtractionError):
+            list(cab.extract(cab.members))
+
+    def test_extracts_fonts_from_nested_cabinet(self, temp_dir, monkeypatch):
+        """Test in-process extraction of a cabinet inside an executable."""
+        monkeypatch.setenv("PATH", str(temp_dir))  # no cabextract
+        inner = _make_cab({"CALIBRI.TTF": FONT_DATA, "EULA.TXT": b"eula"}, method=1)
+        archive = temp_dir / "PowerPointViewer.exe"
+        archive.write_bytes(b"MZ" + b"\0" * 300 + _make_cab({"ppviewer.cab": inner}))
+        out = temp_dir / "out"
+
+        fonts = FontExtractor().extract_from_cab(archive, out)
+
+        assert fonts == [out / "ppviewer.cab.d" / "calibri.ttf"]
+        assert fonts[0].read_bytes() == FONT_DATA
+        assert not (out / "ppviewer.cab").exists()
+        assert not (out / "ppviewer.cab.d" / "eula.txt").exists()
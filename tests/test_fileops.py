@@ -0,0 +1,72 @@
+"""Tests for install file placement."""
+
+import errno
+import os
+
+import pytest
+
+from font_installer.core import fileops
+from font_installer.core.fileops import place_file
+
+
+def _fail(*args):
+    raise OSError(errno.EXDEV, "cross-device")
+
+
+class TestPlaceFile:
+    """Tests for fileops.place_file."""
+
+    def test_move_renames(self, temp_dir):
+        """Test that a consumable source is renamed into place."""
+        src = temp_dir / "a.ttf"
+        src.write_bytes(b"font")
+
+        assert place_file(src, temp_dir / "b.ttf", move=True) == fileops.RENAME
+        assert not src.exists()
+        assert (temp_dir / "b.ttf").read_bytes() == b"font"
+
+    def test_copy_prefers_hardlink(self, temp_dir):
+        """Test that a kept source is linked rather than copied."""
+        src = temp_dir / "a.ttf"
+        src.write_bytes(b"font")
+        (temp_dir / "b.ttf").write_bytes(b"old")
+
+        assert place_file(src, temp_dir / "b.ttf") == fileops.HARDLINK
+        assert os.path.samefile(src, temp_dir / "b.ttf")
+
+    def test_cross_device_falls_back_to_copy(self, temp_dir, monkeypatch):
+        """Test the data-copying strategies when rename and links fail."""
+        src = temp_dir / "a.ttf"
+        src.write_bytes(b"x" * 100_000)
+
+        real_replace = os.replace
+
+        def replace(a, b):
+            if a == src:
+                _fail()
+            real_replace(a, b)
+
+        monkeypatch.setattr(fileops.os, "replace", replace)
+        monkeypatch.setattr(fileops.os, "link", _fail)
+
+        strategy = place_file(src, temp_dir / "b.ttf", move=True)
+
+        assert strategy in (fileops.REFLINK, fileops.COPY_FILE_RANGE, fileops.COPY)
+        assert (temp_dir / "b.ttf").read_bytes() == b"x" * 100_000
+        assert [p.name for p in temp_dir.iterdir() if p.name.endswith(".tmp")] == []
+
+    def test_plain_copy_when_kernel_copies_fail(self, temp_dir, monkeypatch):
+        """Test the final userspace copy."""
+        src = temp_dir / "a.ttf"
+        src.write_bytes(b"font")
+        monkeypatch.setattr(fileops.os, "link", _fail)
+        monkeypatch.setattr(fileops.fcntl, "ioctl", _fail)
+        monkeypatch.delattr(fileops.os, "copy_file_range", raising=False)
+
+        assert place_file(src, temp_dir / "b.ttf") == fileops.COPY
+        assert (temp_dir / "b.ttf").read_bytes() == b"font"
+
+    def test_other_rename_errors_propagate(self, temp_dir):
+        """Test that errors other than EXDEV are not swallowed."""
+        with pytest.raises(OSError):
+            place_file(temp_dir / "missing.ttf", temp_dir / "b.ttf", move=True)
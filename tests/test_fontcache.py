@@ -0,0 +1,85 @@
+"""Tests for the background font cache refresh."""
+
+import fcntl
+import os
+import time
+
+from font_installer.core.fontcache import FontCacheRefresher
+
+
+class _FakeRunner:
+    def poll(self):
+        return None
+
+
+class TestFontCacheRefresher:
+    """Tests for FontCacheRefresher."""
+
+    def _dirs(self, temp_dir, *names):
+        paths = [temp_dir / name for name in names]
+        for path in paths:
+            path.mkdir(parents=True, exist_ok=True)
+        return paths
+
+    def test_requests_coalesce_while_runner_active(self, temp_dir, monkeypatch):
+        """Test that requests during a refresh are merged into one fc-cache run."""
+        refresher = FontCacheRefresher(temp_dir / "state")
+        runs, spawns = [], []
+        monkeypatch.setattr(refresher, "_run_fc_cache", lambda dirs: runs.append(dirs) or True)
+        monkeypatch.setattr(refresher, "_spawn_runner", lambda: spawns.append(1))
+        dev, ms = self._dirs(temp_dir, "fonts/dev", "fonts/microsoft")
+
+        # Another process is refreshing: requests only enqueue
+        (temp_dir / "state").mkdir()
+        with open(refresher.lock_path, "a") as other:
+            fcntl.flock(other, fcntl.LOCK_EX)
+            assert refresher.request([dev])
+            assert refresher.request([ms, dev])
+            assert refresher.run_pending() is True  # lock busy, nothing run
+            fcntl.flock(other, fcntl.LOCK_UN)
+
+        assert spawns == []
+        assert refresher.run_pending()
+        assert runs == [[str(dev), str(ms)]]
+        assert refresher.run_pending()
+        assert len(runs) == 1
+
+    def test_respawns_when_runner_released_lock(self, temp_dir, monkeypatch):
+        """Test that entries queued after the runner's last check still run."""
+        refresher = FontCacheRefresher(temp_dir / "state")
+        spawns = []
+        monkeypatch.setattr(refresher, "_spawn_runner", lambda: spawns.append(1) or _FakeRunner())
+        (dev,) = self._dirs(temp_dir, "dev")
+
+        # The first runner is still alive but holds no lock: it may be exiting
+        refresher.request([dev])
+        refresher.request([dev])
+
+        assert spawns == [1, 1]
+
+    def test_collapse_drops_nested_and_missing(self, temp_dir):
+        """Test that nested directories are covered by their parent."""
+        base, dev = self._dirs(temp_dir, "fonts", "fonts/dev")
+
+        collapsed = FontCacheRefresher._collapse([str(dev), str(base), str(dev), "/nope"])
+
+        assert collapsed == [str(base)]
+
+    def test_detached_runner_runs_fc_cache(self, temp_dir, monkeypatch):
+        """Test the background process end to end with a stand-in fc-cache."""
+        bin_dir = temp_dir / "bin"
+        bin_dir.mkdir()
+        log = temp_dir / "fc-cache.log"
+        script = bin_dir / "fc-cache"
+        script.write_text(f'#!/bin/sh\necho "$@" >> "{log}"\n')
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        (dev,) = self._dirs(temp_dir, "dev")
+
+        refresher = FontCacheRefresher(temp_dir / "state")
+        assert refresher.request([dev])
+
+        deadline = time.monotonic() + 10
+        while not log.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert log.read_text().split() == [str(dev)]
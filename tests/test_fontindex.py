@@ -0,0 +1,164 @@
+"""Tests for the SFNT font index."""
+
+import struct
+
+import pytest
+
+from font_installer.core import fontindex
+from font_installer.core.fontindex import FontIndex, read_faces
+from font_installer.utils.system import FontDirectoryScanner, SystemChecker
+
+
+def _name_table(names: dict[int, str], mac: dict[int, str] | None = None) -> bytes:
+    records, strings = [], b""
+    entries = [(3, 1, 0x409, i, s.encode("utf-16-be")) for i, s in names.items()]
+    entries += [(1, 0, 0, i, s.encode("mac_roman")) for i, s in (mac or {}).items()]
+    for platform, encoding, language, name_id, raw in entries:
+        records.append(
+            struct.pack(
+                ">HHHHHH", platform, encoding, language, name_id, len(raw), len(strings)
+            )
+        )
+        strings += raw
+    header = struct.pack(">HHH", 0, len(records), 6 + 12 * len(records))
+    return header + b"".join(records) + strings
+
+
+def make_font(
+    family: str,
+    style: str = "Regular",
+    weight: int = 400,
+    version: str = "Version 1.000",
+    sfnt: bytes = b"\x00\x01\x00\x00",
+    variable: bool = False,
+    base: int = 0,
+    name_table: bytes | None = None,
+) -> bytes:
+    """Build a minimal SFNT with name and OS/2 (and optionally fvar) tables."""
+    tables = {
+        b"OS/2": struct.pack(">HhH", 4, 500, weight) + b"\x00" * 90,
+        b"name": name_table or _name_table({1: family, 2: style, 5: version}),
+    }
+    if variable:
+        tables[b"fvar"] = b"\x00" * 16
+    offset = base + 12 + 16 * len(tables)
+    directory, body = b"", b""
+    for tag, data in sorted(tables.items()):
+        directory += struct.pack(">4sIII", tag, 0, offset + len(body), len(data))
+        body += data + b"\x00" * (-len(data) % 4)
+    return sfnt + struct.pack(">HHHH", len(tables), 0, 0, 0) + directory + body
+
+
+class TestReadFaces:
+    """Tests for read_faces."""
+
+    def test_reads_names_weight_and_format(self, temp_dir):
+        """Test the fields taken from the name and OS/2 tables."""
+        path = temp_dir / "Mono-Bold.otf"
+        path.write_bytes(
+            make_font("Mono", "Bold", 700, "Version 2.304; ttfautohint", b"OTTO")
+        )
+
+        (face,) = read_faces(path)
+
+        assert (face.family, face.style, face.weight) == ("Mono", "Bold", 700)
+        assert face.version == "2.304"
+        assert face.font_format == "otf"
+
+    def test_variable_font(self, temp_dir):
+        """Test that fonts with an fvar table are reported as variable."""
+        path = temp_dir / "Mono.ttf"
+        path.write_bytes(make_font("Mono", variable=True))
+
+        assert read_faces(path)[0].font_format == "variable"
+
+    def test_collection(self, temp_dir):
+        """Test that every face of a .ttc collection is read."""
+        first = make_font("Cambria", base=20)
+        second = make_font("Cambria Math", base=20 + len(first))
+        header = b"ttcf" + struct.pack(">HHI", 1, 0, 2)
+        header += struct.pack(">II", 20, 20 + len(first))
+        path = temp_dir / "cambria.ttc"
+        path.write_bytes(header + first + second)
+
+        faces = read_faces(path)
+
+        assert [(f.family, f.index) for f in faces] == [
+            ("Cambria", 0),
+            ("Cambria Math", 1),
+        ]
+
+    def test_prefers_windows_english_names(self, temp_dir):
+        """Test that Windows records win, with Macintosh ones as fallback."""
+        table = _name_table({1: "Windows Name"}, mac={1: "Mac Name", 2: "Italic"})
+        path = temp_dir / "f.ttf"
+        path.write_bytes(make_font("", name_table=table))
+
+        (face,) = read_faces(path)
+
+        assert (face.family, face.style) == ("Windows Name", "Italic")
+
+    @pytest.mark.parametrize(
+        "data", [b"", b"not a font at all", b"\x00\x01\x00\x00\x00\x05"]
+    )
+    def test_rejects_non_fonts(self, temp_dir, data):
+        """Test that unreadable files raise ValueError."""
+        path = temp_dir / "bad.ttf"
+        path.write_bytes(data)
+
+        with pytest.raises(ValueError):
+            read_faces(path)
+
+
+class TestFontIndex:
+    """Tests for FontIndex."""
+
+    def test_only_changed_files_are_parsed(self, temp_dir, monkeypatch):
+        """Test that the mtime/size cache skips unchanged files."""
+        fonts = temp_dir / "fonts"
+        (fonts / "sub").mkdir(parents=True)
+        (fonts / "A-Regular.ttf").write_bytes(make_font("A"))
+        (fonts / "sub" / "B-Bold.ttf").write_bytes(make_font("B", "Bold", 700))
+        parsed = []
+        real_read_faces = fontindex.read_faces
+
+        def counting_read_faces(path):
+            parsed.append(path.name)
+            return real_read_faces(path)
+
+        monkeypatch.setattr(fontindex, "read_faces", counting_read_faces)
+        index = FontIndex(temp_dir / "cache")
+
+        assert [f.family for f in index.scan([fonts])] == ["A", "B"]
+        (fonts / "A-Regular.ttf").write_bytes(make_font("A", version="Version 2.0"))
+        faces = FontIndex(temp_dir / "cache").scan([fonts])
+
+        assert parsed == ["A-Regular.ttf", "B-Bold.ttf", "A-Regular.ttf"]
+        assert faces[0].version == "2.0"
+
+    def test_groups_by_family(self, temp_dir):
+        """Test grouping faces by family, ordered by weight."""
+        fonts = temp_dir / "fonts"
+        fonts.mkdir()
+        (fonts / "M-Bold.ttf").write_bytes(make_font("Mono", "Bold", 700))
+        (fonts / "M-Regular.ttf").write_bytes(make_font("Mono", "Regular", 400))
+        (fonts / "broken.ttf").write_bytes(b"junk")
+
+        families = FontIndex(temp_dir / "cache").families([fonts])
+
+        assert list(families) == ["Mono"]
+        assert [f.style for f in families["Mono"]] == ["Regular", "Bold"]
+
+    def test_default_scan_uses_shared_snapshot(self, temp_dir, monkeypatch):
+        """Test that the default directories come from SystemChecker's scanner."""
+        fonts = temp_dir / "fonts"
+        fonts.mkdir()
+        (fonts / "A-Regular.ttf").write_bytes(make_font("A"))
+        scanner = FontDirectoryScanner({"dev": fonts})
+        monkeypatch.setattr(SystemChecker, "_scanner", scanner)
+        index = FontIndex(temp_dir / "cache")
+
+        assert [f.family for f in index.scan()] == ["A"]
+        snapshot = scanner.snapshot()
+        assert [f.family for f in index.scan()] == ["A"]
+        assert scanner.snapshot() is snapshot
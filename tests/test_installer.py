@@ -1,11 +1,29 @@
 """Tests for the font installer module."""
 
+import io
+import json
+import threading
+import time
+import zipfile
+from dataclasses import replace
+
 import pytest
 
 from font_installer.config.fonts import CLEARTYPE_FONTS, DEV_FONTS, FontCategory
 from font_installer.config.settings import Settings
 from font_installer.core.exceptions import DependencyError, DownloadError
-from font_installer.core.installer import FontInstaller
+from font_installer.core.fontcache import FontCacheRefresher
+from font_installer.core.installer import (
+    CLEARTYPE_KEY,
+    CORE_KEY,
+    FontInstaller,
+    InstallResult,
+    InstallSummary,
+)
+from font_installer.core.lockfile import Lockfile
+from font_installer.core.manifest import InstallManifest, InstallRecord
+from font_installer.core.steps import FontPlacer, github_source
+from font_installer.utils.system import SystemChecker
 
 
 class TestSettings:
@@ -24,9 +42,10 @@ class TestSettings:
         assert ".ttc" in Settings.FONT_EXTENSIONS
 
     def test_required_tools(self):
-        """Test that required tools are defined."""
-        assert "cabextract" in Settings.REQUIRED_TOOLS
+        """Test that required tools are defined; cabextract is optional."""
         assert "fc-cache" in Settings.REQUIRED_TOOLS
+        assert "cabextract" not in Settings.REQUIRED_TOOLS
+        assert "cabextract" in Settings.OPTIONAL_TOOLS
 
 
 class TestFontDefinitions:
@@ -51,6 +70,14 @@ class TestFontDefinitions:
             assert font.repo is not None
             assert "/" in font.repo  # Format: owner/repo
 
+    def test_github_source_requires_repo_and_pattern(self):
+        """Test that fonts without a GitHub release are rejected."""
+        font = DEV_FONTS["firacode"]
+        assert github_source(font) == (font.repo, font.asset_pattern)
+
+        with pytest.raises(DownloadError):
+            github_source(replace(font, asset_pattern=None))
+
 
 class TestFontInstaller:
     """Tests for FontInstaller class."""
@@ -78,6 +105,195 @@ class TestFontInstaller:
         installer = FontInstaller(progress_callback=callback)
         assert installer is not None
 
+    def test_update_font_cache_empty_list_refreshes_nothing(self, monkeypatch):
+        """Test that only None means the whole fonts directory."""
+        requested = []
+        monkeypatch.setattr(
+            FontCacheRefresher,
+            "request",
+            lambda self, directories, wait=False: requested.append(directories) or True,
+        )
+
+        assert FontInstaller.update_font_cache([])
+        assert FontInstaller.update_font_cache()
+        assert requested == [[], [Settings.FONTS_BASE_DIR]]
+
+
+class TestInstallMany:
+    """Tests for FontInstaller.install_many."""
+
+    def test_runs_installs_concurrently(self, monkeypatch):
+        """Test that installs overlap instead of running back to back."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_install(self, key):
+            barrier.wait()
+            return InstallResult(True, key, 1, "ok")
+
+        monkeypatch.setattr(FontInstaller, "install_font", fake_install)
+        installer = FontInstaller()
+
+        results = list(installer.install_many([CLEARTYPE_KEY, "hack", "firacode"], jobs=3))
+
+        assert sorted(r.font_name for r in results) == ["cleartype", "firacode", "hack"]
+        assert all(r.success for r in results)
+
+    def test_yields_in_completion_order(self, monkeypatch):
+        """Test that results are yielded as soon as each install finishes."""
+        delays = {"slow": 0.3, "fast": 0.0}
+
+        def fake_install(self, key):
+            time.sleep(delays[key])
+            return InstallResult(True, key, 1, "ok")
+
+        monkeypatch.setattr(FontInstaller, "install_font", fake_install)
+        installer = FontInstaller()
+
+        names = [r.font_name for r in installer.install_many(["slow", "fast"], jobs=2)]
+        assert names == ["fast", "slow"]
+
+    def test_unknown_key_fails_without_raising(self):
+        """Test that an unknown key yields a failed result."""
+        installer = FontInstaller()
+        results = list(installer.install_many(["nao-existe"]))
+        assert len(results) == 1
+        assert results[0].success is False
+
+    def test_progress_reports_are_serialized(self, monkeypatch):
+        """Test that the shared progress callback is never re-entered."""
+        active = 0
+        overlaps = []
+        latest = {}
+
+        def callback(progress):
+            nonlocal active
+            active += 1
+            overlaps.append(active)
+            latest[progress.name] = progress.percent
+            time.sleep(0.001)
+            active -= 1
+
+        def fake_install(self, key):
+            for percent in range(20):
+                self._report(key, percent, "testando")
+            return InstallResult(True, key, 0, "ok")
+
+        monkeypatch.setattr(FontInstaller, "install_font", fake_install)
+        installer = FontInstaller(progress_callback=callback)
+        list(installer.install_many(["a", "b", "c", "d"], jobs=4))
+
+        assert max(overlaps) == 1
+        assert latest == {"a": 19, "b": 19, "c": 19, "d": 19}
+
+    def test_results_carry_key_time_and_bytes(self, monkeypatch):
+        """Test that each result reports its own key, timing and download size."""
+        sizes = {"hack": 1000, "firacode": 0}
+
+        def fake_dev(self, key):
+            time.sleep(0.01)
+            self._count_download(sizes[key])
+            return InstallResult(True, key.title(), 1, "ok")
+
+        monkeypatch.setattr(FontInstaller, "install_dev_font", fake_dev)
+        monkeypatch.setattr(
+            FontInstaller,
+            "install_core_fonts",
+            staticmethod(lambda: InstallResult(True, "Core Fonts", 1, "ok")),
+        )
+        installer = FontInstaller()
+
+        results = {
+            r.key: r for r in installer.install_many(["hack", "firacode", CORE_KEY])
+        }
+
+        assert results["hack"].bytes_downloaded == 1000
+        assert results["firacode"].bytes_downloaded == 0
+        assert results["hack"].elapsed >= 0.01
+        assert results[CORE_KEY].font_name == "Core Fonts"
+
+
+class TestIncrementalInstall:
+    """Tests for skipping fonts that are already installed."""
+
+    @staticmethod
+    def _stage(directory, files):
+        directory.mkdir(exist_ok=True)
+        paths = []
+        for name, data in files.items():
+            (directory / name).write_bytes(data)
+            paths.append(directory / name)
+        return paths
+
+    def test_reinstall_writes_nothing(self, temp_dir):
+        """Test that identical fonts are counted as unchanged and not rewritten."""
+        placer = FontPlacer()
+        target = temp_dir / "fonts"
+        files = {"A.ttf": b"aaaa", "B.ttf": b"bbbb"}
+
+        first = placer.install_fonts_to_dir(self._stage(temp_dir / "s1", files), target)
+        mtimes = {p.name: p.stat().st_mtime_ns for p in target.iterdir()}
+        dir_mtime = target.stat().st_mtime_ns
+        second = placer.install_fonts_to_dir(self._stage(temp_dir / "s2", files), target)
+
+        assert (first.new, first.updated, first.unchanged) == (2, 0, 0)
+        assert (second.new, second.updated, second.unchanged) == (0, 0, 2)
+        assert second.strategies == set()
+        assert {p.name: p.stat().st_mtime_ns for p in target.iterdir()} == mtimes
+        assert target.stat().st_mtime_ns == dir_mtime
+
+    def test_changed_font_is_updated(self, temp_dir):
+        """Test that a font with new content replaces the installed one."""
+        placer = FontPlacer()
+        target = temp_dir / "fonts"
+        placer.install_fonts_to_dir(self._stage(temp_dir / "s1", {"A.ttf": b"v1"}), target)
+
+        summary = placer.install_fonts_to_dir(
+            self._stage(temp_dir / "s2", {"A.ttf": b"v2", "C.ttf": b"c"}), target
+        )
+
+        assert (summary.new, summary.updated, summary.unchanged) == (1, 1, 0)
+        assert (target / "a.ttf").read_bytes() == b"v2"
+
+    def test_new_fonts_invalidate_font_listings(self, temp_dir, monkeypatch):
+        """Test that only installs that write files drop cached listings."""
+        changes = []
+        monkeypatch.setattr(SystemChecker, "fonts_changed", lambda: changes.append(1))
+        placer = FontPlacer()
+        target = temp_dir / "fonts"
+
+        placer.install_fonts_to_dir(self._stage(temp_dir / "s1", {"A.ttf": b"a"}), target)
+        placer.install_fonts_to_dir(self._stage(temp_dir / "s2", {"A.ttf": b"a"}), target)
+
+        assert changes == [1]
+
+    def test_font_cache_refresh_targets_changed_dirs(self, temp_dir):
+        """Test that only directories with written files are refreshed."""
+        requests = []
+
+        class Recorder(FontCacheRefresher):
+            def request(self, directories, wait=False):
+                requests.append(list(directories))
+                return True
+
+        installer = FontInstaller(font_cache=Recorder(temp_dir))
+        placer = installer._placer
+        target = temp_dir / "fonts"
+        placer.install_fonts_to_dir(self._stage(temp_dir / "s1", {"A.ttf": b"a"}), target)
+        installer.refresh_font_cache()
+        placer.install_fonts_to_dir(self._stage(temp_dir / "s2", {"A.ttf": b"a"}), target)
+        installer.refresh_font_cache()
+
+        assert requests == [[target], []]
+
+    def test_result_reports_counts(self):
+        """Test the breakdown in InstallResult."""
+        summary = InstallSummary(new=1, updated=2, unchanged=3, strategies={"rename"})
+        result = FontInstaller._install_result("X", "arquivos instalados", summary)
+
+        assert result.files_installed == 6
+        assert (result.files_new, result.files_updated, result.files_unchanged) == (1, 2, 3)
+        assert "3 inalterados" in result.message
+
 
 class TestExceptions:
     """Tests for custom exceptions."""
@@ -95,3 +311,165 @@ class TestExceptions:
         assert "cabextract" in str(error)
         assert "fc-cache" in str(error)
         assert len(error.missing_tools) == 2
+
+
+class TestCheckUpdates:
+    """Tests for FontInstaller.check_updates."""
+
+    @staticmethod
+    def _release(tag, asset_id):
+        return {
+            "tag_name": tag,
+            "assets": [
+                {
+                    "name": f"Hack-{tag}-ttf.zip",
+                    "browser_download_url": f"http://x/{tag}.zip",
+                    "size": 1,
+                    "id": asset_id,
+                }
+            ],
+        }
+
+    def test_only_changed_releases_are_outdated(self, http_server, temp_dir, monkeypatch):
+        """Test comparing installed assets with the latest releases."""
+        monkeypatch.setattr(Settings, "GITHUB_API_BASE", http_server.url("/repos"))
+        monkeypatch.setattr(Settings, "CACHE_DIR", temp_dir / "cache")
+        http_server.add(
+            "/repos/source-foundry/Hack/releases/latest",
+            json.dumps(self._release("v3", 10)).encode(),
+        )
+        http_server.add(
+            f"/repos/{DEV_FONTS['firacode'].repo}/releases/latest",
+            json.dumps(self._release("6.2", 21)).encode(),
+        )
+        manifest = InstallManifest(temp_dir / "m.sqlite3")
+        for key, version, asset_id in [("hack", "v3", 10), ("firacode", "6.1", 20)]:
+            manifest.record_install(
+                InstallRecord(key, key, "developer", temp_dir, version, asset_id=asset_id)
+            )
+        manifest.record_install(InstallRecord(CLEARTYPE_KEY, "ClearType", "cleartype", temp_dir))
+
+        checks = FontInstaller(manifest=manifest).check_updates()
+
+        assert [(c.key, c.outdated, c.latest_version) for c in checks] == [
+            ("firacode", True, "6.2"),
+            ("hack", False, "v3"),
+        ]
+
+    def test_nothing_installed(self, temp_dir):
+        """Test that no lookups happen without installed dev fonts."""
+        manifest = InstallManifest(temp_dir / "m.sqlite3")
+        assert FontInstaller(manifest=manifest).check_updates() == []
+
+
+class TestLockedInstall:
+    """Tests for lock_font() and installs from a lockfile."""
+
+    @staticmethod
+    def _zip(files):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            for name, data in files.items():
+                zf.writestr(name, data)
+        return buffer.getvalue()
+
+    @pytest.fixture
+    def release(self, http_server, temp_dir, monkeypatch):
+        """Serve a Hack release whose asset holds two fonts and a README."""
+        monkeypatch.setattr(Settings, "GITHUB_API_BASE", http_server.url("/repos"))
+        monkeypatch.setattr(Settings, "CACHE_DIR", temp_dir / "cache")
+        monkeypatch.setattr(Settings, "STAGING_DIR", temp_dir / "staging")
+        monkeypatch.setattr(Settings, "DEV_FONTS_DIR", temp_dir / "dev")
+        body = self._zip(
+            {
+                "ttf/Hack-Regular.ttf": b"regular",
+                "ttf/Hack-Bold.ttf": b"bold",
+                "README.md": b"readme",
+            }
+        )
+        url = http_server.add("/dl/Hack-v3-ttf.zip", body)
+        asset = {
+            "name": "Hack-v3-ttf.zip",
+            "browser_download_url": url,
+            "size": len(body),
+            "id": 7,
+        }
+        http_server.add(
+            "/repos/source-foundry/Hack/releases/latest",
+            json.dumps({"tag_name": "v3", "assets": [asset]}).encode(),
+        )
+        return body
+
+    @staticmethod
+    def _installer(temp_dir, lockfile=None, **kwargs):
+        return FontInstaller(
+            manifest=InstallManifest(temp_dir / "m.sqlite3"),
+            font_cache=FontCacheRefresher(temp_dir / "state"),
+            lockfile=lockfile,
+            **kwargs,
+        )
+
+    def test_lock_then_install_without_api(
+        self, release, http_server, temp_dir, monkeypatch
+    ):
+        """Test that a locked install downloads the asset and nothing else."""
+        locked = self._installer(temp_dir).lock_font("hack")
+
+        assert locked.version == "v3"
+        assert locked.asset_id == 7
+        assert locked.size == len(release)
+        assert locked.members == ("hack-bold.ttf", "hack-regular.ttf")
+
+        Lockfile({"hack": locked}).save(temp_dir / "fonts.lock.json")
+        lockfile = Lockfile.load(temp_dir / "fonts.lock.json")
+        assert lockfile.fonts["hack"] == locked
+
+        http_server.requests.clear()
+        monkeypatch.setattr(Settings, "CACHE_DIR", temp_dir / "other-host-cache")
+        result = self._installer(temp_dir, lockfile).install_font("hack")
+
+        assert result.success, result.message
+        assert result.bytes_downloaded == len(release)
+        assert sorted(p.name for p in (temp_dir / "dev").iterdir()) == [
+            "hack-bold.ttf",
+            "hack-regular.ttf",
+        ]
+        paths = [path for _, path, _ in http_server.requests]
+        assert paths == ["/dl/Hack-v3-ttf.zip"]
+
+    @pytest.mark.parametrize("stream_zip", [False, True])
+    def test_changed_asset_is_rejected(
+        self, release, http_server, temp_dir, monkeypatch, stream_zip
+    ):
+        """Test that bytes differing from the lockfile are never installed."""
+        locked = self._installer(temp_dir).lock_font("hack")
+        tampered = self._zip(
+            {"ttf/Hack-Regular.ttf": b"evil", "ttf/Hack-Bold.ttf": b"x"}
+        )
+        http_server.add("/dl/Hack-v3-ttf.zip", tampered)
+        monkeypatch.setattr(Settings, "CACHE_DIR", temp_dir / "other-host-cache")
+
+        installer = self._installer(
+            temp_dir, Lockfile({"hack": locked}), stream_zip=stream_zip
+        )
+        result = installer.install_font("hack")
+
+        assert not result.success
+        assert "lockfile" in result.message
+        assert not (temp_dir / "dev").exists()
+
+    def test_key_missing_from_lockfile(self, temp_dir):
+        """Test that keys outside the lockfile fail instead of resolving."""
+        result = self._installer(temp_dir, Lockfile()).install_font("hack")
+
+        assert not result.success
+        assert "lockfile" in result.message
+
+    @pytest.mark.parametrize("fonts", [None, [], "hack"])
+    def test_malformed_lockfile_is_rejected(self, temp_dir, fonts):
+        """Test that a lockfile without a fonts table raises ValueError."""
+        path = temp_dir / "fonts.lock.json"
+        path.write_text(json.dumps({"version": Lockfile.VERSION, "fonts": fonts}))
+
+        with pytest.raises(ValueError, match="invalido"):
+            Lockfile.load(path)
@@ -0,0 +1,61 @@
+"""Tests for the install manifest."""
+
+from pathlib import Path
+
+from font_installer.core.manifest import InstalledFile, InstallManifest, InstallRecord
+
+
+def _record(key: str, version: str, files: list[str]) -> InstallRecord:
+    return InstallRecord(
+        key=key,
+        name=key.title(),
+        category="developer",
+        target_dir=Path("/fonts/dev"),
+        version=version,
+        asset_url=f"http://x/{key}-{version}.zip",
+        asset_id=7,
+        asset_size=100,
+        files=[InstalledFile(Path("/fonts/dev") / f, 10, f"sha-{f}") for f in files],
+    )
+
+
+class TestInstallManifest:
+    """Tests for InstallManifest."""
+
+    def test_record_and_get(self, temp_dir):
+        """Test that an install is stored with its files."""
+        manifest = InstallManifest(temp_dir / "m.sqlite3")
+        manifest.record_install(_record("hack", "v3", ["hack-regular.ttf", "hack-bold.ttf"]))
+
+        record = manifest.get("hack")
+
+        assert record.version == "v3"
+        assert record.asset_id == 7
+        assert [f.path.name for f in record.files] == ["hack-bold.ttf", "hack-regular.ttf"]
+        assert manifest.owner_of(Path("/fonts/dev/hack-bold.ttf")) == "hack"
+        assert manifest.files_with_hash("sha-hack-bold.ttf")[0].size == 10
+
+    def test_reinstall_replaces_files(self, temp_dir):
+        """Test that a new install of a key replaces the old record."""
+        manifest = InstallManifest(temp_dir / "m.sqlite3")
+        manifest.record_install(_record("hack", "v3", ["a.ttf", "b.ttf"]))
+        manifest.record_install(_record("hack", "v4", ["a.ttf"]))
+        manifest.record_install(_record("firacode", "6.2", ["c.ttf"]))
+
+        installs = manifest.installs()
+
+        assert [(r.key, r.version) for r in installs] == [("firacode", "6.2"), ("hack", "v4")]
+        assert [f.path.name for f in installs[1].files] == ["a.ttf"]
+        assert manifest.owner_of(Path("/fonts/dev/b.ttf")) is None
+
+    def test_remove_and_missing_database(self, temp_dir):
+        """Test lookups on an absent database and removal of a key."""
+        manifest = InstallManifest(temp_dir / "m.sqlite3")
+        assert manifest.get("hack") is None
+        assert manifest.installs() == []
+
+        manifest.record_install(_record("hack", "v3", ["a.ttf"]))
+        manifest.remove("hack")
+
+        assert manifest.get("hack") is None
+        assert manifest.owner_of(Path("/fonts/dev/a.ttf")) is None
@@ -0,0 +1,94 @@
+"""Tests for the progress bus."""
+
+import threading
+import time
+
+from font_installer.core.progress import ProgressBus
+
+
+class TestProgressBus:
+    """Tests for ProgressBus."""
+
+    def test_coalesces_updates_per_task(self):
+        """Test that many updates collapse into the latest state."""
+        bus = ProgressBus(rate_hz=5)
+        received = []
+        bus.subscribe(lambda p: received.append((p.name, p.percent)))
+
+        for percent in range(1000):
+            bus.publish("big", percent // 10, "Baixando", percent, 1000)
+        bus.publish("small", 100, "Pronto")
+        bus.flush()
+
+        assert len(received) <= 4
+        assert ("big", 99) in received
+        assert ("small", 100) in received
+
+    def test_delivers_in_background_at_rate(self):
+        """Test that the dispatcher thread delivers without a flush."""
+        bus = ProgressBus(rate_hz=50)
+        delivered = threading.Event()
+        bus.subscribe(lambda p: delivered.set())
+
+        bus.publish("font", 10, "Baixando")
+
+        assert delivered.wait(2)
+        bus.close()
+
+    def test_delivers_snapshots_and_fans_out(self):
+        """Test that delivered events are not changed by later publishes."""
+        bus = ProgressBus()
+        first, second = [], []
+        bus.subscribe(first.append)
+        unsubscribe = bus.subscribe(second.append)
+
+        bus.publish("font", 10, "a")
+        bus.flush()
+        unsubscribe()
+        bus.publish("font", 20, "b")
+        bus.flush()
+
+        assert first[0] is second[0]
+        assert len(second) == 1
+        assert (first[0].percent, first[0].status) == (10, "a")
+        assert (first[1].percent, first[1].status) == (20, "b")
+
+    def test_publish_does_not_wait_for_subscribers(self):
+        """Test that a slow subscriber does not slow down publishers."""
+        bus = ProgressBus(rate_hz=100)
+        bus.subscribe(lambda p: time.sleep(0.2))
+        bus.publish("font", 0, "start")
+        time.sleep(0.05)  # dispatcher is now inside the slow subscriber
+
+        start = time.perf_counter()
+        for i in range(10000):
+            bus.publish("font", i % 100, "Baixando", i, 10000)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.2
+        bus.close()
+
+    def test_failing_subscriber_does_not_stop_delivery(self, caplog):
+        """Test that a raising subscriber is logged and others still run."""
+        bus = ProgressBus(rate_hz=50)
+        delivered = []
+        done = threading.Event()
+
+        def broken(progress):
+            raise RuntimeError("boom")
+
+        def record(progress):
+            delivered.append(progress.percent)
+            if progress.percent == 20:
+                done.set()
+
+        bus.subscribe(broken)
+        bus.subscribe(record)
+        bus.publish("font", 10, "a")
+        bus.flush()
+        bus.publish("font", 20, "b")
+
+        assert done.wait(2)
+        bus.close()
+        assert delivered == [10, 20]
+        assert "Progress subscriber" in caplog.text
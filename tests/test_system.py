@@ -0,0 +1,173 @@
+"""Tests for system checks."""
+
+import os
+import sys
+import time
+
+import pytest
+
+from font_installer.config.settings import Settings
+from font_installer.utils.system import (
+    FontAvailability,
+    FontDirectoryScanner,
+    SystemChecker,
+)
+
+FAKE_FC_LIST = """#!{python}
+import sys
+with open({log!r}, "a") as log:
+    log.write(repr(sys.argv[1:]) + "\\n")
+print("DejaVu Sans,DejaVu Sans Condensed\\t/usr/share/fonts/DejaVuSans.ttf")
+print("JetBrains Mono\\t/home/u/.local/share/fonts/dev/JetBrainsMono-Regular.ttf")
+print("JetBrains Mono\\t/home/u/.local/share/fonts/dev/JetBrainsMono-Bold.ttf")
+"""
+
+
+class TestFontAvailability:
+    """Tests for FontAvailability (with a stand-in fc-list)."""
+
+    @pytest.fixture
+    def fc_list_log(self, temp_dir, monkeypatch):
+        bin_dir = temp_dir / "bin"
+        bin_dir.mkdir()
+        log = temp_dir / "fc-list.log"
+        script = bin_dir / "fc-list"
+        script.write_text(FAKE_FC_LIST.format(python=sys.executable, log=str(log)))
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        return log
+
+    def test_many_queries_one_fc_list(self, temp_dir, fc_list_log):
+        """Test that a batch of checks is answered from one fc-list run."""
+        fonts = temp_dir / "fonts"
+        fonts.mkdir()
+        availability = FontAvailability([fonts])
+
+        result = availability.verify_many(
+            ["jetbrains mono", "DejaVu Sans Condensed", "Calibri"]
+        )
+
+        assert result == {
+            "jetbrains mono": True,
+            "DejaVu Sans Condensed": True,
+            "Calibri": False,
+        }
+        assert availability.verify("JetBrainsMono")
+        assert len(availability.families()["jetbrainsmono"]) == 2
+        assert fc_list_log.read_text().splitlines() == [
+            repr(["--format", FontAvailability.FC_LIST_FORMAT])
+        ]
+
+    def test_directory_change_invalidates(self, temp_dir, fc_list_log):
+        """Test that a font directory's mtime or invalidate() reruns fc-list."""
+        fonts = temp_dir / "fonts"
+        (fonts / "dev").mkdir(parents=True)
+        availability = FontAvailability([fonts])
+
+        availability.verify("Hack")
+        time.sleep(0.01)
+        # Subdirectories are not stamped: no rerun
+        (fonts / "dev" / "Hack-Regular.ttf").write_bytes(b"font")
+        availability.verify("Hack")
+        (fonts / "Hack-Bold.ttf").write_bytes(b"font")
+        availability.verify("Hack")
+        availability.invalidate()
+        availability.verify("Hack")
+
+        assert len(fc_list_log.read_text().splitlines()) == 3
+
+    def test_patterns_go_to_fc_list(self, temp_dir, fc_list_log):
+        """Test that fontconfig patterns keep the old fc-list semantics."""
+        fonts = temp_dir / "fonts"
+        fonts.mkdir()
+        availability = FontAvailability([fonts])
+
+        assert availability.verify("DejaVu Sans:style=Book")
+        assert availability.verify("")
+        assert availability.verify("dejavusans")
+        assert not availability.verify("DejaVu")
+
+        assert fc_list_log.read_text().splitlines() == [
+            repr(["--format", FontAvailability.FC_LIST_FORMAT]),
+            repr(["DejaVu Sans:style=Book"]),
+            repr([""]),
+        ]
+
+    def test_missing_fc_list(self, temp_dir, monkeypatch):
+        """Test that a missing fc-list reports fonts as unavailable."""
+        monkeypatch.setenv("PATH", str(temp_dir))
+
+        assert FontAvailability([temp_dir]).verify("Hack") is False
+
+
+class TestFontDirectoryScanner:
+    """Tests for FontDirectoryScanner."""
+
+    @pytest.fixture
+    def fonts(self, temp_dir):
+        (temp_dir / "microsoft").mkdir()
+        (temp_dir / "dev" / "Hack").mkdir(parents=True)
+        (temp_dir / "microsoft" / "arial.ttf").write_bytes(b"a" * 10)
+        (temp_dir / "dev" / "Hack" / "Hack-Regular.TTF").write_bytes(b"h" * 20)
+        (temp_dir / "dev" / "README.md").write_text("not a font")
+        return temp_dir
+
+    def test_recursive_snapshot(self, fonts):
+        """Test that subdirectories are scanned and entries classified."""
+        scanner = FontDirectoryScanner(
+            {"microsoft": fonts / "microsoft", "dev": fonts / "dev"}
+        )
+
+        snapshot = scanner.snapshot()
+
+        assert snapshot.counts == {"microsoft": 1, "dev": 1}
+        assert snapshot.names("dev") == ["Hack-Regular.TTF"]
+        assert [e.size for e in snapshot.entries] == [20, 10]
+
+    def test_snapshot_memoized_until_change(self, fonts):
+        """Test that the snapshot is reused until a directory changes."""
+        scanner = FontDirectoryScanner({"dev": fonts / "dev"})
+
+        first = scanner.snapshot()
+        assert scanner.snapshot() is first
+
+        time.sleep(0.01)
+        (fonts / "dev" / "Hack" / "Hack-Bold.ttf").write_bytes(b"b")
+        second = scanner.snapshot()
+
+        assert second is not first
+        assert second.total == 2
+
+    def test_missing_root_created_later(self, temp_dir):
+        """Test that a category directory created after a scan is picked up."""
+        scanner = FontDirectoryScanner({"dev": temp_dir / "dev"})
+        assert scanner.snapshot().total == 0
+
+        (temp_dir / "dev").mkdir()
+        (temp_dir / "dev" / "Hack.ttf").write_bytes(b"h")
+
+        assert scanner.snapshot().total == 1
+
+    def test_changed_roots_rescan(self, fonts, monkeypatch):
+        """Test that pointing a category at another directory rescans."""
+        monkeypatch.setattr(Settings, "MICROSOFT_FONTS_DIR", fonts / "microsoft")
+        monkeypatch.setattr(Settings, "DEV_FONTS_DIR", fonts / "dev")
+        scanner = FontDirectoryScanner()
+        assert scanner.snapshot().total == 2
+
+        monkeypatch.setattr(Settings, "DEV_FONTS_DIR", fonts / "missing")
+
+        assert scanner.snapshot().counts == {"microsoft": 1}
+
+    def test_system_checker_uses_snapshot(self, fonts, monkeypatch):
+        """Test SystemChecker listing and counting through the scanner."""
+        scanner = FontDirectoryScanner(
+            {"microsoft": fonts / "microsoft", "dev": fonts / "dev"}
+        )
+        monkeypatch.setattr(SystemChecker, "_scanner", scanner)
+
+        assert SystemChecker.get_installed_fonts_count() == 2
+        assert SystemChecker.list_installed_fonts() == {
+            "microsoft": ["arial.ttf"],
+            "dev": ["Hack-Regular.TTF"],
+        }